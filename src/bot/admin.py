@@ -1,5 +1,5 @@
 from django.contrib import admin
-from bot.models import TgUser
+from bot.models import ChatState, TgUser
 
 
 class TgBotAdmin(admin.ModelAdmin):
@@ -8,3 +8,10 @@ class TgBotAdmin(admin.ModelAdmin):
 
 
 admin.site.register(TgUser, TgBotAdmin)
+
+
+class ChatStateAdmin(admin.ModelAdmin):
+    list_display = ("tg_chat_id", "create_command_used", "chosen_goal_category", "expires")
+
+
+admin.site.register(ChatState, ChatStateAdmin)
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from typing import NoReturn
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bot.tg.dc import Chat, Message, MessageFrom, UpdateObj
+from bot.tg.dispatcher import AsyncDispatcher
+
+
+class SlowHandler:
+    """Handler answering every update after a fixed delay, standing for the round trip of a sendMessage call.
+
+    The handled update ids are recorded per chat, so the order of every chat can be checked afterwards.
+    """
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.handled = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def __call__(self, item: UpdateObj) -> NoReturn:
+        time.sleep(self.latency)
+        with self._lock:
+            self.handled[item.message.chat.id].append(item.update_id)
+
+
+class Command(BaseCommand):
+    """Compares the throughput of the sequential polling loop with the asyncio dispatcher.
+
+    A batch of updates of several chats, interleaved as they arrive from getUpdates, is handled by a handler sleeping
+    `--latency` seconds per update. The batch is handled one by one as the sequential loop does, then by the
+    dispatcher with each of the given concurrency limits. The updates per second are printed, and the order of the
+    updates of every chat is checked.
+    """
+    help = "Benchmark the sequential and the concurrent handling of telegram updates"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chats", type=int, default=50)
+        parser.add_argument("--messages", type=int, default=4, help="Updates per chat")
+        parser.add_argument("--latency", type=float, default=0.05, help="Seconds spent on every update")
+        parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+
+    @staticmethod
+    def make_updates(chats: int, messages: int) -> list:
+        updates = []
+        for number in range(messages):
+            for chat_id in range(1, chats + 1):
+                sender = MessageFrom(id=chat_id, is_bot=False, first_name="User", last_name=None, username=None)
+                chat = Chat(id=chat_id, first_name="User", last_name=None, type="private", title=None)
+                message = Message(message_id=number, from_=sender, chat=chat, text="/goals")
+                updates.append(UpdateObj(update_id=len(updates) + 1, message=message))
+        return updates
+
+    def check_order(self, updates: list, handler: SlowHandler) -> NoReturn:
+        expected = defaultdict(list)
+        for item in updates:
+            expected[item.message.chat.id].append(item.update_id)
+        if handler.handled != expected:
+            raise CommandError("The updates of a chat were handled out of order")
+
+    def handle(self, *args, **options) -> NoReturn:
+        updates = self.make_updates(options["chats"], options["messages"])
+        self.stdout.write(f"{'mode':>12} {'updates':>8} {'seconds':>8} {'per sec':>8}")
+
+        handler = SlowHandler(options["latency"])
+        started = time.perf_counter()
+        for item in updates:
+            handler(item)
+        self.report("sequential", len(updates), time.perf_counter() - started)
+        self.check_order(updates, handler)
+
+        for concurrency in options["concurrency"]:
+            handler = SlowHandler(options["latency"])
+            dispatcher = AsyncDispatcher(handler, concurrency=concurrency)
+            try:
+                started = time.perf_counter()
+                asyncio.run(dispatcher.dispatch(updates))
+                elapsed = time.perf_counter() - started
+            finally:
+                dispatcher.close()
+            self.report(f"async x{concurrency}", len(updates), elapsed)
+            self.check_order(updates, handler)
+
+    def report(self, mode: str, count: int, elapsed: float) -> NoReturn:
+        self.stdout.write(f"{mode:>12} {count:>8} {elapsed:>8.2f} {count / elapsed:>8.1f}")
@@ -0,0 +1,55 @@
+import json
+import time
+from pathlib import Path
+from typing import NoReturn
+
+import marshmallow_dataclass
+from django.core.management.base import BaseCommand, CommandError
+
+from bot.tg.dc import GetUpdatesResponse
+from bot.tg.decoders import decode_updates, get_schema
+
+SAMPLE = Path(__file__).resolve().parents[2] / 'tg' / 'samples' / 'get_updates.json'
+
+
+class Command(BaseCommand):
+    """Measures the decoding of recorded getUpdates responses.
+
+    The updates of the recorded responses are repeated up to `--batch` updates per response, as a busy bot receives
+    them, and decoded `--repeat` times with the schema built on every call, the cached schema and the fast decoder.
+    The microseconds per response are printed, and the results of the decoders are checked to be equal.
+    """
+    help = "Benchmark the decoding of telegram getUpdates responses"
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="*", type=Path, default=[SAMPLE], help="Recorded getUpdates responses")
+        parser.add_argument("--batch", type=int, default=100, help="Updates per response")
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def load_payloads(self, files: list, batch: int) -> list:
+        payloads = []
+        for path in files:
+            data = json.loads(path.read_text())
+            updates = data["result"] or [{"update_id": 1}]
+            result = [dict(updates[index % len(updates)], update_id=index + 1) for index in range(batch)]
+            payloads.append(dict(data, result=result))
+        return payloads
+
+    def handle(self, *args, **options) -> NoReturn:
+        payloads = self.load_payloads(options["files"], options["batch"])
+        decoders = {
+            "schema per call": lambda data: marshmallow_dataclass.class_schema(GetUpdatesResponse)().load(data),
+            "cached schema": get_schema(GetUpdatesResponse).load,
+            "fast decoder": decode_updates,
+        }
+        expected = [get_schema(GetUpdatesResponse).load(data) for data in payloads]
+        self.stdout.write(f"{'decoder':>16} {'us/response':>12}")
+        for name, decode in decoders.items():
+            if [decode(data) for data in payloads] != expected:
+                raise CommandError(f"{name} decodes the responses differently")
+            started = time.perf_counter()
+            for _ in range(options["repeat"]):
+                for data in payloads:
+                    decode(data)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"{name:>16} {elapsed / options['repeat'] / len(payloads) * 1e6:>12.1f}")
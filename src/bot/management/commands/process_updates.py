@@ -0,0 +1,48 @@
+import time
+from typing import NoReturn
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from bot.models import TgUser
+from bot.tg.client import TgClient
+from bot.tg.handlers import UpdateHandler
+from bot.tg.state import PeriodicPurge, purge_expired_chat_states
+from bot.tg.update_queue import process_pending_updates, purge_handled_updates
+
+
+class Command(BaseCommand):
+    """Handles the telegram updates queued by the webhook.
+
+    Several instances may run side by side, the chats being spread over them and the updates of every chat handled
+    in order. The handlers are the ones runbot uses in the polling mode. The expired dialogs are purged once per
+    TELEGRAM_CHAT_STATE_TTL, and the handled updates once they cannot be delivered again.
+    """
+    help = "Answer the telegram updates received by the webhook"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.TELEGRAM_QUEUE_BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Keep polling the queue")
+        parser.add_argument("--interval", type=float, default=0.5, help="Seconds between polls of an empty queue")
+        parser.add_argument(
+            "--purge-interval", type=float, default=3600, help="Seconds between prunings of the handled updates"
+        )
+
+    def handle(self, *args, **options) -> NoReturn:
+        handler = UpdateHandler(TgClient(token=settings.TELEGRAM_BOT_TOKEN, tg_user=TgUser))
+        purges = [
+            PeriodicPurge(purge_expired_chat_states, settings.TELEGRAM_CHAT_STATE_TTL),
+            PeriodicPurge(purge_handled_updates, options["purge_interval"]),
+        ]
+        while True:
+            for purge in purges:
+                purge()
+            handled = process_pending_updates(
+                handler.handle_update, max_chats=options["batch_size"], batch_size=options["batch_size"]
+            )
+            if handled:
+                self.stdout.write(f"Handled {handled} updates")
+            elif not options["loop"]:
+                return
+            else:
+                time.sleep(options["interval"])
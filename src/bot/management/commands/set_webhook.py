@@ -0,0 +1,33 @@
+from typing import NoReturn
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from bot.models import TgUser
+from bot.tg.client import TgClient
+
+
+class Command(BaseCommand):
+    """Switches the bot between the webhook and the long polling.
+
+    With an address Telegram is asked to post the updates to it with the TELEGRAM_WEBHOOK_SECRET token, the updates
+    being handled by the process_updates workers. With `--delete` the webhook is removed, so runbot can poll again.
+    """
+    help = "Set or delete the telegram bot webhook"
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", nargs="?", help="HTTPS address of the bot/webhook endpoint")
+        parser.add_argument("--delete", action="store_true", help="Remove the webhook")
+
+    def handle(self, *args, **options) -> NoReturn:
+        tg_client = TgClient(token=settings.TELEGRAM_BOT_TOKEN, tg_user=TgUser)
+        if options["delete"]:
+            tg_client.delete_webhook()
+            self.stdout.write("Webhook deleted")
+            return
+        if not options["url"]:
+            raise CommandError("Pass the webhook address or --delete")
+        if not settings.TELEGRAM_WEBHOOK_SECRET:
+            raise CommandError("TELEGRAM_WEBHOOK_SECRET is not set")
+        tg_client.set_webhook(options["url"], settings.TELEGRAM_WEBHOOK_SECRET)
+        self.stdout.write(f"Webhook set to {options['url']}")
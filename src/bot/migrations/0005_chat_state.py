@@ -0,0 +1,51 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bot", "0004_alter_tguser_tg_chat_id_alter_tguser_tg_user_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChatState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "tg_chat_id",
+                    models.BigIntegerField(
+                        unique=True, verbose_name="Telegram chat-id"
+                    ),
+                ),
+                (
+                    "create_command_used",
+                    models.BooleanField(default=False, verbose_name="Создание цели"),
+                ),
+                (
+                    "chosen_goal_category",
+                    models.CharField(
+                        blank=True, max_length=255, null=True, verbose_name="Категория"
+                    ),
+                ),
+                (
+                    "expires",
+                    models.DateTimeField(db_index=True, verbose_name="Истекает"),
+                ),
+            ],
+            options={
+                "verbose_name": "Состояние диалога",
+                "verbose_name_plural": "Состояния диалогов",
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bot", "0005_chat_state"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingUpdate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "update_id",
+                    models.BigIntegerField(unique=True, verbose_name="Update id"),
+                ),
+                ("tg_chat_id", models.BigIntegerField(verbose_name="Telegram chat-id")),
+                ("payload", models.JSONField(verbose_name="Обновление")),
+                (
+                    "received",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Получено"),
+                ),
+            ],
+            options={
+                "verbose_name": "Необработанное обновление",
+                "verbose_name_plural": "Необработанные обновления",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="pendingupdate",
+            index=models.Index(
+                fields=["tg_chat_id", "update_id"], name="pendingupdate_chat_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bot", "0006_pending_updates"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="pendingupdate",
+            name="pendingupdate_chat_idx",
+        ),
+        migrations.AddField(
+            model_name="pendingupdate",
+            name="handled",
+            field=models.DateTimeField(null=True, verbose_name="Обработано"),
+        ),
+        migrations.AddIndex(
+            model_name="pendingupdate",
+            index=models.Index(
+                condition=models.Q(("handled", None)),
+                fields=["tg_chat_id", "update_id"],
+                name="pendingupdate_queued_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pendingupdate",
+            index=models.Index(
+                condition=models.Q(("handled", None), _negated=True),
+                fields=["handled"],
+                name="pendingupdate_handled_idx",
+            ),
+        ),
+    ]
@@ -24,3 +24,66 @@ class TgUser(models.Model):
     verification_code = models.CharField(max_length=6, verbose_name='Код подтверждения')
     is_verified = models.BooleanField(default=False, verbose_name='Подтвержден')
 
+
+
+class ChatState(models.Model):
+    """Progress of the goal creation dialog in a Telegram chat.
+
+    The row of a chat is locked while an update of the chat is handled (see bot.tg.state), so the dialog is consistent
+    when several bot workers serve the chats. A dialog left unfinished expires after TELEGRAM_CHAT_STATE_TTL seconds.
+
+    Attributes:
+        tg_chat_id (int): Unique identifier for the Telegram chat.
+        create_command_used (bool): True if `/create` command has been sent by the telegram user.
+        chosen_goal_category (str, optional): Goal category title sent by the telegram user.
+        expires (datetime): Time the dialog is dropped at.
+    """
+    class Meta:
+        verbose_name = "Состояние диалога"
+        verbose_name_plural = "Состояния диалогов"
+
+    tg_chat_id = models.BigIntegerField(verbose_name='Telegram chat-id', unique=True)
+    create_command_used = models.BooleanField(default=False, verbose_name='Создание цели')
+    chosen_goal_category = models.CharField(max_length=255, null=True, blank=True, verbose_name='Категория')
+    expires = models.DateTimeField(verbose_name='Истекает', db_index=True)
+
+    @property
+    def is_idle(self) -> bool:
+        """True if no dialog is in progress."""
+        return not self.create_command_used and not self.chosen_goal_category
+
+    def reset(self):
+        """Drops the dialog."""
+        self.create_command_used = False
+        self.chosen_goal_category = None
+
+
+class PendingUpdate(models.Model):
+    """Telegram update received by the webhook.
+
+    The updates are handled by the process_updates workers (see bot.tg.update_queue), each worker taking the chats
+    no other worker holds, so the updates of every chat are handled in order. A handled update is kept, marked as
+    handled, until Telegram can no longer deliver it again, so a redelivered update is not handled twice.
+
+    Attributes:
+        update_id (int): The update's unique identifier. Telegram may deliver an update again, it is stored once.
+        tg_chat_id (int): Unique identifier for the Telegram chat of the update.
+        payload (dict): The update as sent by Telegram.
+        received (datetime): Time the update was received.
+        handled (datetime): Time the update was handled, None while it is queued.
+    """
+    class Meta:
+        verbose_name = "Необработанное обновление"
+        verbose_name_plural = "Необработанные обновления"
+        indexes = [
+            models.Index(
+                fields=["tg_chat_id", "update_id"], name="pendingupdate_queued_idx", condition=models.Q(handled=None)
+            ),
+            models.Index(fields=["handled"], name="pendingupdate_handled_idx", condition=~models.Q(handled=None)),
+        ]
+
+    update_id = models.BigIntegerField(verbose_name='Update id', unique=True)
+    tg_chat_id = models.BigIntegerField(verbose_name='Telegram chat-id')
+    payload = models.JSONField(verbose_name='Обновление')
+    received = models.DateTimeField(verbose_name='Получено', auto_now_add=True)
+    handled = models.DateTimeField(verbose_name='Обработано', null=True)
@@ -1,24 +1,92 @@
+import logging
+import time
+from functools import partial
 from random import sample
 from string import hexdigits
-from typing import Type, NoReturn, Callable
+from typing import Type, NoReturn, Optional
 import requests
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
 from bot.models import TgUser
 from bot.tg.dc import GetUpdatesResponse, SendMessageResponse
-import marshmallow_dataclass
-from goals.models import Goal, Status, GoalCategory
+from bot.tg.decoders import decode_updates, get_schema
+from goals.access import BoardAccess
+from goals.deadlines import overdue_goals
+from goals.models import Goal, GoalCategory
+
+
+logger = logging.getLogger(__name__)
+
+
+class TgApiError(Exception):
+    """Telegram Bot API request failed.
+
+    Attributes:
+        method (str): Telegram Bot method.
+        error_code (:obj:`int`, optional): HTTP status or Bot API error code, None for network errors.
+        description (str): Error description.
+    """
+
+    def __init__(self, method: str, description: str, error_code: Optional[int] = None):
+        super().__init__(f"{method}: {description}")
+        self.method = method
+        self.description = description
+        self.error_code = error_code
+
+
+def _is_connect_error(exc: requests.RequestException) -> bool:
+    """Return True if the request failed before a connection was made, so it has certainly not been sent."""
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], 'reason', None) if exc.args else None
+    return isinstance(exc, requests.ConnectionError) and isinstance(reason, NewConnectionError)
 
 
 class TgClient:
     """Telegram client.
 
+    The Bot API is called with JSON POST bodies over a session keeping its connections alive in a pool. Failed
+    connections and flood control (429) are retried with exponential backoff, the delay requested by the
+    `retry_after` parameter of the Bot API taking precedence. Read timeouts, dropped connections and server errors
+    are retried only for the methods listed in `idempotent_methods`, as Telegram may have carried out the request,
+    e.g. sent a message, before failing to answer.
+
     Attributes:
         token (str): Unique bot authentication token.
         tg_user (:obj:`TgUser`): TgUser instance.
+        base_url (str): Bot API server address. Defaults to the TELEGRAM_API_URL setting.
+        connect_timeout (float): Seconds to wait for a connection. Defaults to the TELEGRAM_CONNECT_TIMEOUT setting.
+        read_timeout (float): Seconds to wait for a response, added to the long polling timeout of getUpdates.
+            Defaults to the TELEGRAM_READ_TIMEOUT setting.
+        max_retries (int): Retries of a failed request. Defaults to the TELEGRAM_MAX_RETRIES setting.
+        backoff_factor (float): Delay before the first retry in seconds, doubled for every next one.
+        max_backoff (float): Longest delay between retries unless the Bot API asks for a longer one.
+        fast_decoding (bool): True to decode getUpdates with `decode_updates` rather than the marshmallow schema.
+            Defaults to the TELEGRAM_FAST_DECODING setting.
+        session (:obj:`requests.Session`): HTTP session shared by the requests.
     """
+    retry_statuses = frozenset({429, 500, 502, 503, 504})
+    idempotent_methods = frozenset({'getUpdates', 'setWebhook', 'deleteWebhook'})
 
-    def __init__(self, token: str, tg_user: Type[TgUser]):
+    def __init__(self, token: str, tg_user: Type[TgUser], base_url: str = None, connect_timeout: float = None,
+                 read_timeout: float = None, max_retries: int = None, backoff_factor: float = 0.5,
+                 max_backoff: float = 30, pool_size: int = None, fast_decoding: bool = None):
         self.token = token
         self.tg_user = tg_user
+        self.base_url = (base_url or settings.TELEGRAM_API_URL).rstrip('/')
+        self.connect_timeout = settings.TELEGRAM_CONNECT_TIMEOUT if connect_timeout is None else connect_timeout
+        self.read_timeout = settings.TELEGRAM_READ_TIMEOUT if read_timeout is None else read_timeout
+        self.max_retries = settings.TELEGRAM_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.fast_decoding = settings.TELEGRAM_FAST_DECODING if fast_decoding is None else fast_decoding
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size or settings.TELEGRAM_BOT_CONCURRENCY)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
     def get_url(self, method: str):
         """Return Telegram Bot API URL address.
@@ -28,7 +96,49 @@ class TgClient:
         Returns:
             Telegram Bot API URL address.
         """
-        return f"https://api.telegram.org/bot{self.token}/{method}?"
+        return f"{self.base_url}/bot{self.token}/{method}"
+
+    def call(self, method: str, payload: dict, read_timeout: float = None) -> dict:
+        """Call a Bot API method, retrying the requests that may succeed later.
+
+        Args:
+            method (str): Telegram Bot method.
+            payload (dict): Method parameters sent as the JSON body.
+            read_timeout (:obj:`float`, optional): Seconds to wait for the response. Defaults to `read_timeout`.
+        Returns:
+            Decoded response of the Bot API.
+        Raises:
+            TgApiError: The request was rejected or still failed after the retries.
+        """
+        timeout = (self.connect_timeout, self.read_timeout if read_timeout is None else read_timeout)
+        idempotent = method in self.idempotent_methods
+        retry_statuses = self.retry_statuses if idempotent else {429}
+        for attempt in range(self.max_retries + 1):
+            delay = min(self.backoff_factor * 2 ** attempt, self.max_backoff)
+            try:
+                response = self.session.post(self.get_url(method), json=payload, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                error = TgApiError(method, str(exc))
+                if not idempotent and not _is_connect_error(exc):
+                    raise error
+            else:
+                try:
+                    data = response.json()
+                except ValueError:
+                    data = {'ok': False, 'description': response.reason}
+                if response.ok and data.get('ok'):
+                    return data
+                error = TgApiError(
+                    method, data.get('description', response.reason), data.get('error_code', response.status_code)
+                )
+                if response.status_code not in retry_statuses:
+                    raise error
+                retry_after = (data.get('parameters') or {}).get('retry_after')
+                if retry_after is not None:
+                    delay = retry_after
+            if attempt < self.max_retries:
+                time.sleep(delay)
+        raise error
 
     def get_updates(self, offset: int = 0, timeout: int = 60) -> GetUpdatesResponse:
         """Receive incoming updates using long polling.
@@ -37,19 +147,65 @@ class TgClient:
             offset (int): Identifier of the first update to be returned.
             timeout (int): Timeout in seconds for long polling.
         """
-        url = self.get_url('getUpdates') + f'timeout={timeout}&offset={offset}'
-        res = requests.get(url).json()
-        res_schema = marshmallow_dataclass.class_schema(GetUpdatesResponse)
-        return res_schema().load(res)
+        res = self.call('getUpdates', {'offset': offset, 'timeout': timeout}, read_timeout=timeout + self.read_timeout)
+        if self.fast_decoding:
+            return decode_updates(res)
+        return get_schema(GetUpdatesResponse).load(res)
+
+    def send_message(self, chat_id: int, text: str) -> Optional[SendMessageResponse]:
+        """Send a message to the telegram user, after the commit when called in a transaction.
+
+        Inside a transaction, e.g. while the dialog of the chat is locked (see bot.tg.state), the message is queued
+        with `transaction.on_commit`, so no lock or connection is held while waiting for the Bot API and the user is
+        only told about changes that have been committed. Messages dropped by a rollback are not sent.
+
+        Args:
+            chat_id (int): Telegram chat id.
+            text (str): Text of the message.
+        Returns:
+            SendMessageResponse, or None if the message was queued until the commit.
+        """
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(partial(self._deliver_after_commit, chat_id, text))
+            return None
+        return self.deliver_message(chat_id, text)
+
+    def deliver_message(self, chat_id: int, text: str) -> SendMessageResponse:
+        """Send a message to the telegram user at once.
+
+        Args:
+            chat_id (int): Telegram chat id.
+            text (str): Text of the message.
+        Returns:
+            SendMessageResponse.
+        """
+        res = self.call('sendMessage', {'chat_id': chat_id, 'text': text})
+        return get_schema(SendMessageResponse).load(res)
+
+    def _deliver_after_commit(self, chat_id: int, text: str) -> NoReturn:
+        try:
+            self.deliver_message(chat_id, text)
+        except TgApiError:
+            logger.exception("Failed to send a message to chat %s", chat_id)
 
-    def send_message(self, chat_id: int, text: str) -> SendMessageResponse:
-        """Send a message to the telegram user.
+    def set_webhook(self, url: str, secret_token: str) -> dict:
+        """Make Telegram post the updates to the webhook instead of keeping them for getUpdates.
 
+        Args:
+            url (str): HTTPS address of the webhook.
+            secret_token (str): Token sent in the X-Telegram-Bot-Api-Secret-Token header of every update.
+        Returns:
+            Decoded response of the Bot API.
+        """
+        return self.call('setWebhook', {'url': url, 'secret_token': secret_token, 'allowed_updates': ['message']})
+
+    def delete_webhook(self) -> dict:
+        """Remove the webhook, so the updates can be received with getUpdates again.
+
+        Returns:
+            Decoded response of the Bot API.
         """
-        url = self.get_url('sendMessage') + f'chat_id={chat_id}&text={text}'
-        res = requests.get(url).json()
-        res_schema = marshmallow_dataclass.class_schema(SendMessageResponse)
-        return res_schema().load(res)
+        return self.call('deleteWebhook', {})
 
     @staticmethod
     def generate_verification_code() -> str:
@@ -145,14 +301,32 @@ class TgClient:
         """
         tg_user = self.tg_user.objects.get(tg_user_id=tg_user_id)
         goals = Goal.objects.filter(
-            category__board__participants__user=tg_user.user.id
-        ).exclude(status=Status.archived)
+            board_id__in=BoardAccess(tg_user.user, use_cache=False).board_ids()
+        ).visible()
         if goals:
             text = '\n'.join(goal.title for goal in goals)
         else:
             text = "You don't have any planned goals."
         return self.send_message(text=text, chat_id=chat_id)
 
+    def send_overdue_goals(self, tg_user_id: int, chat_id: int) -> SendMessageResponse:
+        """Retrieves user's overdue goals from the database.
+
+        Args:
+            tg_user_id (int): Telegram User id.
+            chat_id (int): Telegram chat id.
+
+        Returns:
+             SendMessageResponse.
+        """
+        tg_user = self.tg_user.objects.get(tg_user_id=tg_user_id)
+        goals = overdue_goals(BoardAccess(tg_user.user, use_cache=False).board_ids()).order_by('due_date', 'id')
+        if goals:
+            text = '\n'.join(f"{timezone.localtime(goal.due_date):%d.%m.%Y} {goal.title}" for goal in goals)
+        else:
+            text = "You don't have any overdue goals."
+        return self.send_message(text=text, chat_id=chat_id)
+
     def send_user_categories(self, tg_user_id: int, chat_id: int) -> SendMessageResponse:
         """Retrieves user's current goal categories from the database.
 
@@ -180,7 +354,7 @@ class TgClient:
             List with category titles or empty list.
         """
         tg_user = self.tg_user.objects.get(tg_user_id=tg_user_id)
-        categories = GoalCategory.objects.filter(board__participants__user=tg_user.user.id, is_deleted=False)
+        categories = GoalCategory.objects.filter(board_id__in=BoardAccess(tg_user.user, use_cache=False).board_ids(), is_deleted=False)
         return [category.title for category in categories]
 
     def create_new_goal(self, tg_user_id: int, goal_title: str, category_title: str) -> NoReturn:
@@ -195,7 +369,9 @@ class TgClient:
              None.
         """
         tg_user = self.tg_user.objects.get(tg_user_id=tg_user_id)
-        category = GoalCategory.objects.get(board__participants__user=tg_user.user.id, title=category_title)
+        category = GoalCategory.objects.get(
+            board__participants__user=tg_user.user.id, title=category_title, is_deleted=False
+        )
         Goal.objects.create(category=category, title=goal_title, user=tg_user.user)
 
     def handle_new_or_unverified_user(self, chat_id: int, tg_user_id: int):
@@ -0,0 +1,116 @@
+from functools import lru_cache
+from typing import Type
+
+import marshmallow_dataclass
+from marshmallow import Schema
+
+from bot.tg.dc import Chat, GetUpdatesResponse, Message, MessageFrom, UpdateObj
+
+
+@lru_cache(maxsize=None)
+def get_schema(cls: Type) -> Schema:
+    """Returns the marshmallow schema of a bot.tg.dc dataclass, built once per process.
+
+    Args:
+        cls (type): Dataclass, e.g. `GetUpdatesResponse`.
+    Returns:
+        Schema instance loading the dataclass.
+    """
+    return marshmallow_dataclass.class_schema(cls)()
+
+
+class _Irregular(Exception):
+    """The payload is not in the shape the fast decoder handles."""
+
+
+def _int(value) -> int:
+    if type(value) is not int:
+        raise _Irregular
+    return value
+
+
+def _str(value) -> str:
+    if type(value) is not str:
+        raise _Irregular
+    return value
+
+
+def _optional_str(value):
+    if value is not None and type(value) is not str:
+        raise _Irregular
+    return value
+
+
+def _message(data: dict) -> Message:
+    sender = data['from']
+    chat = data['chat']
+    is_bot = sender['is_bot']
+    if type(is_bot) is not bool:
+        raise _Irregular
+    return Message(
+        message_id=_int(data['message_id']),
+        from_=MessageFrom(
+            id=_int(sender['id']),
+            is_bot=is_bot,
+            first_name=_str(sender['first_name']),
+            last_name=_optional_str(sender.get('last_name')),
+            username=_optional_str(sender.get('username')),
+        ),
+        chat=Chat(
+            id=_int(chat['id']),
+            first_name=_str(chat['first_name']),
+            last_name=_optional_str(chat.get('last_name')),
+            type=_str(chat['type']),
+            title=_optional_str(chat.get('title')),
+        ),
+        text=_str(data['text']),
+    )
+
+
+def _get_updates(data: dict) -> GetUpdatesResponse:
+    ok = data['ok']
+    if type(ok) is not bool:
+        raise _Irregular
+    return GetUpdatesResponse(ok=ok, result=[_update(item) for item in data.get('result', ())])
+
+
+def _update(data: dict) -> UpdateObj:
+    message = data.get('message')
+    return UpdateObj(update_id=_int(data['update_id']), message=None if message is None else _message(message))
+
+
+def decode_updates(data: dict) -> GetUpdatesResponse:
+    """Decodes a getUpdates response into the bot.tg.dc dataclasses.
+
+    The common payload, every field present with the JSON type the dataclass declares, is turned into the dataclasses
+    directly, without the intermediate dictionaries and field objects of marshmallow. Anything else, e.g. a missing
+    field or a number sent as a string, is loaded by the marshmallow schema, so the result and the validation errors
+    are the same as with `get_schema(GetUpdatesResponse).load(data)`.
+
+    Args:
+        data (dict): Decoded JSON of the getUpdates response.
+    Returns:
+        GetUpdatesResponse.
+    Raises:
+        marshmallow.ValidationError: The payload does not match the dataclasses.
+    """
+    try:
+        return _get_updates(data)
+    except (_Irregular, KeyError, TypeError, AttributeError):
+        return get_schema(GetUpdatesResponse).load(data)
+
+
+def decode_update(data: dict) -> UpdateObj:
+    """Decodes a single update, e.g. one posted to the webhook, like `decode_updates` does.
+
+    Args:
+        data (dict): Decoded JSON of the update.
+    Returns:
+        UpdateObj.
+    Raises:
+        marshmallow.ValidationError: The payload does not match the dataclasses.
+    """
+    try:
+        return _update(data)
+    except (_Irregular, KeyError, TypeError, AttributeError):
+        return get_schema(UpdateObj).load(data)
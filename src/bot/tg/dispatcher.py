@@ -0,0 +1,175 @@
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Hashable, NoReturn, Optional, Set
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from bot.tg.client import TgApiError, TgClient
+from bot.tg.dc import UpdateObj
+
+logger = logging.getLogger(__name__)
+
+
+def poll_updates(tg_client: TgClient, handler: Callable[[UpdateObj], None], timeout: int = 60,
+                 on_poll: Optional[Callable[[], object]] = None) -> NoReturn:
+    """Receives telegram updates with long polling and handles them one by one.
+
+    A failed getUpdates call, already retried by the client, is logged and made again.
+
+    Args:
+        tg_client (:obj:`TgClient`): TgClient instance.
+        handler (callable): Handler called with every update.
+        timeout (int): Timeout in seconds for long polling.
+        on_poll (callable, optional): Housekeeping called before every getUpdates call, e.g. purging the dialogs.
+    """
+    offset = 0
+    while True:
+        if on_poll is not None:
+            on_poll()
+        try:
+            res = tg_client.get_updates(offset=offset, timeout=timeout)
+        except TgApiError:
+            logger.exception("Failed to receive updates")
+            continue
+        for item in res.result:
+            offset = item.update_id + 1
+            handler(item)
+
+
+def chat_key(item: UpdateObj) -> Hashable:
+    """Returns the key the updates are ordered by: the chat id, or the update id for updates without a message."""
+    return item.message.chat.id if item.message else ('update', item.update_id)
+
+
+class AsyncDispatcher:
+    """Handles telegram updates of different chats concurrently, keeping the updates of every chat in order.
+
+    The updates are put into a queue per chat, drained by one task per chat, so a slow answer delays only its own
+    chat. The synchronous handler runs in a pool of worker threads through `sync_to_async`, every call starting and
+    ending with the cleanup of stale database connections, as a Django request does. At most `concurrency` updates
+    are handled at once, and polling pauses while `max_pending` updates are waiting.
+
+    Attributes:
+        handler (callable): Synchronous handler called with every update.
+        concurrency (int): Maximum number of updates handled at once.
+        max_pending (int): Maximum number of received updates not handled yet.
+        key (callable): Function returning the key of the queue an update belongs to.
+    """
+
+    def __init__(self, handler: Callable[[UpdateObj], None], concurrency: int = 8, max_pending: int = None,
+                 key: Callable[[UpdateObj], Hashable] = chat_key):
+        if concurrency < 1:
+            raise ValueError("concurrency must be positive")
+        self.handler = handler
+        self.concurrency = concurrency
+        self.max_pending = max_pending or concurrency * 100
+        self.key = key
+        self.pending = 0
+        self._queues: Dict[Hashable, Deque[UpdateObj]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._semaphore = None
+        self._drained = None
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='tg-handler')
+        self._handle = sync_to_async(self._call_sync, thread_sensitive=False, executor=self._executor)
+
+    @staticmethod
+    def _call_sync(func: Callable, *args) -> NoReturn:
+        close_old_connections()
+        try:
+            func(*args)
+        finally:
+            close_old_connections()
+
+    def _ensure_primitives(self) -> NoReturn:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._drained = asyncio.Event()
+
+    def submit(self, item: UpdateObj) -> NoReturn:
+        """Queues an update behind the updates of the same chat. Must be called from the event loop.
+
+        Args:
+            item (:obj:`UpdateObj`): Telegram update.
+        """
+        self._ensure_primitives()
+        self.pending += 1
+        key = self.key(item)
+        queue = self._queues.get(key)
+        if queue is not None:
+            queue.append(item)
+            return
+        self._queues[key] = deque([item])
+        task = asyncio.create_task(self._drain(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _drain(self, key: Hashable) -> NoReturn:
+        queue = self._queues[key]
+        try:
+            while queue:
+                item = queue.popleft()
+                try:
+                    async with self._semaphore:
+                        await self._handle(self.handler, item)
+                finally:
+                    self.pending -= 1
+                    self._drained.set()
+        finally:
+            del self._queues[key]
+
+    async def wait_for_capacity(self) -> NoReturn:
+        """Waits until fewer than `max_pending` updates are waiting."""
+        self._ensure_primitives()
+        while self.pending >= self.max_pending:
+            self._drained.clear()
+            await self._drained.wait()
+
+    async def join(self) -> NoReturn:
+        """Waits until every queued update has been handled."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    async def dispatch(self, items) -> NoReturn:
+        """Handles a batch of updates and waits for them.
+
+        Args:
+            items (:obj:`list` of :obj:`UpdateObj`): Telegram updates.
+        """
+        for item in items:
+            await self.wait_for_capacity()
+            self.submit(item)
+        await self.join()
+
+    async def poll(self, tg_client: TgClient, timeout: int = 60,
+                   on_poll: Optional[Callable[[], object]] = None) -> NoReturn:
+        """Receives telegram updates with long polling and dispatches them while the next batch is being fetched.
+
+        Args:
+            tg_client (:obj:`TgClient`): TgClient instance.
+            timeout (int): Timeout in seconds for long polling.
+            on_poll (callable, optional): Synchronous housekeeping run in a worker thread before every getUpdates
+                call, e.g. purging the dialogs.
+        """
+        offset = 0
+        try:
+            while True:
+                await self.wait_for_capacity()
+                if on_poll is not None:
+                    await self._handle(on_poll)
+                try:
+                    res = await asyncio.to_thread(tg_client.get_updates, offset=offset, timeout=timeout)
+                except TgApiError:
+                    logger.exception("Failed to receive updates")
+                    continue
+                for item in res.result:
+                    offset = item.update_id + 1
+                    self.submit(item)
+        finally:
+            await self.join()
+
+    def close(self) -> NoReturn:
+        """Shuts the worker threads down."""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,116 @@
+import logging
+from typing import NoReturn, Optional
+
+from bot.models import ChatState
+from bot.tg.client import TgClient
+from bot.tg.dc import UpdateObj
+from bot.tg.state import chat_state
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateHandler:
+    """Answers the updates received by the telegram bot.
+
+    The handler is synchronous and is shared by the sequential polling loop and by the asyncio dispatcher, which runs
+    it in worker threads. The dialog of a chat is kept in the database and locked while its update is handled, so
+    several bot processes can serve the same chats.
+
+    Attributes:
+        tg_client (:obj:`TgClient`): TgClient instance.
+        stateless_commands (:obj:`list` of :obj:`str`): Commands answered without touching the dialog.
+        standard_bot_commands (:obj:`list` of :obj:`str`): List of available telegram bot commands.
+    """
+    stateless_commands = ['/goals', '/overdue']
+    standard_bot_commands = ['/goals', '/overdue', '/create', '/cancel']
+
+    def __init__(self, tg_client: TgClient):
+        self.tg_client = tg_client
+
+    def __call__(self, item: UpdateObj) -> NoReturn:
+        """Handles an incoming update, logging the errors instead of raising them.
+
+        Args:
+            item (:obj:`UpdateObj`): Telegram update.
+        """
+        try:
+            self.handle_update(item)
+        except Exception:
+            logger.exception("Failed to handle update %s", item.update_id)
+
+    def handle_update(self, item: UpdateObj) -> NoReturn:
+        """Handles an incoming update and sends the response to the telegram user.
+
+        Args:
+            item (:obj:`UpdateObj`): Telegram update.
+        """
+        if not item.message:
+            return
+        tg_user_id = item.message.from_.id
+        chat_id = item.message.chat.id
+
+        if self.tg_client.new_or_unverified_tg_user(tg_user_id=tg_user_id):
+            self.tg_client.handle_new_or_unverified_user(tg_user_id=tg_user_id, chat_id=chat_id)
+            return
+
+        user_message = item.message.text
+        if user_message in self.stateless_commands:
+            self._process_standard_commands(None, user_message, tg_user_id, chat_id)
+            return
+        with chat_state(chat_id) as state:
+            if user_message in self.standard_bot_commands:
+                self._process_standard_commands(state, user_message, tg_user_id, chat_id)
+            else:
+                self._process_other_commands(state, user_message, tg_user_id, chat_id)
+
+    def _process_standard_commands(
+        self, state: Optional[ChatState], user_message: str, tg_user_id: int, chat_id: int
+    ) -> NoReturn:
+        """Handles standard telegram bot commands sent by telegram user to the bot.
+
+        Args:
+            state (:obj:`ChatState`, optional): Locked dialog state of the chat, None for the stateless commands.
+            user_message (str): The text of a telegram user's message.
+            tg_user_id (int): Telegram user id.
+            chat_id (int): Telegram chat id.
+
+        Returns:
+            None.
+        """
+        if user_message == '/goals':
+            self.tg_client.send_user_goals(tg_user_id=tg_user_id, chat_id=chat_id)
+        elif user_message == '/overdue':
+            self.tg_client.send_overdue_goals(tg_user_id=tg_user_id, chat_id=chat_id)
+        elif user_message == '/create':
+            state.create_command_used = True
+            self.tg_client.send_user_categories(tg_user_id=tg_user_id, chat_id=chat_id)
+        elif user_message == '/cancel':
+            state.reset()
+            self.tg_client.send_message(chat_id=chat_id, text='Your request has been cancelled')
+
+    def _process_other_commands(self, state: ChatState, user_message: str, tg_user_id: int, chat_id: int) -> NoReturn:
+        """Handles non-standard telegram bot commands sent by telegram user to the bot.
+
+        Args:
+            state (:obj:`ChatState`): Locked dialog state of the chat.
+            user_message (str): The text of a telegram user's message.
+            tg_user_id (int): Telegram user id.
+            chat_id (int): Telegram chat id.
+
+        Returns:
+            None.
+        """
+        if not state.create_command_used:
+            self.tg_client.send_message(chat_id=chat_id, text='Unknown command.Please try again.')
+        elif user_message in self.tg_client.get_user_categories(tg_user_id=tg_user_id):
+            state.chosen_goal_category = user_message
+            self.tg_client.send_message(chat_id=chat_id, text='Please enter the title of a new goal')
+        elif not state.chosen_goal_category:
+            self.tg_client.send_message(chat_id=chat_id, text='Please choose the correct category')
+        else:
+            goal_title = user_message
+            self.tg_client.create_new_goal(
+                tg_user_id=tg_user_id, goal_title=goal_title, category_title=state.chosen_goal_category
+            )
+            self.tg_client.send_message(chat_id=chat_id, text=f'Goal "{goal_title}" has been created')
+            state.reset()
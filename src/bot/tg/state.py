@@ -0,0 +1,75 @@
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Callable, Iterator
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from bot.models import ChatState
+
+
+@contextmanager
+def chat_state(chat_id: int) -> Iterator[ChatState]:
+    """Locks and returns the dialog state of a chat, saving the changes made to it on exit.
+
+    The state is read with SELECT ... FOR UPDATE in a transaction lasting until the end of the block, so another
+    worker handling an update of the same chat waits for it, and whatever the block writes to the database is
+    committed together with the state. An expired state is returned reset. A state left idle is deleted, any other
+    one is kept for another TELEGRAM_CHAT_STATE_TTL seconds.
+
+    Args:
+        chat_id (int): Telegram chat id.
+    Yields:
+        ChatState instance.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        state, created = ChatState.objects.select_for_update().get_or_create(
+            tg_chat_id=chat_id, defaults={'expires': now}
+        )
+        if not created and state.expires <= now:
+            state.reset()
+        yield state
+        if state.is_idle:
+            state.delete()
+        else:
+            state.expires = timezone.now() + timedelta(seconds=settings.TELEGRAM_CHAT_STATE_TTL)
+            state.save()
+
+
+def purge_expired_chat_states() -> int:
+    """Deletes the dialogs left unfinished past their expiry.
+
+    Returns:
+        Number of deleted states.
+    """
+    deleted, _ = ChatState.objects.filter(expires__lte=timezone.now()).delete()
+    return deleted
+
+
+class PeriodicPurge:
+    """Runs a purge at most once per interval, called on every round of the long running bot loops.
+
+    Attributes:
+        purge (callable): Function deleting the stale rows and returning their number.
+        interval (float): Seconds between the purges.
+    """
+
+    def __init__(self, purge: Callable[[], int], interval: float):
+        self.purge = purge
+        self.interval = interval
+        self._purged = None
+
+    def __call__(self) -> int:
+        """Runs the purge if the interval has passed since the previous one.
+
+        Returns:
+            Number of deleted rows.
+        """
+        now = time.monotonic()
+        if self._purged is not None and now - self._purged < self.interval:
+            return 0
+        self._purged = now
+        return self.purge()
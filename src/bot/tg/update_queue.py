@@ -0,0 +1,97 @@
+import logging
+from datetime import timedelta
+from typing import Callable, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from bot.models import PendingUpdate
+from bot.tg.dc import UpdateObj
+from bot.tg.decoders import decode_update
+
+logger = logging.getLogger(__name__)
+
+# Telegram keeps an update it could not deliver for 24 hours.
+REDELIVERY_PERIOD = timedelta(days=1)
+
+
+def enqueue_update(update: UpdateObj, payload: dict) -> bool:
+    """Stores an update received by the webhook for the workers.
+
+    Updates without a message are not stored, the handlers ignore them. An update delivered again is stored once, and
+    is not queued again if it has been handled already, as its row is kept until Telegram can no longer deliver it.
+
+    Args:
+        update (:obj:`UpdateObj`): Decoded update.
+        payload (dict): The update as sent by Telegram.
+    Returns:
+        True if the update was queued.
+    """
+    if not update.message:
+        return False
+    PendingUpdate.objects.bulk_create(
+        [PendingUpdate(update_id=update.update_id, tg_chat_id=update.message.chat.id, payload=payload)],
+        ignore_conflicts=True,
+    )
+    return True
+
+
+def _try_lock_chat(chat_id: int) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [chat_id])
+        return cursor.fetchone()[0]
+
+
+def process_pending_updates(handle: Callable[[UpdateObj], None], max_chats: int = None,
+                            batch_size: Optional[int] = None) -> int:
+    """Handles the queued updates of the chats no other worker is handling.
+
+    The chats with the oldest updates come first. Every chat is handled in its own transaction holding an advisory
+    lock on the chat id, which the other workers skip, so the updates of a chat are handled in order by one worker at
+    a time while the other chats are spread over the workers. Each update is handled in a savepoint, an error being
+    logged and the update dropped, and the updates are marked as handled in the same transaction.
+
+    Args:
+        handle (callable): Handler called with every update, e.g. `UpdateHandler.handle_update`.
+        max_chats (:obj:`int`, optional): Chats looked at. Defaults to the TELEGRAM_QUEUE_BATCH_SIZE setting.
+        batch_size (:obj:`int`, optional): Updates of a chat handled in one transaction. Defaults to the
+            TELEGRAM_QUEUE_BATCH_SIZE setting.
+    Returns:
+        Number of handled updates.
+    """
+    max_chats = max_chats or settings.TELEGRAM_QUEUE_BATCH_SIZE
+    batch_size = batch_size or settings.TELEGRAM_QUEUE_BATCH_SIZE
+    queued = PendingUpdate.objects.filter(handled=None)
+    chat_ids = queued.values('tg_chat_id').annotate(
+        first_update=Min('update_id')
+    ).order_by('first_update').values_list('tg_chat_id', flat=True)[:max_chats]
+
+    handled = 0
+    for chat_id in chat_ids:
+        with transaction.atomic():
+            if not _try_lock_chat(chat_id):
+                continue
+            updates: List[PendingUpdate] = list(
+                queued.filter(tg_chat_id=chat_id).order_by('update_id')[:batch_size]
+            )
+            for pending in updates:
+                try:
+                    with transaction.atomic():
+                        handle(decode_update(pending.payload))
+                except Exception:
+                    logger.exception("Failed to handle update %s", pending.update_id)
+            PendingUpdate.objects.filter(id__in=[pending.id for pending in updates]).update(handled=timezone.now())
+            handled += len(updates)
+    return handled
+
+
+def purge_handled_updates() -> int:
+    """Deletes the handled updates Telegram can no longer deliver again.
+
+    Returns:
+        Number of deleted updates.
+    """
+    deleted, _ = PendingUpdate.objects.filter(handled__lt=timezone.now() - REDELIVERY_PERIOD).delete()
+    return deleted
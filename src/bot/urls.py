@@ -1,6 +1,6 @@
 from django.urls import path
 
-from bot.views import BotVerificationView
+from bot.views import BotVerificationView, TelegramWebhookView
 
 
 app_name = 'bot'
@@ -8,5 +8,6 @@ app_name = 'bot'
 
 urlpatterns = [
      path("verify", BotVerificationView.as_view(), name='verify_bot'),
+     path("webhook", TelegramWebhookView.as_view(), name='webhook'),
 
 ]
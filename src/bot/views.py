@@ -1,7 +1,17 @@
+from hmac import compare_digest
+
+import marshmallow
+from django.conf import settings
 from rest_framework import permissions
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.generics import UpdateAPIView
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from bot.models import TgUser
 from bot.serializers import TgUserSerializer
+from bot.tg.decoders import decode_update
+from bot.tg.update_queue import enqueue_update
 
 
 class BotVerificationView(UpdateAPIView):
@@ -13,3 +23,36 @@ class BotVerificationView(UpdateAPIView):
 
     def get_object(self):
         return self.request.user
+
+
+class TelegramWebhookView(APIView):
+    """Receive the updates Telegram posts to the bot webhook
+
+    post:
+    The X-Telegram-Bot-Api-Secret-Token header must hold the TELEGRAM_WEBHOOK_SECRET setting, without it the webhook
+    is disabled. The update is queued for the process_updates workers and acknowledged at once. The updates the
+    handlers cannot answer, e.g. a message without text, are acknowledged without being queued, so that Telegram does
+    not deliver them again.
+    """
+
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    parser_classes = [JSONParser]
+    secret_header = "X-Telegram-Bot-Api-Secret-Token"
+
+    def check_secret(self, request) -> None:
+        secret = settings.TELEGRAM_WEBHOOK_SECRET
+        if not secret:
+            raise NotFound
+        if not compare_digest(request.headers.get(self.secret_header, "").encode(), secret.encode()):
+            raise PermissionDenied("Invalid secret token")
+
+    def post(self, request, *args, **kwargs) -> Response:
+        self.check_secret(request)
+        if not isinstance(request.data, dict) or type(request.data.get("update_id")) is not int:
+            raise ValidationError({"update_id": ["A valid integer is required."]})
+        try:
+            update = decode_update(request.data)
+        except marshmallow.ValidationError:
+            return Response({"queued": False})
+        return Response({"queued": enqueue_update(update, request.data)})
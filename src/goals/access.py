@@ -0,0 +1,167 @@
+import threading
+from typing import Iterable, Optional, Union
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from goals.models import Board, BoardParticipant
+
+
+ROLES_CACHE_KEY = "goals:board_roles:{user_id}"
+STATS_CACHE_KEY = "goals:board_roles_stats:{name}"
+STATS_FLUSH_EVERY = 100
+UNCACHED_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+    "django.core.cache.backends.db.DatabaseCache",
+)
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def roles_cache_enabled() -> bool:
+    """Return True if the board roles may be cached across requests.
+
+    The cache has to be shared by all processes without costing SQL: an invalidation only reaches the process making
+    it with a per process backend such as the default local memory cache, and a hit in the database cache is a query
+    as well, so the roles are read from the database with these backends.
+    """
+    return settings.CACHES["default"]["BACKEND"] not in UNCACHED_BACKENDS
+
+
+def _roles_cache_key(user_id: int) -> str:
+    return ROLES_CACHE_KEY.format(user_id=user_id)
+
+
+def _count(name: str):
+    """Increment a board roles cache counter of the process, flushed to the cache every STATS_FLUSH_EVERY lookups."""
+    with _stats_lock:
+        _stats[name] += 1
+        if sum(_stats.values()) < STATS_FLUSH_EVERY:
+            return
+    flush_board_roles_cache_stats()
+
+
+def flush_board_roles_cache_stats():
+    """Add the counters of the process to the counters kept in the cache for all processes."""
+    with _stats_lock:
+        pending = dict(_stats)
+        _stats.update(dict.fromkeys(_stats, 0))
+    for name, value in pending.items():
+        if not value:
+            continue
+        key = STATS_CACHE_KEY.format(name=name)
+        try:
+            cache.incr(key, value)
+        except ValueError:
+            if not cache.add(key, value, timeout=None):
+                cache.incr(key, value)
+
+
+def board_roles_cache_stats() -> dict:
+    """Return the hits and misses of the board roles cache flushed by all processes and not flushed yet by this one."""
+    stats = cache.get_many([STATS_CACHE_KEY.format(name=name) for name in _stats])
+    with _stats_lock:
+        return {name: stats.get(STATS_CACHE_KEY.format(name=name), 0) + _stats[name] for name in _stats}
+
+
+def reset_board_roles_cache_stats():
+    with _stats_lock:
+        _stats.update(dict.fromkeys(_stats, 0))
+    cache.delete_many([STATS_CACHE_KEY.format(name=name) for name in _stats])
+
+
+def invalidate_board_roles(user_ids: Iterable[int]):
+    """Drop the cached board roles of the given users.
+
+    The entries are dropped immediately and once more after the current transaction commits, so that a concurrent
+    request cannot put back the roles read before the commit.
+    """
+    keys = [_roles_cache_key(user_id) for user_id in set(user_ids) if user_id is not None]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class BoardAccess:
+    """Board roles of a user.
+
+    All the roles of the user are loaded on first use, from the cache shared by all requests or with one query, so
+    the permission classes and the serializers handling the same request share a single lookup. The cached roles are
+    invalidated by the BoardParticipant signals (see goals.signals) and when a board is deleted, as deleted boards are
+    left out of the roles. The cache is only used if it is shared by all processes and not SQL-backed (see
+    `roles_cache_enabled`).
+
+    Attributes:
+        user (:obj:`User`): User whose roles are resolved.
+        use_cache (bool): True to read and store the roles in the cache. Defaults to `roles_cache_enabled()`.
+        read_roles (tuple): Roles allowed to read a board and its categories, goals and comments.
+        write_roles (tuple): Roles allowed to create and change categories, goals and comments.
+    """
+
+    read_roles = (BoardParticipant.Role.owner, BoardParticipant.Role.writer, BoardParticipant.Role.reader)
+    write_roles = (BoardParticipant.Role.owner, BoardParticipant.Role.writer)
+
+    def __init__(self, user, use_cache: Optional[bool] = None):
+        self.user = user
+        self.use_cache = roles_cache_enabled() if use_cache is None else use_cache
+        self._roles = None
+
+    @property
+    def roles(self) -> dict:
+        """Return the {board_id: role} dictionary of the user's boards."""
+        if self._roles is None:
+            if self.user is None or not self.user.is_authenticated:
+                self._roles = {}
+            else:
+                self._roles = self._load_roles()
+        return self._roles
+
+    def _load_roles(self) -> dict:
+        key = _roles_cache_key(self.user.pk)
+        if self.use_cache:
+            roles = cache.get(key)
+            if roles is not None:
+                _count("hits")
+                return roles
+            _count("misses")
+        roles = dict(
+            BoardParticipant.objects.filter(user=self.user, board__is_deleted=False).values_list("board_id", "role")
+        )
+        if self.use_cache:
+            cache.set(key, roles, settings.BOARD_ACCESS_CACHE_TIMEOUT)
+        return roles
+
+    def role(self, board: Union[Board, int]) -> Optional[int]:
+        """Return the user's role on the board, or None if the user is not a board participant."""
+        return self.roles.get(getattr(board, "pk", board))
+
+    def can_read(self, board: Union[Board, int]) -> bool:
+        return self.role(board) in self.read_roles
+
+    def can_write(self, board: Union[Board, int]) -> bool:
+        return self.role(board) in self.write_roles
+
+    def is_owner(self, board: Union[Board, int]) -> bool:
+        return self.role(board) == BoardParticipant.Role.owner
+
+    def board_ids(self, roles: tuple = read_roles) -> list:
+        """Return the ids of the boards on which the user has one of the given roles."""
+        return [board_id for board_id, role in self.roles.items() if role in roles]
+
+
+def get_board_access(request) -> BoardAccess:
+    """Return the BoardAccess of the request user, created once per request.
+
+    Args:
+        request: DRF Request or Django HttpRequest.
+    """
+    http_request = getattr(request, "_request", request)
+    access = getattr(http_request, "_board_access", None)
+    if access is None or getattr(access.user, "pk", None) != getattr(request.user, "pk", None):
+        access = BoardAccess(request.user)
+        http_request._board_access = access
+    return access
@@ -0,0 +1,78 @@
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from goals.access import invalidate_board_roles
+from goals.models import Board, Goal, GoalCategory, PendingCascade, Status
+
+
+def delete_board(board: Board) -> PendingCascade:
+    """Mark the board deleted and schedule the archiving of its categories and goals.
+
+    The cached roles of the participants are dropped, so the board and everything on it disappear from their reads
+    at once, before the cascade has reached the rows.
+    """
+    with transaction.atomic():
+        board.is_deleted = True
+        board.save()
+        invalidate_board_roles(board.participants.values_list("user_id", flat=True))
+        return PendingCascade.objects.create(board=board)
+
+
+def delete_category(category: GoalCategory) -> PendingCascade:
+    """Mark the category deleted and schedule the archiving of its goals."""
+    with transaction.atomic():
+        category.is_deleted = True
+        category.save()
+        return PendingCascade.objects.create(board_id=category.board_id, category=category)
+
+
+def _children(task: PendingCascade) -> list:
+    """Return the querysets of the rows still to be archived by the task and the changes archiving them."""
+    if task.category_id is not None:
+        return [(Goal.objects.filter(category_id=task.category_id).exclude(status=Status.archived),
+                 {"status": Status.archived})]
+    return [
+        (GoalCategory.objects.filter(board_id=task.board_id, is_deleted=False), {"is_deleted": True}),
+        (Goal.objects.filter(board_id=task.board_id).exclude(status=Status.archived), {"status": Status.archived}),
+    ]
+
+
+def cascade_batch(task: PendingCascade, batch_size: Optional[int] = None) -> Optional[int]:
+    """Archive up to batch_size rows of every kind left by the task in one short transaction.
+
+    The task row is locked with SKIP LOCKED, so concurrent workers never process the same task. The task is removed
+    once a batch finds fewer rows than batch_size of every kind.
+
+    Returns:
+        The number of archived rows, or None if the task is finished or is being processed by another worker.
+    """
+    batch_size = batch_size or settings.DELETION_CASCADE_BATCH_SIZE
+    with transaction.atomic():
+        if not PendingCascade.objects.select_for_update(skip_locked=True).filter(pk=task.pk).exists():
+            return None
+        now, archived, finished = timezone.now(), 0, True
+        for queryset, changes in _children(task):
+            ids = list(queryset.order_by().values_list("id", flat=True)[:batch_size])
+            if len(ids) == batch_size:
+                finished = False
+            if ids:
+                archived += queryset.model.objects.filter(id__in=ids).update(**changes, updated=now)
+        if finished:
+            task.delete()
+    return archived or None
+
+
+def run_cascade(task: PendingCascade, batch_size: Optional[int] = None, max_batches: Optional[int] = None) -> int:
+    """Run batches of the task until it is finished or max_batches have run. Returns the number of archived rows."""
+    total, batches = 0, 0
+    while max_batches is None or batches < max_batches:
+        archived = cascade_batch(task, batch_size)
+        if archived is None:
+            break
+        total += archived
+        batches += 1
+    return total
+
@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from django.db.models import Count, QuerySet
+from django.utils import timezone
+
+from goals.models import Goal, Status
+
+
+OPEN_STATUSES = (Status.to_do, Status.in_progress)
+
+
+def open_goals(board_ids: Iterable[int]) -> QuerySet[Goal]:
+    """Return the goals of the boards that are still to do or in progress.
+
+    Filtering by the open statuses and the due date lets the queries use the goal_open_due_date_idx partial index.
+    Goals of deleted categories which have not been archived yet are left out.
+    """
+    return Goal.objects.filter(board_id__in=board_ids, status__in=OPEN_STATUSES, category__is_deleted=False)
+
+
+def overdue_goals(board_ids: Iterable[int], now: Optional[datetime] = None) -> QuerySet[Goal]:
+    """Return the open goals of the boards whose due date has passed."""
+    return open_goals(board_ids).filter(due_date__lt=now or timezone.now())
+
+
+def due_soon_goals(board_ids: Iterable[int], days: int, now: Optional[datetime] = None) -> QuerySet[Goal]:
+    """Return the open goals of the boards which are due within the given number of days."""
+    now = now or timezone.now()
+    return open_goals(board_ids).filter(due_date__gte=now, due_date__lt=now + timedelta(days=days))
+
+
+def count_by_board(queryset: QuerySet[Goal]) -> list:
+    """Return the number of goals of the queryset on each board as a list of {"board", "count"} dictionaries."""
+    return list(queryset.order_by("board").values("board").annotate(count=Count("id")))
@@ -0,0 +1,48 @@
+import csv
+import json
+from typing import Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.utils import timezone
+
+
+EXPORT_FIELDS = (
+    "id", "title", "description", "status", "priority", "due_date", "board", "category", "user", "created", "updated",
+)
+
+
+class _Echo:
+    """File-like object returning the written value, so that csv.writer produces one line at a time."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def export_rows(queryset: QuerySet, chunk_size: int = 2000) -> Iterator[dict]:
+    """Yield the goals of the queryset as dictionaries of EXPORT_FIELDS.
+
+    The rows are read with a server-side cursor in chunks of chunk_size rows, without creating model instances,
+    so the memory used does not depend on the number of goals.
+    """
+    columns = ["user__username" if name == "user" else name for name in EXPORT_FIELDS]
+    for values in queryset.order_by("id").values_list(*columns).iterator(chunk_size=chunk_size):
+        row = dict(zip(EXPORT_FIELDS, values))
+        for name in ("due_date", "created", "updated"):
+            if row[name] is not None:
+                row[name] = timezone.localtime(row[name]).isoformat()
+        yield row
+
+
+def iter_csv(rows: Iterable[dict]) -> Iterator[str]:
+    """Yield the header and the rows as CSV lines."""
+    writer = csv.DictWriter(_Echo(), fieldnames=EXPORT_FIELDS)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_ndjson(rows: Iterable[dict]) -> Iterator[str]:
+    """Yield the rows as newline-delimited JSON."""
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False, cls=DjangoJSONEncoder) + "\n"
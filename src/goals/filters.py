@@ -1,17 +1,27 @@
+import operator
+from functools import reduce
+
 import django_filters
+from django.contrib.postgres.search import SearchQuery, SearchRank
 from django.db import models
+from django.db.models import F, Max, OuterRef, Q, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
 from django_filters import rest_framework
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
 from goals.models.goal_category import GoalCategory
 from goals.models.goal import Goal
+from goals.models.goal_comment import GoalComment
 
 
 class GoalDateFilter(rest_framework.FilterSet):
-    """Filter queryset of Goal instances by due_date, category, status and priority fields"""
+    """Filter queryset of Goal instances by due_date, board, category, status and priority fields"""
 
     class Meta:
         model = Goal
         fields = {
             "due_date": ("lte", "gte"),
+            "board": ("exact", "in"),
             "category": ("exact", "in"),
             "status": ("exact", "in"),
             "priority": ("exact", "in"),
@@ -30,3 +40,42 @@ class BoardGoalCategoryFilter(rest_framework.FilterSet):
         fields = {
             "board": ("exact", "in"),
         }
+
+
+class GoalFullTextSearchFilter(BaseFilterBackend):
+    """Full-text search of goals by title and description and by the text of their comments.
+
+    The search vectors are maintained by database triggers (see migration 0017) and indexed with GIN indexes. The
+    query is parsed with the websearch syntax in both Russian and English, so words of either language are matched
+    by their stems. The goals are annotated with the search rank and ordered by it, a match in the title weighing
+    more than a match in the description or in a comment.
+
+    Attributes:
+        search_param (str): Query parameter holding the search query.
+        search_configs (tuple): Text search configurations the query is parsed with.
+        comment_weight (float): Factor of the rank of the best matching comment added to the goal rank.
+    """
+
+    search_param = "q"
+    search_configs = ("russian", "english")
+    comment_weight = 0.5
+
+    def get_search_query(self, request) -> SearchQuery:
+        text = request.query_params.get(self.search_param, "").strip()
+        if not text:
+            raise ValidationError({self.search_param: ["This field is required."]})
+        queries = [SearchQuery(text, config=config, search_type="websearch") for config in self.search_configs]
+        return reduce(operator.or_, queries)
+
+    def filter_queryset(self, request, queryset: QuerySet, view) -> QuerySet:
+        query = self.get_search_query(request)
+        comments = GoalComment.objects.filter(search_vector=query)
+        comment_rank = comments.filter(goal=OuterRef("pk")).order_by().values("goal").annotate(
+            rank=Max(SearchRank(F("search_vector"), query))
+        ).values("rank")
+        return queryset.filter(
+            Q(search_vector=query) | Q(id__in=comments.values("goal_id"))
+        ).annotate(
+            rank=SearchRank(F("search_vector"), query)
+            + Coalesce(Subquery(comment_rank), Value(0.0)) * self.comment_weight
+        ).order_by("-rank", "id")
@@ -0,0 +1,454 @@
+import csv
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, time
+from tempfile import SpooledTemporaryFile
+from typing import Callable, Iterator, Optional, TextIO, Tuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from goals.access import BoardAccess
+from goals.models import Board, GoalCategory, Priority, Status
+
+
+class ImportFileError(ValueError):
+    """The imported file cannot be parsed."""
+
+
+class JsonStream:
+    """Incremental reader of a JSON document.
+
+    Only the part of the document being decoded is kept in memory, so arrays of any length can be walked element by
+    element with json.JSONDecoder.raw_decode.
+    """
+
+    whitespace = re.compile(r"\s*")
+
+    def __init__(self, file: TextIO, chunk_size: int = 1 << 16):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next character which is not whitespace, or an empty string at the end of the document."""
+        while True:
+            self.pos = self.whitespace.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, *chars: str) -> str:
+        """Consume the next character, which must be one of the given ones."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ImportFileError(f"Expected {' or '.join(chars)} in the JSON document")
+        self.pos += 1
+        return char
+
+    def decode(self):
+        """Decode the next JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as error:
+                if not self._fill():
+                    raise ImportFileError(f"Invalid JSON document: {error.msg}")
+                continue
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def iter_members(self) -> Iterator[Tuple[str, object]]:
+        """Yield the (key, value) members of the top-level object.
+
+        The elements of array members are yielded one by one as (key, element) pairs.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            return
+        while True:
+            key = self.decode()
+            if not isinstance(key, str):
+                raise ImportFileError("Expected an object key in the JSON document")
+            self.expect(":")
+            if self.peek() == "[":
+                self.pos += 1
+                if self.peek() == "]":
+                    self.pos += 1
+                else:
+                    while True:
+                        yield key, self.decode()
+                        if self.expect(",", "]") == "]":
+                            break
+            else:
+                yield key, self.decode()
+            if self.expect(",", "}") == "}":
+                return
+
+
+def parse_csv(file: TextIO) -> Iterator[Tuple[str, int, dict]]:
+    """Yield the goals of a CSV file with a header, e.g. one produced by the goal export."""
+    reader = csv.DictReader(file)
+    for row in reader:
+        yield "goal", reader.line_num, row
+
+
+def parse_ndjson(file: TextIO) -> Iterator[Tuple[str, int, dict]]:
+    """Yield the goals and comments of a newline-delimited JSON file.
+
+    Every line is an object with a `type` of "goal" (default) or "comment". Comments refer to the `key` of a goal
+    of the same file with their `goal` member.
+    """
+    for line, text in enumerate(file, 1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except json.JSONDecodeError as error:
+            raise ImportFileError(f"Invalid JSON on line {line}: {error.msg}")
+        if not isinstance(row, dict):
+            raise ImportFileError(f"Expected an object on line {line}")
+        yield row.get("type", "goal"), line, row
+
+
+def parse_trello(file: TextIO) -> Iterator[Tuple[str, int, dict]]:
+    """Yield the categories, goals and comments of a Trello board export.
+
+    Lists become categories, cards become goals (archived if closed, done if their due date is complete) and
+    comment actions become comments. The export is read incrementally, so its size is not limited by memory.
+    """
+    for index, (key, item) in enumerate(JsonStream(file).iter_members(), 1):
+        if not isinstance(item, dict):
+            continue
+        if key == "lists":
+            yield "category", index, {"key": item.get("id"), "title": item.get("name")}
+        elif key == "cards":
+            if item.get("closed"):
+                status = Status.archived
+            elif item.get("dueComplete"):
+                status = Status.done
+            else:
+                status = Status.to_do
+            yield "goal", index, {
+                "key": item.get("id"),
+                "title": item.get("name"),
+                "description": item.get("desc"),
+                "due_date": item.get("due"),
+                "status": status,
+                "category_key": item.get("idList"),
+            }
+        elif key == "actions" and item.get("type") == "commentCard":
+            data = item.get("data") or {}
+            yield "comment", index, {"goal": (data.get("card") or {}).get("id"), "text": data.get("text")}
+
+
+@dataclass
+class ImportReport:
+    """Result of an import.
+
+    Attributes:
+        categories (int): Number of created categories.
+        goals (int): Number of created goals.
+        comments (int): Number of created comments.
+        error_count (int): Number of rejected rows.
+        errors (list): Line numbers and errors of the first rejected rows.
+    """
+
+    max_errors = 100
+
+    categories: int = 0
+    goals: int = 0
+    comments: int = 0
+    error_count: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, line: int, errors: dict):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "errors": errors})
+
+
+class GoalImporter:
+    """Bulk import of goals and comments.
+
+    The rows are parsed and validated one at a time and written to temporary files, then loaded with COPY into
+    temporary staging tables and merged into the goal tables with a few set-based statements in one transaction.
+    Categories are checked in bulk: they must exist, must not be deleted, and the user must be able to write to
+    their boards. Rejected rows are listed in the report, the valid ones are imported.
+
+    Attributes:
+        parsers (dict): Row parsers by input format.
+        progress_every (int): Number of parsed rows between progress reports.
+    """
+
+    parsers = {"csv": parse_csv, "ndjson": parse_ndjson, "trello": parse_trello}
+    progress_every = 10000
+
+    staging_columns = {
+        "category": ("line", "key", "title"),
+        "goal": (
+            "line", "key", "title", "description", "status", "priority", "due_date", "category_id", "category_key",
+        ),
+        "comment": ("line", "goal_key", "text"),
+    }
+    staging_tables = """
+        CREATE TEMPORARY TABLE goals_import_category (
+            line integer, key text, title text
+        ) ON COMMIT DROP;
+        CREATE TEMPORARY TABLE goals_import_goal (
+            line integer, key text, title text, description text, status smallint, priority smallint,
+            due_date timestamptz, category_id bigint, category_key text, id bigint
+        ) ON COMMIT DROP;
+        CREATE TEMPORARY TABLE goals_import_comment (
+            line integer, goal_key text, text text
+        ) ON COMMIT DROP;
+    """
+
+    def __init__(self, access: BoardAccess, board: Optional[Board] = None,
+                 progress: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            access (:obj:`BoardAccess`): Board roles of the importing user, who becomes the author of the rows.
+            board (:obj:`Board`, optional): Board the categories of a Trello export are created on.
+            progress (callable, optional): Called with a message after every stage of the import.
+        """
+        self.access = access
+        self.user = access.user
+        self.board = board
+        self.progress = progress or (lambda message: None)
+
+    def run(self, file: TextIO, input_format: str) -> ImportReport:
+        """Import the rows of the file in the given format."""
+        if input_format not in self.parsers:
+            raise ImportFileError(f"Unknown input format {input_format}")
+        report = ImportReport()
+        files = {kind: SpooledTemporaryFile(max_size=8 << 20, mode="w+", newline="") for kind in self.staging_columns}
+        try:
+            counts = self._stage(self.parsers[input_format](file), files, report)
+            self.progress(f"Parsed {sum(counts.values())} rows, rejected {report.error_count}")
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(self.staging_tables)
+                for kind, staging_file in files.items():
+                    staging_file.seek(0)
+                    columns = ", ".join(self.staging_columns[kind])
+                    cursor.copy_expert(
+                        f"COPY goals_import_{kind} ({columns}) FROM STDIN WITH (FORMAT csv)", staging_file
+                    )
+                self.progress("Loaded the staging tables")
+                self._merge(cursor, report)
+        finally:
+            for staging_file in files.values():
+                staging_file.close()
+        self.progress(
+            f"Imported {report.categories} categories, {report.goals} goals and {report.comments} comments, "
+            f"rejected {report.error_count} rows"
+        )
+        return report
+
+    def _stage(self, rows: Iterator[Tuple[str, int, dict]], files: dict, report: ImportReport) -> dict:
+        """Validate the parsed rows and write the valid ones to the staging files."""
+        writers = {kind: csv.writer(staging_file) for kind, staging_file in files.items()}
+        counts = dict.fromkeys(self.staging_columns, 0)
+        for number, (kind, line, row) in enumerate(rows, 1):
+            validate = getattr(self, f"_validate_{kind}", None)
+            if validate is None:
+                report.add_error(line, {"type": [f"Unknown row type {kind}"]})
+                continue
+            values, errors = validate(row)
+            if errors:
+                report.add_error(line, errors)
+                continue
+            writers[kind].writerow([line, *values])
+            counts[kind] += 1
+            if number % self.progress_every == 0:
+                self.progress(f"Parsed {number} rows")
+        return counts
+
+    @staticmethod
+    def _text(row: dict, name: str) -> Optional[str]:
+        value = row.get(name)
+        if value is None or value == "":
+            return None
+        return str(value)
+
+    def _validate_category(self, row: dict) -> Tuple[tuple, dict]:
+        errors = {}
+        title = self._text(row, "title")
+        if title is None or len(title) > 255:
+            errors["title"] = ["Ensure this field is not empty and has no more than 255 characters."]
+        if self.board is None:
+            errors["board"] = ["A board is required to import categories."]
+        return (self._text(row, "key"), title), errors
+
+    def _validate_goal(self, row: dict) -> Tuple[tuple, dict]:
+        errors = {}
+        title = self._text(row, "title")
+        if title is None or len(title) > 255:
+            errors["title"] = ["Ensure this field is not empty and has no more than 255 characters."]
+
+        choices = {}
+        for name, choice_class, default in (("status", Status, Status.to_do), ("priority", Priority, Priority.medium)):
+            value = row.get(name)
+            if value is None or value == "":
+                choices[name] = default
+                continue
+            try:
+                choices[name] = int(value)
+            except (TypeError, ValueError):
+                choices[name] = None
+            if choices[name] not in choice_class.values:
+                errors[name] = [f'"{value}" is not a valid choice.']
+
+        due_date = self._text(row, "due_date")
+        if due_date is not None:
+            due_date = self._parse_datetime(due_date)
+            if due_date is None:
+                errors["due_date"] = ["Datetime has wrong format."]
+
+        category_id, category_key = self._text(row, "category"), self._text(row, "category_key")
+        if category_id is not None:
+            try:
+                category_id = int(category_id)
+            except ValueError:
+                errors["category"] = ["A valid integer is required."]
+        elif category_key is None:
+            errors["category"] = ["This field is required."]
+
+        values = (
+            self._text(row, "key"), title, self._text(row, "description"), choices["status"], choices["priority"],
+            due_date.isoformat() if isinstance(due_date, datetime) else None, category_id, category_key,
+        )
+        return values, errors
+
+    def _validate_comment(self, row: dict) -> Tuple[tuple, dict]:
+        errors = {}
+        text = self._text(row, "text")
+        if text is None or len(text) > 255:
+            errors["text"] = ["Ensure this field is not empty and has no more than 255 characters."]
+        goal_key = self._text(row, "goal")
+        if goal_key is None:
+            errors["goal"] = ["This field is required."]
+        return (goal_key, text), errors
+
+    @staticmethod
+    def _parse_datetime(value: str) -> Optional[datetime]:
+        try:
+            parsed = parse_datetime(value)
+            if parsed is None:
+                parsed_date = parse_date(value)
+                parsed = datetime.combine(parsed_date, time()) if parsed_date else None
+        except ValueError:
+            return None
+        if parsed is not None and timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+    def _reject(self, cursor, report: ImportReport, field_name: str, message: str):
+        """Report the rows returned by the last DELETE ... RETURNING line statement."""
+        for (line,) in cursor.fetchall():
+            report.add_error(line, {field_name: [message]})
+
+    def _merge(self, cursor, report: ImportReport):
+        """Merge the staging tables into the goal tables.
+
+        The rows are stamped with the clock of the database when they are inserted, not with a time taken before the
+        transaction, and the sync cursor never passes the start of an open transaction (see goals.sync), so a sync
+        polling during a long import gets the imported rows once they are committed.
+        """
+        params = {"user": self.user.pk, "board": getattr(self.board, "pk", None)}
+
+        cursor.execute("SELECT count(*) FROM goals_import_category")
+        if cursor.fetchone()[0]:
+            if not self.access.can_write(self.board):
+                raise ImportFileError("У Вас нет права создавать категории на данной доске.")
+            cursor.execute("""
+                INSERT INTO goals_goalcategory (title, board_id, user_id, is_deleted, created, updated)
+                SELECT DISTINCT s.title, %(board)s, %(user)s, false, clock_timestamp(), clock_timestamp()
+                FROM goals_import_category s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM goals_goalcategory c
+                    WHERE c.board_id = %(board)s AND c.title = s.title AND NOT c.is_deleted
+                )
+            """, params)
+            report.categories = cursor.rowcount
+            cursor.execute("""
+                UPDATE goals_import_goal g SET category_id = c.id
+                FROM goals_import_category s
+                JOIN goals_goalcategory c ON c.board_id = %(board)s AND c.title = s.title AND NOT c.is_deleted
+                WHERE g.category_id IS NULL AND g.category_key = s.key
+            """, params)
+        self.progress(f"Created {report.categories} categories")
+
+        cursor.execute("DELETE FROM goals_import_goal WHERE category_id IS NULL RETURNING line")
+        self._reject(cursor, report, "category", "Unknown list.")
+        cursor.execute("SELECT DISTINCT category_id FROM goals_import_goal")
+        categories = GoalCategory.objects.in_bulk([category_id for (category_id,) in cursor.fetchall()])
+        rejected = {}
+        for category_id, category in categories.items():
+            if category.is_deleted:
+                rejected.setdefault("Not allowed in deleted category", []).append(category_id)
+            elif not self.access.can_write(category.board_id):
+                rejected.setdefault("У Вас нет права создавать цели для данной категории.", []).append(category_id)
+        cursor.execute(
+            "DELETE FROM goals_import_goal WHERE NOT (category_id = ANY(%s)) RETURNING line, category_id",
+            [list(categories)],
+        )
+        for line, category_id in cursor.fetchall():
+            report.add_error(line, {"category": [f'Invalid pk "{category_id}" - object does not exist.']})
+        for message, category_ids in rejected.items():
+            cursor.execute(
+                "DELETE FROM goals_import_goal WHERE category_id = ANY(%s) RETURNING line", [category_ids]
+            )
+            self._reject(cursor, report, "category", message)
+        cursor.execute("""
+            DELETE FROM goals_import_goal a USING goals_import_goal b
+            WHERE a.key = b.key AND a.line > b.line
+            RETURNING a.line
+        """)
+        self._reject(cursor, report, "key", "Duplicate key.")
+
+        cursor.execute("UPDATE goals_import_goal SET id = nextval(pg_get_serial_sequence('goals_goal', 'id'))")
+        cursor.execute("""
+            INSERT INTO goals_goal (
+                id, title, description, status, priority, due_date, category_id, board_id, user_id, created, updated
+            )
+            SELECT s.id, s.title, coalesce(s.description, ''), s.status, s.priority, s.due_date, s.category_id,
+                c.board_id, %(user)s, clock_timestamp(), clock_timestamp()
+            FROM goals_import_goal s JOIN goals_goalcategory c ON c.id = s.category_id
+            ORDER BY s.line
+        """, params)
+        report.goals = cursor.rowcount
+        self.progress(f"Created {report.goals} goals")
+
+        cursor.execute("""
+            DELETE FROM goals_import_comment s
+            WHERE NOT EXISTS (SELECT 1 FROM goals_import_goal g WHERE g.key = s.goal_key)
+            RETURNING line
+        """)
+        self._reject(cursor, report, "goal", "Unknown goal.")
+        cursor.execute("""
+            INSERT INTO goals_goalcomment (text, goal_id, board_id, user_id, created, updated)
+            SELECT s.text, g.id, c.board_id, %(user)s, clock_timestamp(), clock_timestamp()
+            FROM goals_import_comment s
+            JOIN goals_import_goal g ON g.key = s.goal_key
+            JOIN goals_goalcategory c ON c.id = g.category_id
+            ORDER BY s.line
+        """, params)
+        report.comments = cursor.rowcount
+        self.progress(f"Created {report.comments} comments")
@@ -0,0 +1,73 @@
+import time
+from typing import NoReturn
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+
+from core.models import User
+from goals.models import Board, BoardParticipant
+from goals.serializers import BoardSerializer
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """Measures BoardSerializer.update for boards with a growing number of members.
+
+    For every size a board with that many readers is created, then updated so that half of the members keep their
+    role, a quarter become writers, a quarter are removed and as many new users are added. The statements and the
+    time of the update are printed. Everything is rolled back afterwards.
+    """
+    help = "Benchmark syncing the participants of boards of several sizes"
+
+    username_prefix = "benchmark_member"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500, 1000])
+
+    def handle(self, *args, **options) -> NoReturn:
+        self.stdout.write(f"{'members':>8} {'queries':>8} {'ms':>8}")
+        for size in options["sizes"]:
+            try:
+                with transaction.atomic():
+                    queries, elapsed = self.measure(size)
+                    raise _Rollback
+            except _Rollback:
+                pass
+            self.stdout.write(f"{size:>8} {queries:>8} {elapsed * 1000:>8.1f}")
+
+    def measure(self, size: int) -> tuple:
+        users = User.objects.bulk_create(
+            User(username=f"{self.username_prefix}_{size}_{index}") for index in range(size * 5 // 4 + 1)
+        )
+        owner, members, newcomers = users[0], users[1:size + 1], users[size + 1:]
+        board = Board.objects.create(title=f"Benchmark {size}")
+        BoardParticipant.objects.bulk_create(
+            [BoardParticipant(board=board, user=owner, role=BoardParticipant.Role.owner)]
+            + [BoardParticipant(board=board, user=user, role=BoardParticipant.Role.reader) for user in members]
+        )
+
+        kept, promoted = members[:size // 2], members[size // 2:size * 3 // 4]
+        participants = [
+            {"user": user.username, "role": BoardParticipant.Role.reader} for user in kept
+        ] + [
+            {"user": user.username, "role": BoardParticipant.Role.writer} for user in promoted + newcomers
+        ]
+        request = Request(RequestFactory().put("/"))
+        request.user = owner
+
+        board = BoardSerializer.setup_eager_loading(Board.objects.filter(pk=board.pk)).get()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            serializer = BoardSerializer(
+                board, data={"title": board.title, "participants": participants}, context={"request": request}
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            elapsed = time.perf_counter() - started
+        return len(captured), elapsed
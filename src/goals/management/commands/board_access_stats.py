@@ -0,0 +1,37 @@
+from typing import NoReturn
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from goals.access import board_roles_cache_stats, reset_board_roles_cache_stats, roles_cache_enabled
+
+
+class Command(BaseCommand):
+    """Prints the hit and miss counters of the board roles cache.
+
+    Every process counts its lookups in memory and adds them to the counters kept in the cache every
+    `STATS_FLUSH_EVERY` lookups, so the printed numbers lag behind by up to that many lookups per process. With a per
+    process or a database backend the roles are not cached at all, which is printed instead.
+    """
+    help = "Print the hits and misses of the board roles cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Reset the counters after printing them")
+
+    def handle(self, *args, **options) -> NoReturn:
+        if not roles_cache_enabled():
+            self.stdout.write(
+                f"Backend {settings.CACHES['default']['BACKEND']} is per process or SQL-backed, the board roles are "
+                "not cached. Set CACHE_URL to a shared cache, e.g. rediscache:// or filecache:// on a shared volume."
+            )
+            return
+        stats = board_roles_cache_stats()
+        total = stats["hits"] + stats["misses"]
+        ratio = stats["hits"] / total if total else 0
+        self.stdout.write(f"Backend: {settings.CACHES['default']['BACKEND']}")
+        self.stdout.write(f"Timeout: {settings.BOARD_ACCESS_CACHE_TIMEOUT}s")
+        self.stdout.write(f"Hits: {stats['hits']}")
+        self.stdout.write(f"Misses: {stats['misses']}")
+        self.stdout.write(f"Hit ratio: {ratio:.2%}")
+        if options["reset"]:
+            reset_board_roles_cache_stats()
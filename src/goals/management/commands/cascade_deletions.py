@@ -0,0 +1,41 @@
+import time
+from typing import NoReturn
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from goals.cascade import run_cascade
+from goals.models import DeletionLog, PendingCascade
+
+
+class Command(BaseCommand):
+    """Archives the categories and goals of deleted boards and categories in bounded batches.
+
+    Every batch runs in its own short transaction, and a cascade is recorded as done only when nothing is left, so
+    the command can be interrupted and run again at any time. Several instances may run side by side, each pending
+    cascade being processed by one of them. The records of the deletion log older than the retention of the sync
+    feed are pruned as well, once per `--prune-interval` with `--loop`.
+    """
+    help = "Finish the pending cascades of deleted boards and categories"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.DELETION_CASCADE_BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new cascades")
+        parser.add_argument("--interval", type=float, default=5, help="Seconds between polls with --loop")
+        parser.add_argument(
+            "--prune-interval", type=float, default=3600, help="Seconds between prunings of the deletion log"
+        )
+
+    def handle(self, *args, **options) -> NoReturn:
+        pruned_at = None
+        while True:
+            if pruned_at is None or time.monotonic() - pruned_at >= options["prune_interval"]:
+                pruned_at = time.monotonic()
+                self.stdout.write(f"Pruned {DeletionLog.prune()} deletion log records")
+            for task in PendingCascade.objects.order_by("id"):
+                archived = run_cascade(task, batch_size=options["batch_size"])
+                target = f"category {task.category_id}" if task.category_id else f"board {task.board_id}"
+                self.stdout.write(f"Archived {archived} rows of {target}")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
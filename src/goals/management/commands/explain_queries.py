@@ -0,0 +1,170 @@
+import random
+from datetime import timedelta
+from typing import NoReturn
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from core.models import User
+from goals import views
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment, Status, Priority
+
+
+class Command(BaseCommand):
+    """Seeds a large dataset and prints the query plans of the goals views.
+
+    The queryset of every list and detail view is built for one of the seeded users exactly as the view builds it
+    for a request, ordered and sliced like the first page, and explained with EXPLAIN ANALYZE.
+
+    Attributes:
+        username_prefix (str): Prefix of the seeded users' usernames.
+        list_views (:obj:`list`): List views whose querysets are explained.
+        detail_views (:obj:`list`): Detail views whose querysets are explained.
+    """
+    help = "Seed a large dataset and print EXPLAIN ANALYZE for the goals views querysets"
+
+    username_prefix = "explain_user"
+    list_views = [
+        views.GoalListView,
+        views.GoalCategoryListView,
+        views.GoalCommentListView,
+        views.BoardListView,
+    ]
+    detail_views = [
+        views.GoalView,
+        views.GoalCategoryView,
+        views.GoalCommentView,
+        views.BoardView,
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=500)
+        parser.add_argument("--boards-per-user", type=int, default=3)
+        parser.add_argument("--participants-per-board", type=int, default=4)
+        parser.add_argument("--categories-per-board", type=int, default=5)
+        parser.add_argument("--goals-per-category", type=int, default=20)
+        parser.add_argument("--comments-per-goal", type=int, default=2)
+        parser.add_argument("--no-seed", action="store_true", help="Explain the existing data without seeding")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for the generated dataset")
+
+    def handle(self, *args, **options) -> NoReturn:
+        if not options["no_seed"]:
+            self._seed(options)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        participants = User.objects.filter(participants__isnull=False).order_by("id")
+        user = participants.filter(username__startswith=self.username_prefix).first() or participants.first()
+        if user is None:
+            self.stderr.write("No board participants found, nothing to explain.")
+            return
+        goal = Goal.objects.filter(board__participants__user=user, comments__isnull=False).first()
+
+        for view_class in self.list_views:
+            params = {"goal": goal.id} if view_class is views.GoalCommentListView and goal else {}
+            view = self._make_view(view_class, user, params)
+            queryset = view.get_queryset()
+            ordering = getattr(view, "ordering", None)
+            if ordering:
+                queryset = queryset.order_by(*ordering)
+            self._explain(view_class.__name__, queryset[:api_settings.PAGE_SIZE])
+
+        for view_class in self.detail_views:
+            view = self._make_view(view_class, user)
+            queryset = view.get_queryset()
+            obj = queryset.order_by("id").first()
+            if obj is None:
+                continue
+            self._explain(view_class.__name__, queryset.filter(pk=obj.pk))
+
+    @staticmethod
+    def _make_view(view_class, user: User, params: dict = None):
+        """Return a view instance set up for a GET request of the given user."""
+        request = RequestFactory().get("/", params or {})
+        request.user = user
+        view = view_class()
+        view.setup(request)
+        view.request = Request(request)
+        view.request.user = user
+        view.format_kwarg = None
+        return view
+
+    def _explain(self, title: str, queryset) -> NoReturn:
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        self.stdout.write(str(queryset.query))
+        self.stdout.write(queryset.explain(analyze=True, buffers=True))
+        self.stdout.write("")
+
+    @transaction.atomic
+    def _seed(self, options: dict) -> NoReturn:
+        """Bulk create users, boards, participants, categories, goals and comments."""
+        rnd = random.Random(options["seed"])
+        start = User.objects.filter(username__startswith=self.username_prefix).count()
+        users = User.objects.bulk_create(
+            User(username=f"{self.username_prefix}{start + i}") for i in range(options["users"])
+        )
+        self.stdout.write(f"Users: {len(users)}")
+
+        boards = Board.objects.bulk_create(
+            Board(title=f"Board {i}", is_deleted=rnd.random() < 0.05)
+            for i in range(len(users) * options["boards_per_user"])
+        )
+        self.stdout.write(f"Boards: {len(boards)}")
+
+        participants = []
+        for i, board in enumerate(boards):
+            owner = users[i // options["boards_per_user"]]
+            members = {owner.id: BoardParticipant.Role.owner}
+            for user in rnd.sample(users, min(options["participants_per_board"] - 1, len(users))):
+                members.setdefault(user.id, rnd.choice(BoardParticipant.editable_choices))
+            participants.extend(
+                BoardParticipant(board=board, user_id=user_id, role=role) for user_id, role in members.items()
+            )
+        BoardParticipant.objects.bulk_create(participants, batch_size=5000)
+        self.stdout.write(f"Participants: {len(participants)}")
+
+        categories = GoalCategory.objects.bulk_create(
+            (
+                GoalCategory(
+                    board=board,
+                    user=users[i // options["boards_per_user"]],
+                    title=f"Category {j}",
+                    is_deleted=board.is_deleted or rnd.random() < 0.05,
+                )
+                for i, board in enumerate(boards)
+                for j in range(options["categories_per_board"])
+            ),
+            batch_size=5000,
+        )
+        self.stdout.write(f"Categories: {len(categories)}")
+
+        goals = []
+        now = timezone.now()
+        statuses = list(Status)
+        for category in categories:
+            for j in range(options["goals_per_category"]):
+                goals.append(Goal(
+                    category=category,
+                    board_id=category.board_id,
+                    user_id=category.user_id,
+                    title=f"Goal {j}",
+                    status=Status.archived if category.is_deleted else rnd.choice(statuses),
+                    priority=rnd.choice(list(Priority)),
+                    due_date=now + timedelta(days=rnd.randint(-60, 60)) if rnd.random() < 0.8 else None,
+                ))
+        goals = Goal.objects.bulk_create(goals, batch_size=5000)
+        self.stdout.write(f"Goals: {len(goals)}")
+
+        comments = GoalComment.objects.bulk_create(
+            (
+                GoalComment(goal=goal, board_id=goal.board_id, user_id=goal.user_id, text=f"Comment {j}")
+                for goal in goals
+                for j in range(options["comments_per_goal"])
+            ),
+            batch_size=5000,
+        )
+        self.stdout.write(f"Comments: {len(comments)}")
@@ -0,0 +1,54 @@
+import os
+from typing import NoReturn
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import User
+from goals.access import BoardAccess
+from goals.imports import GoalImporter, ImportFileError
+from goals.models import Board
+
+
+class Command(BaseCommand):
+    """Imports goals and comments from a CSV, NDJSON or Trello JSON file on behalf of a user.
+
+    The input format defaults to the file extension. Progress is printed after every stage of the import, followed
+    by the rejected rows.
+    """
+    help = "Import goals from a CSV, NDJSON or Trello JSON file with COPY"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import")
+        parser.add_argument("--user", required=True, help="Username of the author of the imported rows")
+        parser.add_argument("--input", choices=tuple(GoalImporter.parsers), help="Input format")
+        parser.add_argument("--board", type=int, help="Board the lists of a Trello export are imported to")
+
+    def handle(self, *args, **options) -> NoReturn:
+        try:
+            user = User.objects.get(username=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist")
+        board = None
+        if options["board"] is not None:
+            board = Board.objects.filter(pk=options["board"], is_deleted=False).first()
+            if board is None:
+                raise CommandError(f"Board {options['board']} does not exist")
+
+        input_format = options["input"]
+        if input_format is None:
+            extension = os.path.splitext(options["path"])[1].lstrip(".").lower()
+            input_format = "trello" if extension == "json" else extension
+        if input_format == "trello" and board is None:
+            raise CommandError("--board is required to import a Trello export")
+
+        importer = GoalImporter(BoardAccess(user), board=board, progress=self.stdout.write)
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as file:
+                report = importer.run(file, input_format)
+        except (OSError, ImportFileError, UnicodeDecodeError) as error:
+            raise CommandError(str(error))
+
+        for error in report.errors:
+            self.stderr.write(f"Line {error['line']}: {error['errors']}")
+        if report.error_count > len(report.errors):
+            self.stderr.write(f"... and {report.error_count - len(report.errors)} more rejected rows")
@@ -0,0 +1,30 @@
+# Generated by Django 4.1.13 on 2026-10-18 13:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("goals", "0012_alter_boardparticipant_options"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="goal",
+            index=models.Index(
+                fields=["-priority", "due_date", "id"],
+                name="goal_priority_due_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="goalcategory",
+            index=models.Index(fields=["title", "id"], name="goalcategory_title_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="goalcomment",
+            index=models.Index(
+                fields=["-created", "id"], name="goalcomment_created_idx"
+            ),
+        ),
+    ]
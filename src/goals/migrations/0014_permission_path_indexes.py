@@ -0,0 +1,55 @@
+# Generated by Django 4.1.13 on 2026-10-18 13:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("goals", "0013_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="board",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["id"],
+                name="board_live_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="boardparticipant",
+            index=models.Index(
+                fields=["user", "board", "role"], name="boardpart_user_board_role_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="goal",
+            index=models.Index(
+                fields=["category", "status"], name="goal_category_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="goal",
+            index=models.Index(
+                condition=models.Q(("status", 4), _negated=True),
+                fields=["category"],
+                name="goal_live_category_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="goalcategory",
+            index=models.Index(
+                fields=["board", "is_deleted"], name="goalcategory_board_deleted_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="goalcategory",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["board"],
+                name="goalcategory_live_board_idx",
+            ),
+        ),
+    ]
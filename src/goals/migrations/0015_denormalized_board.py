@@ -0,0 +1,83 @@
+# Generated by Django 4.1.13 on 2026-10-18 13:27
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def fill_board(apps, schema_editor):
+    Goal = apps.get_model("goals", "Goal")
+    GoalCategory = apps.get_model("goals", "GoalCategory")
+    GoalComment = apps.get_model("goals", "GoalComment")
+
+    Goal.objects.update(
+        board=Subquery(GoalCategory.objects.filter(pk=OuterRef("category")).values("board")[:1])
+    )
+    GoalComment.objects.update(
+        board=Subquery(Goal.objects.filter(pk=OuterRef("goal")).values("board")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("goals", "0014_permission_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="goal",
+            name="board",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="goals",
+                to="goals.board",
+                verbose_name="Доска",
+            ),
+        ),
+        migrations.AddField(
+            model_name="goalcomment",
+            name="board",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="comments",
+                to="goals.board",
+                verbose_name="Доска",
+            ),
+        ),
+        migrations.RunPython(fill_board, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="goal",
+            name="board",
+            field=models.ForeignKey(
+                editable=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="goals",
+                to="goals.board",
+                verbose_name="Доска",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="goalcomment",
+            name="board",
+            field=models.ForeignKey(
+                editable=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="comments",
+                to="goals.board",
+                verbose_name="Доска",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="goal",
+            index=models.Index(
+                condition=models.Q(("status", 4), _negated=True),
+                fields=["board"],
+                name="goal_live_board_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 4.1.13 on 2026-10-18 13:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("goals", "0015_denormalized_board"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeletionLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("category", "Категория"),
+                            ("goal", "Цель"),
+                            ("comment", "Комментарий"),
+                            ("participant", "Участник"),
+                        ],
+                        max_length=20,
+                        verbose_name="Тип",
+                    ),
+                ),
+                ("object_id", models.BigIntegerField(verbose_name="Id объекта")),
+                (
+                    "deleted",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Дата удаления"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Удалённый объект",
+                "verbose_name_plural": "Удалённые объекты",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="boardparticipant",
+            index=models.Index(
+                fields=["board", "updated"], name="boardpart_board_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="goal",
+            index=models.Index(
+                fields=["board", "updated"], name="goal_board_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="goalcategory",
+            index=models.Index(
+                fields=["board", "updated"], name="goalcategory_board_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="goalcomment",
+            index=models.Index(
+                fields=["board", "updated"], name="goalcomment_board_updated_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="deletionlog",
+            name="board",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="deletions",
+                to="goals.board",
+                verbose_name="Доска",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="deletionlog",
+            index=models.Index(
+                fields=["board", "deleted"], name="deletionlog_board_deleted_idx"
+            ),
+        ),
+    ]
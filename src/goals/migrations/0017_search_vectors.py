@@ -0,0 +1,86 @@
+# Generated by Django 4.1.13 on 2026-10-18 13:41
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+SEARCH_VECTOR_TRIGGERS = [
+    (
+        "goals_goal",
+        "setweight(to_tsvector('pg_catalog.russian', coalesce(NEW.title, '')), 'A') || "
+        "setweight(to_tsvector('pg_catalog.english', coalesce(NEW.title, '')), 'A') || "
+        "setweight(to_tsvector('pg_catalog.russian', coalesce(NEW.description, '')), 'B') || "
+        "setweight(to_tsvector('pg_catalog.english', coalesce(NEW.description, '')), 'B')",
+        "title, description",
+    ),
+    (
+        "goals_goalcomment",
+        "to_tsvector('pg_catalog.russian', coalesce(NEW.text, '')) || "
+        "to_tsvector('pg_catalog.english', coalesce(NEW.text, ''))",
+        "text",
+    ),
+]
+
+CREATE_TRIGGER_SQL = """
+CREATE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {vector};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER {table}_search_vector_trigger
+BEFORE INSERT OR UPDATE OF {columns}, search_vector ON {table}
+FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update();
+
+UPDATE {table} SET search_vector = NULL;
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER {table}_search_vector_trigger ON {table};
+DROP FUNCTION {table}_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("goals", "0016_sync_feed"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="goal",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True, verbose_name="Поисковый вектор"
+            ),
+        ),
+        migrations.AddField(
+            model_name="goalcomment",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True, verbose_name="Поисковый вектор"
+            ),
+        ),
+        *(
+            migrations.RunSQL(
+                CREATE_TRIGGER_SQL.format(table=table, vector=vector, columns=columns),
+                DROP_TRIGGER_SQL.format(table=table),
+            )
+            for table, vector, columns in SEARCH_VECTOR_TRIGGERS
+        ),
+        migrations.AddIndex(
+            model_name="goal",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="goal_search_vector_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="goalcomment",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="goalcomment_search_vector_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,15 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:02
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Used to create the trigram title indexes only if the server shipped pg_trgm, and was recorded as applied
+    without them otherwise. The extension and the indexes are created by migration 0022, which fails if pg_trgm is
+    missing."""
+
+    dependencies = [
+        ("goals", "0017_search_vectors"),
+    ]
+
+    operations = []
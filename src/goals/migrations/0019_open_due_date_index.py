@@ -0,0 +1,21 @@
+# Generated by Django 4.1.13 on 2026-10-18 13:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("goals", "0018_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="goal",
+            index=models.Index(
+                condition=models.Q(("status__in", [1, 2])),
+                fields=["board", "due_date"],
+                name="goal_open_due_date_idx",
+            ),
+        ),
+    ]
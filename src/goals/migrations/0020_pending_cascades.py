@@ -0,0 +1,57 @@
+# Generated by Django 4.1.13 on 2026-10-18 13:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("goals", "0019_open_due_date_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingCascade",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Дата удаления"
+                    ),
+                ),
+                (
+                    "board",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pending_cascades",
+                        to="goals.board",
+                        verbose_name="Доска",
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pending_cascades",
+                        to="goals.goalcategory",
+                        verbose_name="Категория",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Незавершённое удаление",
+                "verbose_name_plural": "Незавершённые удаления",
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.1.13 on 2026-10-18 13:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("goals", "0020_pending_cascades"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="goalcomment",
+            index=models.Index(
+                fields=["goal", "-created", "id"], name="goalcomment_goal_created_idx"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="goalcomment",
+            name="goal",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="comments",
+                to="goals.goal",
+                verbose_name="Цель",
+            ),
+        ),
+        # The goal determines the board, which the planner cannot know and which makes it underestimate the comments
+        # of a goal filtered by the user's boards as well.
+        migrations.RunSQL(
+            "CREATE STATISTICS goalcomment_goal_board_stats (dependencies) "
+            "ON goal_id, board_id FROM goals_goalcomment",
+            "DROP STATISTICS goalcomment_goal_board_stats",
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:39
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+import django.db.models.functions.text
+
+# Created by migration 0018 when the server shipped pg_trgm, replaced by the indexes of the models.
+DROP_OLD_INDEXES = "DROP INDEX IF EXISTS board_title_trgm_idx, goalcategory_title_trgm_idx, goal_title_trgm_idx"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("goals", "0021_comment_goal_created_index"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunSQL(DROP_OLD_INDEXES, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="board",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("title"), name="gin_trgm_ops"
+                ),
+                name="board_title_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="goal",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("title"), name="gin_trgm_ops"
+                ),
+                name="goal_title_trgm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="goalcategory",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("title"), name="gin_trgm_ops"
+                ),
+                name="goalcategory_title_trgm_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 4.1.13 on 2026-10-18 14:42
+
+from django.db import migrations
+import goals.models.basemixin
+
+STAMPED_COLUMNS = [
+    ("goals_board", "updated", "INSERT OR UPDATE"),
+    ("goals_boardparticipant", "updated", "INSERT OR UPDATE"),
+    ("goals_goalcategory", "updated", "INSERT OR UPDATE"),
+    ("goals_goal", "updated", "INSERT OR UPDATE"),
+    ("goals_goalcomment", "updated", "INSERT OR UPDATE"),
+    ("goals_deletionlog", "deleted", "INSERT"),
+]
+
+CREATE_TRIGGER_SQL = """
+CREATE FUNCTION {table}_{column}_stamp() RETURNS trigger AS $$
+BEGIN
+    NEW.{column} := clock_timestamp();
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER {table}_{column}_stamp_trigger
+BEFORE {events} ON {table}
+FOR EACH ROW EXECUTE FUNCTION {table}_{column}_stamp();
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER {table}_{column}_stamp_trigger ON {table};
+DROP FUNCTION {table}_{column}_stamp();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("goals", "0022_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="board",
+            name="updated",
+            field=goals.models.basemixin.DatabaseTimestampField(
+                auto_now=True, verbose_name="Дата последнего обновления"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="boardparticipant",
+            name="updated",
+            field=goals.models.basemixin.DatabaseTimestampField(
+                auto_now=True, verbose_name="Дата последнего обновления"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="deletionlog",
+            name="deleted",
+            field=goals.models.basemixin.DatabaseTimestampField(
+                auto_now_add=True, verbose_name="Дата удаления"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="goal",
+            name="updated",
+            field=goals.models.basemixin.DatabaseTimestampField(
+                auto_now=True, verbose_name="Дата последнего обновления"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="goalcategory",
+            name="updated",
+            field=goals.models.basemixin.DatabaseTimestampField(
+                auto_now=True, verbose_name="Дата последнего обновления"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="goalcomment",
+            name="updated",
+            field=goals.models.basemixin.DatabaseTimestampField(
+                auto_now=True, verbose_name="Дата последнего обновления"
+            ),
+        ),
+    ] + [
+        migrations.RunSQL(
+            CREATE_TRIGGER_SQL.format(table=table, column=column, events=events),
+            DROP_TRIGGER_SQL.format(table=table, column=column),
+        )
+        for table, column, events in STAMPED_COLUMNS
+    ]
@@ -4,3 +4,5 @@ from .board_participant import *
 from .goal import *
 from .goal_category import *
 from .goal_comment import *
+from .deletion_log import *
+from .pending_cascade import *
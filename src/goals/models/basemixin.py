@@ -1,11 +1,25 @@
 from django.db import models
 
 
+class DatabaseTimestampField(models.DateTimeField):
+    """Date time field overwritten by a database trigger with the clock of the database server (see migration 0023).
+
+    The value is read back with RETURNING when a row is inserted, so the instance carries the stored timestamp.
+    """
+
+    db_returning = True
+
+
 class DatesModelMixin(models.Model):
-    """Abstract class for created/updated db model fields"""
+    """Abstract class for created/updated db model fields.
+
+    The updated field is stamped by the database, so the timestamps of rows written by the web, bot and cascade
+    processes come from one clock and are never earlier than the start of the writing transaction, which the sync
+    feed relies on (see goals.sync).
+    """
 
     class Meta:
         abstract = True
 
     created = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")
-    updated = models.DateTimeField(auto_now=True, verbose_name="Дата последнего обновления")
+    updated = DatabaseTimestampField(auto_now=True, verbose_name="Дата последнего обновления")
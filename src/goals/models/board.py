@@ -1,4 +1,6 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from goals.models.basemixin import DatesModelMixin
 
 
@@ -8,6 +10,10 @@ class Board(DatesModelMixin):
     class Meta:
         verbose_name = "Доска"
         verbose_name_plural = "Доски"
+        indexes = [
+            models.Index(fields=["id"], name="board_live_idx", condition=models.Q(is_deleted=False)),
+            GinIndex(OpClass(Upper("title"), name="gin_trgm_ops"), name="board_title_trgm_idx"),
+        ]
 
     title = models.CharField(verbose_name="Название", max_length=255)
     is_deleted = models.BooleanField(verbose_name="Удалено", default=False)
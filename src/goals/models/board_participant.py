@@ -1,7 +1,31 @@
-from django.db import models
+from typing import List
+
+from django.db import connections, models, transaction
 from core.models import User
 from goals.models.basemixin import DatesModelMixin
 from goals.models.board import Board
+from goals.models.deletion_log import DeletionLog
+
+
+class BoardParticipantManager(models.Manager):
+    """Board participant manager class."""
+
+    def delete_from_board(self, board_id: int, participants: List["BoardParticipant"]):
+        """Delete the participants of the board with one DELETE query instead of one per row.
+
+        No post_delete signal is sent, so the work of its receivers (see goals.signals) is done here in bulk: the
+        rows are recorded in the deletion log and the cached roles of their users are dropped, in the transaction of
+        the DELETE.
+        """
+        from goals.access import invalidate_board_roles
+
+        if not participants:
+            return
+        ids = [participant.id for participant in participants]
+        with transaction.atomic(using=self.db), connections[self.db].cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.model._meta.db_table} WHERE id = ANY(%s)", [ids])
+            DeletionLog.record(DeletionLog.Kind.participant, board_id, ids)
+            invalidate_board_roles(participant.user_id for participant in participants)
 
 
 class BoardParticipant(DatesModelMixin):
@@ -11,6 +35,10 @@ class BoardParticipant(DatesModelMixin):
         unique_together = ("board", "user")
         verbose_name = "Участник"
         verbose_name_plural = "Участники"
+        indexes = [
+            models.Index(fields=["user", "board", "role"], name="boardpart_user_board_role_idx"),
+            models.Index(fields=["board", "updated"], name="boardpart_board_updated_idx"),
+        ]
 
     class Role(models.IntegerChoices):
         """Board participant role class."""
@@ -36,3 +64,11 @@ class BoardParticipant(DatesModelMixin):
     role = models.PositiveSmallIntegerField(
         verbose_name="Роль", choices=Role.choices, default=Role.owner
     )
+
+    objects = BoardParticipantManager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        participant = super().from_db(db, field_names, values)
+        participant._loaded_user_id = participant.__dict__.get('user_id')
+        return participant
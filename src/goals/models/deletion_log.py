@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from goals.models.basemixin import DatabaseTimestampField
+from goals.models.board import Board
+
+
+class DeletionLog(models.Model):
+    """Record of a row removed from a board, returned as a tombstone by the sync feed.
+
+    Soft-deleted boards and categories and archived goals keep their rows, so the sync feed finds them by the updated
+    field. Rows which are deleted for good, or moved to another board and therefore disappear for the participants of
+    the old board, are recorded here.
+    """
+
+    class Kind(models.TextChoices):
+        """Kind of the removed row."""
+
+        category = "category", "Категория"
+        goal = "goal", "Цель"
+        comment = "comment", "Комментарий"
+        participant = "participant", "Участник"
+
+    class Meta:
+        verbose_name = "Удалённый объект"
+        verbose_name_plural = "Удалённые объекты"
+        indexes = [
+            models.Index(fields=["board", "deleted"], name="deletionlog_board_deleted_idx"),
+        ]
+
+    kind = models.CharField(verbose_name="Тип", max_length=20, choices=Kind.choices)
+    object_id = models.BigIntegerField(verbose_name="Id объекта")
+    board = models.ForeignKey(Board, verbose_name="Доска", on_delete=models.CASCADE, related_name="deletions")
+    deleted = DatabaseTimestampField(verbose_name="Дата удаления", auto_now_add=True)
+
+    @classmethod
+    def record(cls, kind: str, board_id: int, object_ids: Iterable[int]):
+        """Record the rows of the given kind removed from the board."""
+        cls.objects.bulk_create(cls(kind=kind, board_id=board_id, object_id=object_id) for object_id in object_ids)
+
+    @staticmethod
+    def retained_since() -> datetime:
+        """Return the time from which the removed rows are kept, see `SYNC_DELETION_LOG_RETENTION_DAYS`."""
+        return timezone.now() - timedelta(days=settings.SYNC_DELETION_LOG_RETENTION_DAYS)
+
+    @classmethod
+    def prune(cls) -> int:
+        """Delete the records older than the retention period and return their number."""
+        deleted, _ = cls.objects.filter(deleted__lt=cls.retained_since()).delete()
+        return deleted
@@ -1,5 +1,11 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
+from django.db.models.functions import Upper
+from django.utils import timezone
 from core.models import User
+from goals.models.board import Board
+from goals.models.deletion_log import DeletionLog
 from goals.models.goal_category import GoalCategory
 from goals.models.basemixin import DatesModelMixin
 
@@ -22,12 +28,50 @@ class Priority(models.IntegerChoices):
     critical = 4, "Критический"
 
 
+class GoalQuerySet(models.QuerySet):
+    """Goal queryset class."""
+
+    def visible(self) -> "GoalQuerySet":
+        """Return the goals which are not archived and not in a deleted category.
+
+        The goals of a deleted category are archived in batches after the deletion (see goals.cascade), so the
+        category is checked as well to hide them right away.
+        """
+        return self.exclude(status=Status.archived).filter(category__is_deleted=False)
+
+
+class GoalManager(models.Manager.from_queryset(GoalQuerySet)):
+    """Goal manager class."""
+
+    def get_queryset(self) -> GoalQuerySet:
+        """Return the goals without the search_vector column.
+
+        The vector is kept up to date by a database trigger and only used in WHERE and ORDER BY clauses, so reading
+        the tsvector of every loaded goal would only cost I/O and memory.
+        """
+        return super().get_queryset().defer("search_vector")
+
+
 class Goal(DatesModelMixin):
     """Goal db model class."""
 
     class Meta:
         verbose_name = "Цель"
         verbose_name_plural = "Цели"
+        indexes = [
+            models.Index(fields=["-priority", "due_date", "id"], name="goal_priority_due_date_idx"),
+            models.Index(fields=["category", "status"], name="goal_category_status_idx"),
+            models.Index(fields=["category"], name="goal_live_category_idx", condition=~models.Q(status=Status.archived)),
+            models.Index(fields=["board"], name="goal_live_board_idx", condition=~models.Q(status=Status.archived)),
+            models.Index(fields=["board", "updated"], name="goal_board_updated_idx"),
+            models.Index(
+                fields=["board", "due_date"],
+                name="goal_open_due_date_idx",
+                condition=models.Q(status__in=[Status.to_do, Status.in_progress]),
+            ),
+            GinIndex(fields=["search_vector"], name="goal_search_vector_idx"),
+            GinIndex(OpClass(Upper("title"), name="gin_trgm_ops"), name="goal_title_trgm_idx"),
+        ]
 
     user = models.ForeignKey(User, verbose_name="Автор", on_delete=models.PROTECT, related_name='goals')
     title = models.CharField(verbose_name="Заголовок", max_length=255)
@@ -43,3 +87,45 @@ class Goal(DatesModelMixin):
         on_delete=models.PROTECT,
         related_name='goals',
     )
+    board = models.ForeignKey(
+        Board,
+        verbose_name="Доска",
+        on_delete=models.PROTECT,
+        related_name='goals',
+        editable=False,
+    )
+    search_vector = SearchVectorField(verbose_name="Поисковый вектор", null=True, editable=False)
+
+    objects = GoalManager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        goal = super().from_db(db, field_names, values)
+        goal._loaded_category_id = goal.__dict__.get('category_id')
+        return goal
+
+    def save(self, *args, **kwargs):
+        """Save the goal keeping the board in line with the category board.
+
+        If the goal has been moved to a category of another board, its comments are moved to that board as well, and
+        the goal and its comments are recorded in the deletion log of the old board.
+        """
+        old_board_id = None
+        if self.board_id is None or self.category_id != getattr(self, '_loaded_category_id', None):
+            board_id = self.category.board_id
+            if self.pk is not None and self.board_id is not None and self.board_id != board_id:
+                old_board_id = self.board_id
+            self.board_id = board_id
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'category' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'board'}
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if old_board_id is not None:
+                DeletionLog.record(DeletionLog.Kind.goal, old_board_id, [self.pk])
+                DeletionLog.record(
+                    DeletionLog.Kind.comment, old_board_id, self.comments.values_list('id', flat=True)
+                )
+                self.comments.update(board_id=self.board_id, updated=timezone.now())
+        self._loaded_category_id = self.category_id
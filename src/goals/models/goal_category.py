@@ -1,7 +1,11 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models, transaction
+from django.db.models.functions import Upper
+from django.utils import timezone
 from core.models import User
 from goals.models.basemixin import DatesModelMixin
 from goals.models.board import Board
+from goals.models.deletion_log import DeletionLog
 
 
 class GoalCategory(DatesModelMixin):
@@ -10,6 +14,13 @@ class GoalCategory(DatesModelMixin):
     class Meta:
         verbose_name = "Категория"
         verbose_name_plural = "Категории"
+        indexes = [
+            models.Index(fields=["title", "id"], name="goalcategory_title_idx"),
+            models.Index(fields=["board", "is_deleted"], name="goalcategory_board_deleted_idx"),
+            models.Index(fields=["board"], name="goalcategory_live_board_idx", condition=models.Q(is_deleted=False)),
+            models.Index(fields=["board", "updated"], name="goalcategory_board_updated_idx"),
+            GinIndex(OpClass(Upper("title"), name="gin_trgm_ops"), name="goalcategory_title_trgm_idx"),
+        ]
 
     title = models.CharField(verbose_name="Название", max_length=255)
     user = models.ForeignKey(User, verbose_name="Автор", on_delete=models.PROTECT, related_name='categories')
@@ -17,3 +28,30 @@ class GoalCategory(DatesModelMixin):
     board = models.ForeignKey(
         Board, verbose_name="Доска", on_delete=models.PROTECT, related_name="categories"
     )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        category = super().from_db(db, field_names, values)
+        category._loaded_board_id = category.__dict__.get('board_id')
+        return category
+
+    def save(self, *args, **kwargs):
+        """Save the category and move its goals and their comments to the new board if the board has changed.
+
+        The moved rows are recorded in the deletion log of the old board.
+        """
+        from goals.models.goal_comment import GoalComment
+
+        loaded_board_id = getattr(self, '_loaded_board_id', None)
+        moved = self.pk is not None and loaded_board_id is not None and loaded_board_id != self.board_id
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if moved:
+                comments = GoalComment.objects.filter(goal__category=self)
+                DeletionLog.record(DeletionLog.Kind.category, loaded_board_id, [self.pk])
+                DeletionLog.record(DeletionLog.Kind.goal, loaded_board_id, self.goals.values_list('id', flat=True))
+                DeletionLog.record(DeletionLog.Kind.comment, loaded_board_id, comments.values_list('id', flat=True))
+                now = timezone.now()
+                self.goals.update(board_id=self.board_id, updated=now)
+                comments.update(board_id=self.board_id, updated=now)
+        self._loaded_board_id = self.board_id
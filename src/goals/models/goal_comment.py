@@ -1,16 +1,62 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from core.models import User
 from goals.models.basemixin import DatesModelMixin
+from goals.models.board import Board
 from goals.models.goal import Goal
 
 
+class GoalCommentManager(models.Manager):
+    """Goal comment manager class."""
+
+    def get_queryset(self) -> models.QuerySet:
+        """Return the comments without the search_vector column, which is kept up to date by a database trigger and
+        never read."""
+        return super().get_queryset().defer("search_vector")
+
+
 class GoalComment(DatesModelMixin):
     """Goal comment db model class."""
 
     class Meta:
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
+        indexes = [
+            models.Index(fields=["-created", "id"], name="goalcomment_created_idx"),
+            models.Index(fields=["goal", "-created", "id"], name="goalcomment_goal_created_idx"),
+            models.Index(fields=["board", "updated"], name="goalcomment_board_updated_idx"),
+            GinIndex(fields=["search_vector"], name="goalcomment_search_vector_idx"),
+        ]
 
     user = models.ForeignKey(User, verbose_name="Автор", on_delete=models.CASCADE, related_name='comments')
     text = models.CharField(verbose_name="Текст", max_length=255)
-    goal = models.ForeignKey(Goal, verbose_name="Цель", on_delete=models.CASCADE, related_name='comments')
+    goal = models.ForeignKey(
+        Goal, verbose_name="Цель", on_delete=models.CASCADE, related_name='comments', db_index=False
+    )
+    board = models.ForeignKey(
+        Board,
+        verbose_name="Доска",
+        on_delete=models.PROTECT,
+        related_name='comments',
+        editable=False,
+    )
+    search_vector = SearchVectorField(verbose_name="Поисковый вектор", null=True, editable=False)
+
+    objects = GoalCommentManager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        comment = super().from_db(db, field_names, values)
+        comment._loaded_goal_id = comment.__dict__.get('goal_id')
+        return comment
+
+    def save(self, *args, **kwargs):
+        """Save the comment keeping the board in line with the goal board."""
+        if self.board_id is None or self.goal_id != getattr(self, '_loaded_goal_id', None):
+            self.board_id = self.goal.board_id
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'goal' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'board'}
+        super().save(*args, **kwargs)
+        self._loaded_goal_id = self.goal_id
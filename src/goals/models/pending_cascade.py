@@ -0,0 +1,21 @@
+from django.db import models
+from goals.models.board import Board
+from goals.models.goal_category import GoalCategory
+
+
+class PendingCascade(models.Model):
+    """Deleted board or category whose categories and goals have not all been archived yet.
+
+    The rows are archived in bounded batches by goals.cascade, and the record is removed when nothing is left, so an
+    interrupted cascade is resumed by the next run of the cascade_deletions command.
+    """
+
+    class Meta:
+        verbose_name = "Незавершённое удаление"
+        verbose_name_plural = "Незавершённые удаления"
+
+    board = models.ForeignKey(Board, verbose_name="Доска", on_delete=models.CASCADE, related_name="pending_cascades")
+    category = models.ForeignKey(
+        GoalCategory, verbose_name="Категория", on_delete=models.CASCADE, null=True, related_name="pending_cascades"
+    )
+    created = models.DateTimeField(verbose_name="Дата удаления", auto_now_add=True)
@@ -0,0 +1,283 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Optional
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, ValidationError as DjangoValidationError
+from django.db.models import F, Field, Func, Q, QuerySet, Value
+from django.db.models.lookups import GreaterThan, LessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class BoundedLimitOffsetPagination(LimitOffsetPagination):
+    """Limit/offset pagination kept for old clients, with the same default and maximum page size as the keyset
+    pagination."""
+
+    max_limit = 200
+
+
+class Row(Func):
+    """Row constructor `(a, b, ...)`, compared element by element by PostgreSQL."""
+
+    template = "(%(expressions)s)"
+    output_field = Field()
+
+
+class KeysetPagination(BasePagination):
+    """Keyset (seek) pagination over the view ordering.
+
+    Unlike DRF CursorPagination, which seeks by the first ordering field only and skips duplicates with an offset,
+    the cursor stores the values of every ordering field of the boundary row, and the next page is selected by all
+    of them. The primary key is appended to the ordering as a tie-breaker, so no page needs COUNT(*) or OFFSET.
+
+    When all keys share a direction and none of them is nullable, the next page is selected with a row comparison
+    `(a, b, id) > (x, y, z)`, which PostgreSQL turns into a single range scan of an index on (a, b, id). A mixed
+    direction or a nullable key cannot be expressed as a row comparison, so the expanded condition of _seek_filter
+    is used instead; it still avoids OFFSET, but the index is only used for its leading key.
+
+    Nullable ordering fields follow the PostgreSQL default placement of NULLs (last for ascending order, first for
+    descending order), so plain b-tree indexes on the ordering fields can be used.
+
+    Attributes:
+        page_size (int): Default number of results per page.
+        max_page_size (int): Upper bound for the page size requested by the client.
+        page_size_query_param (str): Query parameter to request a page size.
+        cursor_query_param (str): Query parameter holding the opaque cursor.
+        ordering (tuple): Fallback ordering if the view has none.
+    """
+
+    page_size = api_settings.PAGE_SIZE or 50
+    max_page_size = 200
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    ordering = ("-pk",)
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> list:
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.keys = self.get_keys(queryset, request, view)
+
+        cursor = self.decode_cursor(request)
+        self.reverse = cursor is not None and cursor["reverse"]
+
+        keys = [(name, not descending if self.reverse else descending, nullable)
+                for name, descending, nullable in self.keys]
+        queryset = queryset.order_by(*(self._order_expression(*key) for key in keys))
+        if cursor is not None:
+            queryset = queryset.filter(self._seek_filter(keys, cursor["values"]))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True},
+                "previous": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request) -> int:
+        """Return the page size requested by the client, capped by max_page_size."""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_keys(self, queryset: QuerySet, request, view) -> list:
+        """Return the (field name, descending, nullable) keys the pages are sought by.
+
+        The ordering is taken from the view OrderingFilter, so the client-selected ordering is respected, and the
+        primary key is appended to make it unique. Raises ImproperlyConfigured for an ordering item that is not a
+        field of the model, since the pages could not be sought by it.
+        """
+        ordering = None
+        for backend in getattr(view, "filter_backends", ()):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        if not ordering:
+            ordering = getattr(view, "ordering", None) or self.ordering
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+
+        opts = queryset.model._meta
+        keys, self.key_fields = [], []
+        for item in ordering:
+            descending = item.startswith("-")
+            name = item.lstrip("-")
+            try:
+                field = opts.pk if name == "pk" else opts.get_field(name)
+            except FieldDoesNotExist as error:
+                raise ImproperlyConfigured(
+                    f"{type(self).__name__} cannot order {opts.label} by {item!r}: it is not a model field"
+                ) from error
+            keys.append((field.attname, descending, field.null))
+            self.key_fields.append(field)
+            if field.primary_key:
+                break
+        else:
+            keys.append((opts.pk.attname, False, False))
+            self.key_fields.append(opts.pk)
+        return keys
+
+    def decode_cursor(self, request) -> Optional[dict]:
+        """Decode the cursor query parameter.
+
+        Returns:
+            Dictionary with the boundary row values and the direction, or None for the first page. Raises NotFound
+            for a malformed cursor or a cursor produced for another ordering.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            values, reverse, signature = list(payload["v"]), bool(payload["r"]), payload["k"]
+        except (BinasciiError, UnicodeError, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if signature != self._signature() or len(values) != len(self.keys):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            values = [None if value is None else field.to_python(value)
+                      for value, field in zip(values, self.key_fields)]
+        except DjangoValidationError:
+            raise NotFound(self.invalid_cursor_message)
+        return {"values": values, "reverse": reverse}
+
+    def encode_cursor(self, obj, reverse: bool) -> str:
+        """Return the URL pointing at the page next to the given boundary row."""
+        values = [self._to_json(getattr(obj, name)) for name, _, _ in self.keys]
+        payload = json.dumps({"v": values, "r": reverse, "k": self._signature()}, separators=(",", ":"))
+        encoded = urlsafe_b64encode(payload.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def _signature(self) -> str:
+        return ",".join(("-" if descending else "") + name for name, descending, _ in self.keys)
+
+    @staticmethod
+    def _to_json(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def _order_expression(name: str, descending: bool, nullable: bool):
+        if not nullable:
+            return f"-{name}" if descending else name
+        if descending:
+            return F(name).desc(nulls_first=True)
+        return F(name).asc(nulls_last=True)
+
+    @staticmethod
+    def _seek_filter(keys: list, values: list):
+        """Build the condition selecting the rows that follow the boundary row in the given ordering.
+
+        For ascending keys (a, b, c) it is the row comparison `(a, b, c) > (x, y, z)`, and `<` for descending ones.
+        With mixed directions or nullable keys it is `a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)`,
+        with the comparison flipped for descending keys and NULLs placed according to the ordering.
+        """
+        directions = {descending for _, descending, _ in keys}
+        if len(directions) == 1 and not any(nullable for _, _, nullable in keys):
+            lookup = LessThan if directions.pop() else GreaterThan
+            return lookup(Row(*(F(name) for name, _, _ in keys)), Row(*(Value(value) for value in values)))
+
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (name, descending, nullable), value in zip(keys, values):
+            if value is None:
+                after = Q(**{f"{name}__isnull": False}) if descending else None
+                same = Q(**{f"{name}__isnull": True})
+            else:
+                after = Q(**{f"{name}__lt" if descending else f"{name}__gt": value})
+                if nullable and not descending:
+                    after |= Q(**{f"{name}__isnull": True})
+                same = Q(**{name: value})
+            if after is not None:
+                condition |= equal & after
+            equal &= same
+        return condition
+
+
+class KeysetOrOffsetPagination(BasePagination):
+    """Keyset pagination by default, limit/offset pagination for old clients.
+
+    The limit/offset mode is selected with `?pagination=offset`, or implicitly when the request carries the
+    `limit` or `offset` query parameters.
+    """
+
+    mode_query_param = "pagination"
+    offset_mode = "offset"
+    keyset_class = KeysetPagination
+    offset_class = BoundedLimitOffsetPagination
+
+    def get_paginator(self, request) -> BasePagination:
+        """Return the paginator instance for the mode requested by the client."""
+        params = request.query_params
+        offset = self.offset_class
+        if params.get(self.mode_query_param) == self.offset_mode or \
+                offset.limit_query_param in params or offset.offset_query_param in params:
+            return offset()
+        return self.keyset_class()
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None):
+        self.paginator = self.get_paginator(request)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data) -> Response:
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return self.keyset_class().get_paginated_response_schema(schema)
+
+    @property
+    def display_page_controls(self) -> bool:
+        return getattr(self.paginator, "display_page_controls", False)
+
+    def to_html(self):
+        return self.paginator.to_html()
@@ -1,5 +1,6 @@
 from rest_framework import permissions
-from goals.models import BoardParticipant, Board, GoalCategory, Goal, GoalComment
+from goals.access import get_board_access
+from goals.models import Board, GoalCategory, Goal, GoalComment
 
 
 class BoardPermissions(permissions.BasePermission):
@@ -17,14 +18,10 @@ class BoardPermissions(permissions.BasePermission):
     message = "У Вас нет права редактирования или удаления данной доски"
 
     def has_object_permission(self, request, view, obj: Board) -> bool:
-
+        access = get_board_access(request)
         if request.method in permissions.SAFE_METHODS:
-            return BoardParticipant.objects.filter(
-                user=request.user, board=obj
-            ).exists()
-        return BoardParticipant.objects.filter(
-            user=request.user, board=obj, role=BoardParticipant.Role.owner
-        ).exists()
+            return access.can_read(obj.pk)
+        return access.is_owner(obj.pk)
 
 
 class CategoryPermissions(permissions.BasePermission):
@@ -42,16 +39,10 @@ class CategoryPermissions(permissions.BasePermission):
     message = "У Вас нет права редактирования или удаления данной категории"
 
     def has_object_permission(self, request, view, obj: GoalCategory) -> bool:
-
+        access = get_board_access(request)
         if request.method in permissions.SAFE_METHODS:
-            return BoardParticipant.objects.filter(
-                user=request.user, board=obj.board,
-            ).exists()
-        return BoardParticipant.objects.filter(
-            user=request.user,
-            board=obj.board,
-            role__in=(BoardParticipant.Role.owner, BoardParticipant.Role.writer),
-        ).exists()
+            return access.can_read(obj.board_id)
+        return access.can_write(obj.board_id)
 
 
 class GoalPermissions(permissions.BasePermission):
@@ -69,15 +60,10 @@ class GoalPermissions(permissions.BasePermission):
     message = "У Вас нет права редактирования или удаления данной цели"
 
     def has_object_permission(self, request, view, obj: Goal) -> bool:
+        access = get_board_access(request)
         if request.method in permissions.SAFE_METHODS:
-            return BoardParticipant.objects.filter(
-                user=request.user, board=obj.category.board
-            ).exists()
-        return BoardParticipant.objects.filter(
-            user=request.user,
-            board=obj.category.board,
-            role__in=(BoardParticipant.Role.owner, BoardParticipant.Role.writer),
-        ).exists()
+            return access.can_read(obj.board_id)
+        return access.can_write(obj.board_id)
 
 
 class CommentsPermissions(permissions.BasePermission):
@@ -96,12 +82,7 @@ class CommentsPermissions(permissions.BasePermission):
     message = "У Вас нет права редактирования или удаления данного комментария"
 
     def has_object_permission(self, request, view, obj: GoalComment) -> bool:
+        access = get_board_access(request)
         if request.method in permissions.SAFE_METHODS:
-            return BoardParticipant.objects.filter(
-                user=request.user, board=obj.goal.category.board,
-            ).exists()
-        return request.user == obj.user or BoardParticipant.objects.filter(
-            user=request.user,
-            board=obj.goal.category.board,
-            role__in=(BoardParticipant.Role.owner, BoardParticipant.Role.writer),
-        ).exists()
+            return access.can_read(obj.board_id)
+        return request.user.pk == obj.user_id or access.can_write(obj.board_id)
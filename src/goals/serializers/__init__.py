@@ -1,5 +1,6 @@
-from .goal_category import GoalCategoryCreateSerializer, GoalCategorySerializer
-from .goal import GoalCreateSerializer, GoalSerializer
+from .goal_category import GoalCategoryCreateSerializer, GoalCategorySerializer, GoalCategoryListSerializer
+from .goal import GoalCreateSerializer, GoalSerializer, GoalBulkCreateSerializer, GoalBulkUpdateSerializer, \
+    GoalSearchSerializer, GoalImportSerializer
 from .goal_comment import GoalCommentCreateSerializer, GoalCommentSerializer
 from .board import BoardCreateSerializer, BoardParticipantSerializer, BoardSerializer, BoardListSerializer
 
@@ -7,8 +8,13 @@ from .board import BoardCreateSerializer, BoardParticipantSerializer, BoardSeria
 __all__ = [
     "GoalCategoryCreateSerializer",
     "GoalCategorySerializer",
+    "GoalCategoryListSerializer",
     "GoalCreateSerializer",
     "GoalSerializer",
+    "GoalBulkCreateSerializer",
+    "GoalBulkUpdateSerializer",
+    "GoalSearchSerializer",
+    "GoalImportSerializer",
     "GoalCommentCreateSerializer",
     "GoalCommentSerializer",
     "BoardCreateSerializer",
@@ -1,7 +1,12 @@
 from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.encoding import smart_str
 from rest_framework import serializers
 from core.models import User
+from goals.access import get_board_access, invalidate_board_roles
 from goals.models import Board, BoardParticipant
+from goals.serializers.mixins import EagerLoadingMixin
 
 
 class BoardCreateSerializer(serializers.ModelSerializer):
@@ -26,30 +31,78 @@ class BoardCreateSerializer(serializers.ModelSerializer):
 
 
 class BoardListSerializer(serializers.ModelSerializer):
-    """Serializer for retrieving a list of Board instances"""
+    """Serializer for retrieving a list of Board instances
+
+    The members are not nested: the list carries their number, annotated by the view as participants_count, and the
+    role of the current user, read from the board roles already loaded for the request. The members themselves are
+    listed by BoardParticipantListView.
+    """
+
+    participants_count = serializers.IntegerField(read_only=True)
+    role = serializers.SerializerMethodField()
 
     class Meta:
         model = Board
-        fields = "__all__"
+        fields = ("id", "title", "is_deleted", "created", "updated", "participants_count", "role")
+
+    def get_role(self, board: Board) -> int:
+        return get_board_access(self.context["request"]).role(board)
+
+
+class UsernameField(serializers.SlugRelatedField):
+    """Field resolving a username to a User instance.
+
+    Within a list of participants the users are looked up in the ones preloaded by BoardParticipantListSerializer,
+    so the whole list costs one query.
+    """
+
+    def to_internal_value(self, data):
+        users = getattr(getattr(self.parent, "parent", None), "users_by_username", None)
+        if users is None:
+            return super().to_internal_value(data)
+        try:
+            return users[smart_str(data)]
+        except (KeyError, TypeError):
+            self.fail("does_not_exist", slug_name=self.slug_field, value=smart_str(data))
 
 
-class BoardParticipantSerializer(serializers.ModelSerializer):
+class BoardParticipantListSerializer(serializers.ListSerializer):
+    """List serializer loading the users of all the participants with one IN query before validating them"""
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            usernames = {
+                smart_str(item["user"]) for item in data if isinstance(item, dict) and isinstance(item.get("user"), str)
+            }
+            self.users_by_username = User.objects.in_bulk(usernames, field_name="username")
+        return super().to_internal_value(data)
+
+
+class BoardParticipantSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for retrieving a BoardParticipant instance"""
 
     role = serializers.ChoiceField(required=True, choices=BoardParticipant.editable_choices)
-    user = serializers.SlugRelatedField(slug_field="username", queryset=User.objects.all())
+    user = UsernameField(slug_field="username", queryset=User.objects.all())
+    select_related_fields = ("user",)
 
     class Meta:
         model = BoardParticipant
         fields = "__all__"
         read_only_fields = ("id", "created", "updated", "board")
+        list_serializer_class = BoardParticipantListSerializer
 
 
-class BoardSerializer(serializers.ModelSerializer):
+class BoardSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for retrieving a Board instance"""
 
     participants = BoardParticipantSerializer(many=True)
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    prefetch_related_fields = (
+        Prefetch(
+            "participants",
+            queryset=BoardParticipantSerializer.setup_eager_loading(BoardParticipant.objects.order_by("id")),
+        ),
+    )
 
     class Meta:
         model = Board
@@ -57,33 +110,46 @@ class BoardSerializer(serializers.ModelSerializer):
         read_only_fields = ("id", "created", "updated", 'user')
 
     def update(self, board: Board, validated_data: dict) -> Board:
-        """Updates the retrieved Board instance and adds other users to the board participants"""
+        """Updates the retrieved Board instance and replaces the participants other than the owner with the given ones
+
+        The participants are diffed with the current ones and synced with three set operations: one DELETE of the
+        removed participants, one UPDATE of the changed roles and one INSERT of the new participants. It all runs
+        under a row lock on the board, so concurrent updates of the same board are applied one after another. The
+        bulk operations bypass the BoardParticipant signals, so the deletion log and the cached roles of the
+        affected users are updated here.
+        """
 
         owner = validated_data.pop("user")
-        new_participants = validated_data.pop("participants")
-        new_by_id = {part["user"].id: part for part in new_participants}
+        new_participants = validated_data.pop("participants", None)
 
-        old_participants = board.participants.exclude(user=owner)
         with transaction.atomic():
-            for old_participant in old_participants:
-                if old_participant.user_id not in new_by_id:
-                    old_participant.delete()
-                else:
-                    if (
-                            old_participant.role
-                            != new_by_id[old_participant.user_id]["role"]
-                    ):
-                        old_participant.role = new_by_id[old_participant.user_id][
-                            "role"
-                        ]
-                        old_participant.save()
-                    new_by_id.pop(old_participant.user_id)
-            for new_part in new_by_id.values():
-                BoardParticipant.objects.create(
-                    board=board, user=new_part["user"], role=new_part["role"]
-                )
-
-            board.title = validated_data["title"]
+            Board.objects.select_for_update().filter(pk=board.pk).values_list("pk").get()
+            if new_participants is not None:
+                self.sync_participants(board, owner, new_participants)
+            board.title = validated_data.get("title", board.title)
             board.save()
 
         return board
+
+    @staticmethod
+    def sync_participants(board: Board, owner: User, new_participants: list):
+        new_roles = {part["user"].id: part["role"] for part in new_participants if part["user"].id != owner.id}
+        old_participants = list(board.participants.exclude(user=owner))
+        now = timezone.now()
+
+        removed = [participant for participant in old_participants if participant.user_id not in new_roles]
+        changed = []
+        for participant in old_participants:
+            role = new_roles.pop(participant.user_id, participant.role)
+            if role != participant.role:
+                participant.role, participant.updated = role, now
+                changed.append(participant)
+        added = [BoardParticipant(board=board, user_id=user_id, role=role) for user_id, role in new_roles.items()]
+
+        with transaction.atomic():
+            BoardParticipant.objects.delete_from_board(board.id, removed)
+            if changed:
+                BoardParticipant.objects.bulk_update(changed, ["role", "updated"])
+            if added:
+                BoardParticipant.objects.bulk_create(added)
+            invalidate_board_roles(participant.user_id for participant in changed + added)
@@ -1,9 +1,19 @@
+import codecs
+import csv
+from dataclasses import asdict
+
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.exceptions import PermissionDenied
 from core.serializers import UserProfileSerializer
-from goals.models import BoardParticipant
+from goals.access import get_board_access
+from goals.filters import GoalDateFilter
+from goals.imports import GoalImporter, ImportFileError, ImportReport
+from goals.models.board import Board
 from goals.models.goal import Goal
 from goals.models.goal_category import GoalCategory
+from goals.serializers.mixins import EagerLoadingMixin
 
 
 class GoalCreateSerializer(serializers.ModelSerializer):
@@ -15,7 +25,7 @@ class GoalCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Goal
         read_only_fields = ["id", "created", "updated", "user"]
-        fields = "__all__"
+        exclude = ("board", "search_vector")
 
     def validate_category(self, category: GoalCategory) -> GoalCategory:
         """Validate the category field.
@@ -34,23 +44,228 @@ class GoalCreateSerializer(serializers.ModelSerializer):
         """Creates a new Goal instance if the current user is in the board participants list of the related board
         with the owner or writer role."""
 
-        user = validated_data["user"]
         category = validated_data["category"]
-        board = category.board
-        if not board.participants.filter(
-            user=user, role__in=(BoardParticipant.Role.owner, BoardParticipant.Role.writer)
-        ):
+        if not get_board_access(self.context["request"]).can_write(category.board_id):
             raise PermissionDenied("У Вас нет права создавать цели для данной категории.")
         goal = Goal.objects.create(**validated_data)
         return goal
 
 
-class GoalSerializer(serializers.ModelSerializer):
+class GoalSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for a Goal instance."""
 
     user = UserProfileSerializer(read_only=True)
+    select_related_fields = ("user",)
 
     class Meta:
         model = Goal
-        fields = "__all__"
+        exclude = ("board", "search_vector")
         read_only_fields = ("id", "created", "updated", "user")
+
+    def validate_category(self, category: GoalCategory) -> GoalCategory:
+        """Validate the category field.
+
+        Args:
+            category (:obj:`GoalCategory`): GoalCategory instance the goal is moved to.
+        Returns:
+            GoalCategory instance if it is not deleted and the current user can write to its board. Raises
+            ValidationError or PermissionDenied otherwise.
+        """
+        if self.instance is not None and self.instance.category_id == category.pk:
+            return category
+        if category.is_deleted:
+            raise serializers.ValidationError("Not allowed in deleted category")
+        if not get_board_access(self.context["request"]).can_write(category.board_id):
+            raise PermissionDenied("У Вас нет права создавать цели для данной категории.")
+        return category
+
+
+class GoalSearchSerializer(GoalSerializer):
+    """Serializer for a Goal instance found by the full-text search, with its search rank."""
+
+    rank = serializers.FloatField(read_only=True)
+
+
+class GoalBulkItemSerializer(serializers.ModelSerializer):
+    """Serializer validating one goal of a bulk creation request.
+
+    The category is taken as a plain id and resolved for the whole batch by GoalBulkCreateSerializer, so validating
+    an item does not query the database.
+    """
+
+    category = serializers.IntegerField()
+    description = serializers.CharField(required=False)
+
+    class Meta:
+        model = Goal
+        fields = ("title", "description", "due_date", "status", "priority", "category")
+
+
+class GoalBulkCreateSerializer(serializers.Serializer):
+    """Serializer for creating many Goal instances at once.
+
+    The categories of all the goals are loaded with one query, and the write permission is checked once per distinct
+    board. Invalid goals are reported in the `errors` object keyed by their index while the valid ones are created,
+    unless `atomic` is true, in which case any error rejects the whole batch.
+    """
+
+    user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    goals = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=1000)
+    atomic = serializers.BooleanField(default=False)
+
+    def validate(self, data: dict) -> dict:
+        items, errors = {}, {}
+        for index, raw_item in enumerate(data["goals"]):
+            item = GoalBulkItemSerializer(data=raw_item)
+            if item.is_valid():
+                items[index] = item.validated_data
+            else:
+                errors[index] = item.errors
+
+        categories = GoalCategory.objects.in_bulk({item["category"] for item in items.values()})
+        access = get_board_access(self.context["request"])
+        writable = {}
+        for index, item in list(items.items()):
+            category = categories.get(item["category"])
+            if category is None:
+                error = f'Invalid pk "{item["category"]}" - object does not exist.'
+            elif category.is_deleted:
+                error = "Not allowed in deleted category"
+            elif not writable.setdefault(category.board_id, access.can_write(category.board_id)):
+                error = "У Вас нет права создавать цели для данной категории."
+            else:
+                item["category"] = category
+                continue
+            errors[index] = {"category": [error]}
+            del items[index]
+
+        errors = {str(index): errors[index] for index in sorted(errors)}
+        if errors and (data["atomic"] or not items):
+            raise serializers.ValidationError({"errors": errors})
+        data["goals"], data["errors"] = list(items.values()), errors
+        return data
+
+    def create(self, validated_data: dict) -> dict:
+        """Insert the valid goals with one bulk INSERT."""
+        user = validated_data["user"]
+        goals = [
+            Goal(user=user, board_id=item["category"].board_id, **item)
+            for item in validated_data["goals"]
+        ]
+        with transaction.atomic():
+            goals = Goal.objects.bulk_create(goals)
+        return {"created": goals, "errors": validated_data["errors"]}
+
+    def to_representation(self, result: dict) -> dict:
+        return {
+            "created": GoalCreateSerializer(result["created"], many=True).data,
+            "errors": result["errors"],
+        }
+
+
+class GoalBulkChangesSerializer(serializers.ModelSerializer):
+    """Serializer for the field changes applied by a bulk goal update."""
+
+    class Meta:
+        model = Goal
+        fields = ("status", "priority", "due_date")
+        extra_kwargs = {field: {"required": False} for field in fields}
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict):
+            unknown = sorted(set(data) - set(self.fields))
+            if unknown:
+                raise serializers.ValidationError({field: ["This field cannot be changed."] for field in unknown})
+        return super().to_internal_value(data)
+
+    def validate(self, data: dict) -> dict:
+        if not data:
+            raise serializers.ValidationError("No changes given.")
+        return data
+
+
+class GoalBulkUpdateSerializer(serializers.Serializer):
+    """Serializer for changing the status, priority or due date of many goals at once.
+
+    The goals are selected either by their ids or by a filter in the query syntax of GoalDateFilter, e.g.
+    `{"status__in": "1,2", "due_date__lte": "2023-01-01T00:00:00Z"}`, among the goals passed as the serializer
+    instance, i.e. the goals the current user can read. The write permission is checked once per board of the
+    selected goals, and the changes are applied with one UPDATE, which also sets the updated field.
+    """
+
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False, max_length=1000)
+    filter = serializers.DictField(child=serializers.CharField(), required=False, allow_empty=False)
+    changes = GoalBulkChangesSerializer()
+
+    def validate(self, data: dict) -> dict:
+        """Validate the goals selection and resolve it to a queryset.
+
+        Returns:
+            Validated data with the `goals` queryset. Raises ValidationError unless exactly one of `ids` and
+            `filter` is given or if the filter is empty, has an unknown key or is invalid.
+        """
+        if ("ids" in data) == ("filter" in data):
+            raise serializers.ValidationError("Either ids or filter must be given.")
+        if "ids" in data:
+            data["goals"] = self.instance.filter(id__in=data["ids"])
+        else:
+            unknown = sorted(set(data["filter"]) - set(GoalDateFilter.base_filters))
+            if unknown:
+                raise serializers.ValidationError({"filter": {key: ["Unknown filter."] for key in unknown}})
+            filterset = GoalDateFilter(data=data["filter"], queryset=self.instance)
+            if not filterset.is_valid():
+                raise serializers.ValidationError({"filter": filterset.errors})
+            data["goals"] = filterset.qs
+        return data
+
+    def update(self, goals, validated_data: dict) -> dict:
+        """Apply the changes to the selected goals if the current user can write to all of their boards.
+
+        Returns:
+            Dictionary with the ids of the updated goals. Raises PermissionDenied if the user is a reader of a
+            board of any selected goal.
+        """
+        access = get_board_access(self.context["request"])
+        with transaction.atomic():
+            rows = list(
+                validated_data["goals"].order_by("id").select_for_update(of=("self",)).values_list("id", "board_id")
+            )
+            if not all(access.can_write(board_id) for board_id in {board_id for _, board_id in rows}):
+                raise PermissionDenied("У Вас нет права изменять цели данной доски.")
+            ids = sorted(goal_id for goal_id, _ in rows)
+            Goal.objects.filter(id__in=ids).update(**validated_data["changes"], updated=timezone.now())
+        return {"ids": ids}
+
+    def to_representation(self, result: dict) -> dict:
+        return {"updated": result["ids"]}
+
+
+class GoalImportSerializer(serializers.Serializer):
+    """Serializer for importing goals from an uploaded file.
+
+    The file is imported by GoalImporter (see goals.imports), which loads it with COPY and reports the number of
+    created objects and the rejected rows. A board is required for Trello exports, whose lists are imported as
+    categories of that board.
+    """
+
+    file = serializers.FileField()
+    input = serializers.ChoiceField(choices=tuple(GoalImporter.parsers), default="csv")
+    board = serializers.PrimaryKeyRelatedField(queryset=Board.objects.filter(is_deleted=False), required=False)
+
+    def validate(self, data: dict) -> dict:
+        board = data.get("board")
+        if data["input"] == "trello" and board is None:
+            raise serializers.ValidationError({"board": ["This field is required."]})
+        if board is not None and not get_board_access(self.context["request"]).can_write(board):
+            raise PermissionDenied("У Вас нет права создавать категории на данной доске.")
+        return data
+
+    def create(self, validated_data: dict) -> ImportReport:
+        importer = GoalImporter(get_board_access(self.context["request"]), board=validated_data.get("board"))
+        try:
+            return importer.run(codecs.getreader("utf-8-sig")(validated_data["file"]), validated_data["input"])
+        except (ImportFileError, UnicodeDecodeError, csv.Error) as error:
+            raise serializers.ValidationError({"file": [str(error)]})
+
+    def to_representation(self, report: ImportReport) -> dict:
+        return asdict(report)
@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from rest_framework.exceptions import PermissionDenied
 from core.serializers import UserProfileSerializer
-from goals.models import Board, BoardParticipant
+from goals.access import get_board_access
+from goals.models import Board
 from goals.models.goal_category import GoalCategory
+from goals.serializers.mixins import EagerLoadingMixin
 
 
 class GoalCategoryCreateSerializer(serializers.ModelSerializer):
@@ -33,22 +35,29 @@ class GoalCategoryCreateSerializer(serializers.ModelSerializer):
         """Creates a new GoalCategory instance if the current user is in the board participants list of the related board
         with the owner or writer role."""
 
-        user = validated_data["user"]
         board = validated_data["board"]
-        if not board.participants.filter(
-            user=user, role__in=(BoardParticipant.Role.owner, BoardParticipant.Role.writer)
-        ):
+        if not get_board_access(self.context["request"]).can_write(board.pk):
             raise PermissionDenied("У Вас нет права создавать категорию для данной доски.")
         category = GoalCategory.objects.create(**validated_data)
         return category
 
 
-class GoalCategorySerializer(serializers.ModelSerializer):
+class GoalCategorySerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for a GoalCategory instance."""
 
     user = UserProfileSerializer(read_only=True)
+    select_related_fields = ("user",)
 
     class Meta:
         model = GoalCategory
         fields = "__all__"
         read_only_fields = ("id", "created", "updated", "user", "board")
+
+
+class GoalCategoryListSerializer(GoalCategorySerializer):
+    """Serializer for a list of GoalCategory instances with the number of their goals in each open or done status.
+
+    The counts are set on the categories by GoalCategoryListView as the goal_counts dictionary.
+    """
+
+    goal_counts = serializers.DictField(child=serializers.IntegerField(), read_only=True)
@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from rest_framework.exceptions import PermissionDenied
 from core.serializers import UserProfileSerializer
-from goals.models import Goal, Status, BoardParticipant
+from goals.access import get_board_access
+from goals.models import Goal, Status
 from goals.models.goal_comment import GoalComment
+from goals.serializers.mixins import EagerLoadingMixin
 
 
 class GoalCommentCreateSerializer(serializers.ModelSerializer):
@@ -13,7 +15,7 @@ class GoalCommentCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = GoalComment
         read_only_fields = ["id", "created", "updated", "user"]
-        fields = "__all__"
+        exclude = ("board", "search_vector")
 
     def validate_goal(self, goal: Goal) -> Goal:
         """Validate the goal field.
@@ -33,23 +35,20 @@ class GoalCommentCreateSerializer(serializers.ModelSerializer):
         """Creates a new GoalComment instance if the current user is in the board participants list of the related board
         with the owner or writer role."""
 
-        user = validated_data["user"]
         goal = validated_data["goal"]
-        board = goal.category.board
-        if not board.participants.filter(
-            user=user, role__in=(BoardParticipant.Role.owner, BoardParticipant.Role.writer)
-        ):
+        if not get_board_access(self.context["request"]).can_write(goal.board_id):
             raise PermissionDenied("У Вас нет права добавлять комментарии к данной цели")
         comment = GoalComment.objects.create(**validated_data)
         return comment
 
 
-class GoalCommentSerializer(serializers.ModelSerializer):
+class GoalCommentSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """Serializer for a GoalComment instance."""
 
     user = UserProfileSerializer(read_only=True)
+    select_related_fields = ("user",)
 
     class Meta:
         model = GoalComment
-        fields = "__all__"
+        exclude = ("board", "search_vector")
         read_only_fields = ("id", "created", "updated", "user", "goal")
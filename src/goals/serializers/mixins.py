@@ -0,0 +1,24 @@
+from django.db.models import QuerySet
+
+
+class EagerLoadingMixin:
+    """Serializer mixin declaring the relations the serializer touches.
+
+    Views pass their querysets through setup_eager_loading, so nested serializers do not issue a query per row.
+
+    Attributes:
+        select_related_fields (tuple): Foreign keys to join in the same query.
+        prefetch_related_fields (tuple): Reverse relations or Prefetch objects loaded with one extra query each.
+    """
+
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset: QuerySet) -> QuerySet:
+        """Return the queryset loading the relations declared by the serializer."""
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        if cls.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_fields)
+        return queryset
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from goals.access import invalidate_board_roles
+from goals.models import BoardParticipant, DeletionLog, GoalComment
+
+
+@receiver(post_save, sender=BoardParticipant)
+@receiver(post_delete, sender=BoardParticipant)
+def invalidate_participant_roles(sender, instance: BoardParticipant, **kwargs):
+    """Drop the cached board roles of the participant user, and of the previous user if it has been replaced."""
+    invalidate_board_roles([instance.user_id, getattr(instance, "_loaded_user_id", None)])
+    instance._loaded_user_id = instance.user_id
+
+
+@receiver(post_delete, sender=BoardParticipant)
+@receiver(post_delete, sender=GoalComment)
+def record_deletion(sender, instance, **kwargs):
+    """Record the deleted participant or comment in the deletion log of its board for the sync feed."""
+    kind = DeletionLog.Kind.participant if sender is BoardParticipant else DeletionLog.Kind.comment
+    DeletionLog.record(kind, instance.board_id, [instance.pk])
@@ -0,0 +1,162 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime
+from typing import Optional, Tuple
+
+from django.db import connection
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from goals.access import BoardAccess
+from goals.models import Board, BoardParticipant, DeletionLog, Goal, GoalCategory, GoalComment, Status
+from goals.serializers import BoardSerializer, GoalCategorySerializer, GoalCommentSerializer, GoalSerializer
+
+# The start of the oldest open transaction of the other client sessions of the database, any transaction counted
+# because a row may be stamped just before the transaction gets its id.
+WATERMARK_SQL = """
+SELECT LEAST(clock_timestamp(), MIN(xact_start)) FROM pg_stat_activity
+WHERE datname = current_database() AND backend_type = 'client backend' AND pid <> pg_backend_pid()
+"""
+
+
+class SyncFeed:
+    """Changes of the user's boards, categories, goals and comments since the previous sync.
+
+    The cursor carries the time of the previous sync and the boards the user could read then. Rows of those boards
+    are selected by the (board, updated) indexes, and the rows removed for good are taken from the deletion log, so a
+    poll without changes costs one query probing these indexes. Boards which the user has joined since the previous
+    sync are sent in full, and boards the user has lost access to are sent as deleted.
+
+    The next cursor points at a watermark taken from the database: the start of the oldest transaction still open
+    in other sessions, or the database clock if there is none. The updated fields are stamped by the database when a
+    row is written (see goals.models.basemixin), so a row which is not committed yet is stamped after the watermark
+    and is sent by the next sync, however long its transaction runs. The watermark only sees the sessions of the
+    database role of the application, so all the processes writing the goals have to connect with that role.
+
+    Rows may be sent twice, so clients should apply the changes idempotently: first drop the deleted ids, then insert
+    or replace the changed rows. Clients drop the goals and comments of a deleted board or category themselves. The
+    deletion log is pruned after `SYNC_DELETION_LOG_RETENTION_DAYS`, and an older cursor is rejected, so the client
+    syncs again from scratch.
+    """
+
+    invalid_cursor_message = "Invalid cursor"
+    expired_cursor_message = "Cursor expired, sync again without a cursor"
+
+    def __init__(self, access: BoardAccess, context: dict = None):
+        self.access = access
+        self.context = context or {}
+
+    @staticmethod
+    def encode_cursor(since: datetime, board_ids: set) -> str:
+        payload = json.dumps({"t": since.isoformat(), "b": sorted(board_ids)}, separators=(",", ":"))
+        return urlsafe_b64encode(payload.encode("ascii")).decode("ascii")
+
+    def decode_cursor(self, cursor: Optional[str]) -> Tuple[Optional[datetime], set]:
+        """Return the time of the previous sync and the boards the user could read then.
+
+        Raises ValidationError for a malformed cursor.
+        """
+        if not cursor:
+            return None, set()
+        try:
+            payload = json.loads(urlsafe_b64decode(cursor.encode("ascii")))
+            since, board_ids = parse_datetime(payload["t"]), {int(board_id) for board_id in payload["b"]}
+        except (BinasciiError, UnicodeError, ValueError, TypeError, KeyError):
+            since = None
+        if since is None:
+            raise ValidationError({"cursor": [self.invalid_cursor_message]})
+        if since < DeletionLog.retained_since():
+            raise ValidationError({"cursor": [self.expired_cursor_message]})
+        return since, board_ids
+
+    @staticmethod
+    def watermark() -> datetime:
+        """Return the time before which every row visible now has been committed, read from the database."""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_stat_clear_snapshot()")
+            cursor.execute(WATERMARK_SQL)
+            return cursor.fetchone()[0]
+
+    def get_changes(self, cursor: Optional[str] = None) -> dict:
+        """Return the changes since the sync the cursor was issued by, and the cursor for the next sync."""
+        since, synced_ids = self.decode_cursor(cursor)
+        watermark = self.watermark()
+        board_ids = set(self.access.board_ids())
+        known_ids, new_ids = board_ids & synced_ids, board_ids - synced_ids
+        revoked_ids = synced_ids - board_ids
+
+        changes = {name: {"changed": [], "deleted": []} for name in ("boards", "categories", "goals", "comments")}
+        changes["boards"]["deleted"] = sorted(revoked_ids)
+        if new_ids or revoked_ids or self._has_changes(known_ids, since):
+            self._collect(changes, known_ids, new_ids, since)
+        changes["cursor"] = self.encode_cursor(watermark, board_ids)
+        return changes
+
+    @staticmethod
+    def _has_changes(board_ids: set, since: datetime) -> bool:
+        """Check with one query whether any row of the boards has been changed or deleted since the given time."""
+        if not board_ids:
+            return False
+        probes = [
+            Board.objects.filter(id__in=board_ids, updated__gte=since),
+            BoardParticipant.objects.filter(board_id__in=board_ids, updated__gte=since),
+            GoalCategory.objects.filter(board_id__in=board_ids, updated__gte=since),
+            Goal.objects.filter(board_id__in=board_ids, updated__gte=since),
+            GoalComment.objects.filter(board_id__in=board_ids, updated__gte=since),
+            DeletionLog.objects.filter(board_id__in=board_ids, deleted__gte=since),
+        ]
+        first, *rest = (queryset.order_by().values_list("pk")[:1] for queryset in probes)
+        return first.union(*rest, all=True).exists()
+
+    def _collect(self, changes: dict, known_ids: set, new_ids: set, since: Optional[datetime]):
+        """Fill in the rows of the known boards changed or deleted since the given time and all the live rows of the
+        new boards."""
+        deletions = {kind: set() for kind in DeletionLog.Kind.values}
+        participants_deleted = set()
+        if known_ids:
+            for kind, object_id, board_id in DeletionLog.objects.filter(
+                board_id__in=known_ids, deleted__gte=since
+            ).values_list("kind", "object_id", "board_id"):
+                deletions[kind].add(object_id)
+                if kind == DeletionLog.Kind.participant:
+                    participants_deleted.add(board_id)
+
+        boards = BoardSerializer.setup_eager_loading(Board.objects.filter(id__in=known_ids | new_ids).order_by("id"))
+        changed_boards, deleted_boards = [], set()
+        for board in boards:
+            if board.is_deleted:
+                deleted_boards.add(board.id)
+                if board.id in known_ids and board.updated >= since:
+                    changes["boards"]["deleted"].append(board.id)
+            elif (
+                board.id in new_ids
+                or board.updated >= since
+                or board.id in participants_deleted
+                or any(participant.updated >= since for participant in board.participants.all())
+            ):
+                changed_boards.append(board)
+        changes["boards"]["changed"] = BoardSerializer(changed_boards, many=True, context=self.context).data
+        changes["boards"]["deleted"].sort()
+
+        known_ids, new_ids = known_ids - deleted_boards, new_ids - deleted_boards
+        changed_rows = Q(board_id__in=known_ids, updated__gte=since) if known_ids else Q(pk__in=[])
+        for name, model, serializer_class, live, kind in (
+            ("categories", GoalCategory, GoalCategorySerializer, Q(is_deleted=False), DeletionLog.Kind.category),
+            ("goals", Goal, GoalSerializer, ~Q(status=Status.archived) & Q(category__is_deleted=False),
+             DeletionLog.Kind.goal),
+            ("comments", GoalComment, GoalCommentSerializer, Q(), DeletionLog.Kind.comment),
+        ):
+            queryset = model.objects.filter(changed_rows | Q(live, board_id__in=new_ids)).annotate(
+                is_live=ExpressionWrapper(live or Q(pk__isnull=False), output_field=BooleanField())
+            )
+            changed, deleted = [], deletions[kind]
+            for obj in serializer_class.setup_eager_loading(queryset).order_by("id"):
+                if obj.is_live:
+                    changed.append(obj)
+                else:
+                    deleted.add(obj.id)
+            deleted -= {obj.id for obj in changed}
+            changes[name]["changed"] = serializer_class(changed, many=True, context=self.context).data
+            changes[name]["deleted"] = sorted(deleted)
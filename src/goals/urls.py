@@ -11,12 +11,22 @@ urlpatterns = [
     path("goal_category/list", views.GoalCategoryListView.as_view(), name='list_categories'),
     path("goal_category/<int:pk>", views.GoalCategoryView.as_view(), name='retrieve_update_delete_category'),
     path("goal/create", views.GoalCreateView.as_view(), name='create_goal'),
+    path("goal/bulk_create", views.GoalBulkCreateView.as_view(), name='bulk_create_goals'),
+    path("goal/bulk_update", views.GoalBulkUpdateView.as_view(), name='bulk_update_goals'),
     path("goal/list", views.GoalListView.as_view(), name='list_goals'),
+    path("goal/search", views.GoalSearchView.as_view(), name='search_goals'),
+    path("goal/overdue", views.GoalOverdueView.as_view(), name='overdue_goals'),
+    path("goal/due_soon", views.GoalDueSoonView.as_view(), name='due_soon_goals'),
+    path("goal/export", views.GoalExportView.as_view(), name='export_goals'),
+    path("goal/import", views.GoalImportView.as_view(), name='import_goals'),
     path("goal/<int:pk>", views.GoalView.as_view(), name='retrieve_update_delete_goal'),
     path("goal_comment/create", views.GoalCommentCreateView.as_view(), name='create_comment'),
     path("goal_comment/list", views.GoalCommentListView.as_view(), name='list_comments'),
     path("goal_comment/<int:pk>", views.GoalCommentView.as_view(), name='retrieve_update_delete_category'),
     path("board/<int:pk>", views.BoardView.as_view(), name='retrieve_update_delete_board'),
+    path("board/<int:pk>/participants", views.BoardParticipantListView.as_view(), name='list_board_participants'),
     path("board/list", views.BoardListView.as_view(), name='list_boards'),
-    path("board/create", views.BoardCreateView.as_view(), name='create_board')
+    path("board/create", views.BoardCreateView.as_view(), name='create_board'),
+    path("sync", views.SyncView.as_view(), name='sync'),
+    path("autocomplete", views.AutocompleteView.as_view(), name='autocomplete'),
 ]
@@ -1,7 +1,10 @@
 from .goal_category import GoalCategoryCreateView, GoalCategoryListView, GoalCategoryView
-from .goal import GoalCreateView, GoalListView, GoalView
+from .goal import GoalCreateView, GoalListView, GoalView, GoalBulkCreateView, GoalBulkUpdateView, GoalSearchView, \
+    GoalOverdueView, GoalDueSoonView, GoalExportView, GoalImportView
 from .goal_comment import GoalCommentCreateView, GoalCommentListView, GoalCommentView
-from .board import BoardView, BoardListView, BoardCreateView
+from .board import BoardView, BoardListView, BoardCreateView, BoardParticipantListView
+from .sync import SyncView
+from .autocomplete import AutocompleteView
 
 
 __all__ = [
@@ -11,10 +14,20 @@ __all__ = [
     "GoalListView",
     "GoalCreateView",
     "GoalView",
+    "GoalBulkCreateView",
+    "GoalBulkUpdateView",
+    "GoalSearchView",
+    "GoalOverdueView",
+    "GoalDueSoonView",
+    "GoalExportView",
+    "GoalImportView",
     "GoalCommentCreateView",
     "GoalCommentListView",
     "GoalCommentView",
     "BoardView",
     "BoardListView",
     "BoardCreateView",
+    "BoardParticipantListView",
+    "SyncView",
+    "AutocompleteView",
 ]
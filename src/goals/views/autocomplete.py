@@ -0,0 +1,63 @@
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import BooleanField, ExpressionWrapper, Q, QuerySet
+from django.db.models.functions import Upper
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from goals.access import get_board_access
+from goals.models import Board, Goal, GoalCategory
+
+
+class AutocompleteView(APIView):
+    """Return the boards, categories and goals of the current user whose titles match the typed prefix
+
+    get:
+    Titles starting with the query come first, followed by titles containing words similar to it, most similar
+    first. The matching is backed by pg_trgm GIN indexes on the titles (see migration 0022).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    search_param = "q"
+    limit_query_param = "limit"
+    default_limit = 10
+    max_limit = 50
+
+    def get_limit(self) -> int:
+        try:
+            limit = int(self.request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return min(max(limit, 1), self.max_limit)
+
+    def get(self, request, *args, **kwargs) -> Response:
+        text = request.query_params.get(self.search_param, "").strip()
+        if not text:
+            raise ValidationError({self.search_param: ["This field is required."]})
+        limit = self.get_limit()
+        board_ids = get_board_access(request).board_ids()
+
+        boards = Board.objects.filter(id__in=board_ids, is_deleted=False)
+        categories = GoalCategory.objects.filter(board_id__in=board_ids, is_deleted=False)
+        goals = Goal.objects.filter(board_id__in=board_ids).visible()
+        return Response({
+            "boards": self.match(boards, text, limit).values("id", "title"),
+            "categories": self.match(categories, text, limit).values("id", "title", "board"),
+            "goals": self.match(goals, text, limit).values("id", "title", "category", "board"),
+        })
+
+    @staticmethod
+    def match(queryset: QuerySet, text: str, limit: int) -> QuerySet:
+        """Return the first objects of the queryset whose titles match the text, best matches first.
+
+        Titles are compared in upper case, so both the prefix and the similarity conditions are served by the
+        trigram index on upper(title).
+        """
+        queryset = queryset.alias(upper_title=Upper("title"))
+        prefix = Q(upper_title__startswith=text.upper())
+        queryset = queryset.filter(prefix | Q(upper_title__trigram_word_similar=text)).annotate(
+            similarity=TrigramWordSimilarity(text, "upper_title")
+        )
+        return queryset.annotate(
+            is_prefix=ExpressionWrapper(prefix, output_field=BooleanField())
+        ).order_by("-is_prefix", "-similarity", "title", "id")[:limit]
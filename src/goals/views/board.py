@@ -1,11 +1,18 @@
-from django.db import transaction
+from typing import Optional
+
+from django.conf import settings
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import permissions, filters
+from rest_framework.exceptions import NotFound
 from rest_framework.generics import RetrieveUpdateDestroyAPIView, ListAPIView, CreateAPIView
-from goals.models import Board, Goal, Status
+from goals.access import get_board_access
+from goals.cascade import delete_board, run_cascade
+from goals.models import Board, BoardParticipant, Goal
 from goals.permissions import BoardPermissions
-from goals.serializers import BoardSerializer, BoardCreateSerializer
-from django.db.models import QuerySet
+from goals.serializers import BoardSerializer, BoardCreateSerializer, BoardListSerializer, \
+    BoardParticipantSerializer
+from goals.views.mixins import ConditionalListMixin, ConditionalDetailMixin
+from django.db.models import Count, Max, QuerySet
 
 
 class BoardCreateView(CreateAPIView):
@@ -16,7 +23,7 @@ class BoardCreateView(CreateAPIView):
     serializer_class = BoardCreateSerializer
 
 
-class BoardView(RetrieveUpdateDestroyAPIView):
+class BoardView(ConditionalDetailMixin, RetrieveUpdateDestroyAPIView):
     """Board Retrieve/Update/Destroy APIView
 
     get:
@@ -35,37 +42,89 @@ class BoardView(RetrieveUpdateDestroyAPIView):
     model = Board
     permission_classes = [permissions.IsAuthenticated, BoardPermissions]
     serializer_class = BoardSerializer
+    etag_related = ("participants",)
 
     def get_queryset(self) -> QuerySet[Board]:
         """Return queryset of the boards to which the current user has access as a board participant"""
-        return Board.objects.filter(participants__user=self.request.user, is_deleted=False)
+        queryset = Board.objects.filter(id__in=get_board_access(self.request).board_ids(), is_deleted=False)
+        return self.get_serializer_class().setup_eager_loading(queryset)
 
     def perform_destroy(self, board: Board):
-        """Update the is_deleted field of the given Board instance and related Board Categories to True, as well as
-        the status field of the related Category Goals to archived"""
-        with transaction.atomic():
-            board.is_deleted = True
-            board.save()
-            board.categories.update(is_deleted=True)
-            Goal.objects.filter(category__board=board).update(
-                status=Status.archived
-            )
+        """Update the is_deleted field of the given Board instance to True, and the is_deleted field of the related
+        Board Categories to True and the status field of the related Category Goals to archived in bounded batches.
+
+        The first batches run in the request, the cascade of a large board is finished by the cascade_deletions
+        command. The categories and goals are hidden as soon as the board is deleted."""
+        run_cascade(delete_board(board), max_batches=settings.DELETION_CASCADE_INLINE_BATCHES)
         return board
 
 
-class BoardListView(ListAPIView):
-    """Return a list of the Board instances to which the current user has access as a board participant"""
+class BoardListView(ConditionalListMixin, ListAPIView):
+    """Return a list of the Board instances to which the current user has access as a board participant, with the
+    number of participants and the role of the current user"""
 
     model = Board
-    serializer_class = BoardSerializer
+    serializer_class = BoardListSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [
         DjangoFilterBackend,
         filters.OrderingFilter,
+        filters.SearchFilter,
     ]
     ordering_fields = ["title", "created", "updated"]
+    ordering = ["id"]
     search_fields = ["title"]
 
     def get_queryset(self) -> QuerySet[Board]:
         """Return queryset of the boards to which the current user has access as a board participant"""
-        return Board.objects.filter(participants__user=self.request.user, is_deleted=False)
+        return Board.objects.filter(id__in=get_board_access(self.request).board_ids(), is_deleted=False)
+
+    def get_related_aggregates(self, queryset: QuerySet[Board]) -> dict:
+        """Return the number and the latest updated value of the participants of the listed boards.
+
+        The participants are aggregated from their board index rather than joined to every board, so a change of a
+        member or of a role changes the ETag."""
+        return BoardParticipant.objects.filter(board_id__in=queryset.order_by().values("id")).aggregate(
+            participants_count=Count("id"), participants_updated=Max("updated")
+        )
+
+    def paginate_queryset(self, queryset: QuerySet[Board]) -> Optional[list]:
+        """Return the page of boards with their participants counted by one grouped query.
+
+        The participants are counted for the boards of the page only, after the filtering and the pagination."""
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            counts = dict(
+                BoardParticipant.objects.filter(board__in=[board.id for board in page])
+                .order_by().values("board").annotate(count=Count("id")).values_list("board", "count")
+            )
+            for board in page:
+                board.participants_count = counts.get(board.id, 0)
+        return page
+
+
+class BoardParticipantListView(ConditionalListMixin, ListAPIView):
+    """Return a list of the participants of the given board, which the current user can read
+
+    get:
+    The participants can be searched by username with the `search` query parameter.
+    """
+
+    model = BoardParticipant
+    serializer_class = BoardParticipantSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [
+        filters.OrderingFilter,
+        filters.SearchFilter,
+    ]
+    ordering_fields = ["role", "created"]
+    ordering = ["id"]
+    search_fields = ["user__username"]
+
+    def get_queryset(self) -> QuerySet[BoardParticipant]:
+        """Return queryset of the participants of the board, or raise NotFound if the current user cannot read it"""
+        board_id = self.kwargs["pk"]
+        if not get_board_access(self.request).can_read(board_id):
+            raise NotFound()
+        queryset = BoardParticipant.objects.filter(board_id=board_id, board__is_deleted=False)
+        return self.get_serializer_class().setup_eager_loading(queryset)
@@ -1,15 +1,25 @@
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import permissions, filters
-from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveUpdateDestroyAPIView
-from goals.filters import GoalDateFilter
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveUpdateDestroyAPIView, GenericAPIView
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from goals.filters import GoalDateFilter, GoalFullTextSearchFilter
+from goals.access import get_board_access
+from goals.deadlines import overdue_goals, due_soon_goals, count_by_board
+from goals.export import export_rows, iter_csv, iter_ndjson
 from goals.models.goal import Goal
 from goals.models.goal import Status
 from goals.permissions import GoalPermissions
-from goals.serializers import GoalSerializer, GoalCreateSerializer
+from goals.pagination import BoundedLimitOffsetPagination
+from goals.views.mixins import ConditionalListMixin, ConditionalDetailMixin
+from goals.serializers import GoalSerializer, GoalCreateSerializer, GoalBulkCreateSerializer, \
+    GoalBulkUpdateSerializer, GoalSearchSerializer, GoalImportSerializer
 from django.db.models import QuerySet
 
 
-class GoalListView(ListAPIView):
+class GoalListView(ConditionalListMixin, ListAPIView):
     """Return a list of goals of the boards to which the current user has access as a board participant"""
 
     model = Goal
@@ -22,16 +32,109 @@ class GoalListView(ListAPIView):
     ]
     filterset_class = GoalDateFilter
     ordering_fields = ["-priority", "due_date"]
-    ordering = ["-priority", "due_date"]
+    ordering = ["-priority", "due_date", "id"]
     search_fields = ["title"]
 
     def get_queryset(self) -> QuerySet[Goal]:
-        """Return queryset of all Goal instances excluding those with archived status to which the current user has
-        access as a board participant"""
+        """Return queryset of all Goal instances excluding those with archived status or in deleted categories to which
+        the current user has access as a board participant"""
 
+        queryset = Goal.objects.filter(
+            board_id__in=get_board_access(self.request).board_ids()
+        ).visible()
+        return self.get_serializer_class().setup_eager_loading(queryset)
+
+
+class GoalSearchView(GoalListView):
+    """Return the goals matching the full-text search query in the title, the description or the comments, ordered
+    by relevance"""
+
+    serializer_class = GoalSearchSerializer
+    pagination_class = BoundedLimitOffsetPagination
+    filter_backends = [
+        DjangoFilterBackend,
+        GoalFullTextSearchFilter,
+    ]
+
+
+class GoalOverdueView(GoalListView):
+    """Return the goals to do or in progress whose due date has passed, with their number on each board"""
+
+    ordering = ["due_date", "id"]
+
+    def get_queryset(self) -> QuerySet[Goal]:
+        """Return queryset of the overdue Goal instances to which the current user has access as a board
+        participant"""
+        queryset = overdue_goals(get_board_access(self.request).board_ids())
+        return self.get_serializer_class().setup_eager_loading(queryset)
+
+    def get_paginated_response(self, data) -> Response:
+        """Add the number of goals on each board, counted before pagination, to the page."""
+        response = super().get_paginated_response(data)
+        response.data["counts"] = count_by_board(self.filter_queryset(self.get_queryset()))
+        return response
+
+
+class GoalDueSoonView(GoalOverdueView):
+    """Return the goals to do or in progress which are due within the given number of days, with their number on each
+    board"""
+
+    days_query_param = "days"
+    default_days = 7
+    max_days = 365
+
+    def get_days(self) -> int:
+        """Return the number of days requested by the client. Raises ValidationError for an invalid number."""
+        value = self.request.query_params.get(self.days_query_param)
+        if value is None:
+            return self.default_days
+        try:
+            days = int(value)
+        except ValueError:
+            days = 0
+        if not 0 < days <= self.max_days:
+            raise ValidationError({self.days_query_param: [f"Ensure this value is between 1 and {self.max_days}."]})
+        return days
+
+    def get_queryset(self) -> QuerySet[Goal]:
+        """Return queryset of the Goal instances due within the requested number of days to which the current user
+        has access as a board participant"""
+        queryset = due_soon_goals(get_board_access(self.request).board_ids(), self.get_days())
+        return self.get_serializer_class().setup_eager_loading(queryset)
+
+
+class GoalExportView(GoalListView):
+    """Stream the goals of the boards to which the current user has access as CSV or newline-delimited JSON
+
+    get:
+    Export the goals matching the goal list filters. The format is chosen with the `output` query parameter,
+    `csv` (default) or `ndjson`; the `format` parameter is reserved by the API for content negotiation.
+    """
+
+    output_query_param = "output"
+    outputs = {
+        "csv": (iter_csv, "text/csv; charset=utf-8"),
+        "ndjson": (iter_ndjson, "application/x-ndjson; charset=utf-8"),
+    }
+    chunk_size = 2000
+
+    def get_queryset(self) -> QuerySet[Goal]:
         return Goal.objects.filter(
-            category__board__participants__user=self.request.user
-        ).exclude(status=Status.archived)
+            board_id__in=get_board_access(self.request).board_ids()
+        ).visible()
+
+    def get(self, request, *args, **kwargs) -> StreamingHttpResponse:
+        output = request.query_params.get(self.output_query_param, "csv")
+        if output not in self.outputs:
+            raise ValidationError({self.output_query_param: [f"Choose one of: {', '.join(self.outputs)}."]})
+        queryset = self.filter_queryset(self.get_queryset())
+
+        writer, content_type = self.outputs[output]
+        response = StreamingHttpResponse(
+            writer(export_rows(queryset, chunk_size=self.chunk_size)), content_type=content_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="goals.{output}"'
+        return response
 
 
 class GoalCreateView(CreateAPIView):
@@ -42,7 +145,51 @@ class GoalCreateView(CreateAPIView):
     serializer_class = GoalCreateSerializer
 
 
-class GoalView(RetrieveUpdateDestroyAPIView):
+class GoalBulkCreateView(CreateAPIView):
+    """Create many Goal instances in one request"""
+
+    model = Goal
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = GoalBulkCreateSerializer
+
+
+class GoalImportView(CreateAPIView):
+    """Import goals and comments from an uploaded CSV, NDJSON or Trello JSON file
+
+    post:
+    The file is sent as multipart form data with its `input` format, `csv` (default), `ndjson` or `trello`, and
+    for Trello exports the `board` the lists are imported to. Returns the number of created categories, goals and
+    comments and the rejected rows.
+    """
+
+    model = Goal
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
+    serializer_class = GoalImportSerializer
+
+
+class GoalBulkUpdateView(GenericAPIView):
+    """Change the status, priority or due date of many goals in one request"""
+
+    model = Goal
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = GoalBulkUpdateSerializer
+
+    def get_queryset(self) -> QuerySet[Goal]:
+        """Return queryset of all Goal instances excluding those with archived status or in deleted categories to which
+        the current user has access as a board participant"""
+        return Goal.objects.filter(
+            board_id__in=get_board_access(self.request).board_ids()
+        ).visible()
+
+    def patch(self, request, *args, **kwargs) -> Response:
+        serializer = self.get_serializer(self.get_queryset(), data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+
+class GoalView(ConditionalDetailMixin, RetrieveUpdateDestroyAPIView):
     """Goal Retrieve/Update/Destroy APIView
 
     get:
@@ -63,11 +210,12 @@ class GoalView(RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated, GoalPermissions]
 
     def get_queryset(self) -> QuerySet[Goal]:
-        """Return queryset of all Goal instances excluding those with archived status to which the current user has
-        access as a board participant"""
-        return Goal.objects.filter(
-            category__board__participants__user=self.request.user
-        ).exclude(status=Status.archived)
+        """Return queryset of all Goal instances excluding those with archived status or in deleted categories to which
+        the current user has access as a board participant"""
+        queryset = Goal.objects.filter(
+            board_id__in=get_board_access(self.request).board_ids()
+        ).visible()
+        return self.get_serializer_class().setup_eager_loading(queryset)
 
     def perform_destroy(self, goal: Goal) -> Goal:
         """Change the goal status to 'archived' instead of deleting"""
@@ -1,14 +1,18 @@
-from django.db.models import QuerySet
+from typing import Optional
+
+from django.db.models import Count, Max, Q, QuerySet
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework import permissions, filters
-from rest_framework.pagination import LimitOffsetPagination
-from django.db import transaction
+from django.conf import settings
+from goals.access import get_board_access
+from goals.cascade import delete_category, run_cascade
 from goals.filters import BoardGoalCategoryFilter
+from goals.models.goal import Goal, Status
 from goals.models.goal_category import GoalCategory
-from goals.models.goal import Status
 from goals.permissions import CategoryPermissions
-from goals.serializers import GoalCategorySerializer, GoalCategoryCreateSerializer
+from goals.views.mixins import ConditionalListMixin, ConditionalDetailMixin
+from goals.serializers import GoalCategorySerializer, GoalCategoryCreateSerializer, GoalCategoryListSerializer
 
 
 class GoalCategoryCreateView(CreateAPIView):
@@ -19,13 +23,13 @@ class GoalCategoryCreateView(CreateAPIView):
     serializer_class = GoalCategoryCreateSerializer
 
 
-class GoalCategoryListView(ListAPIView):
-    """Return a list of all the GoalCategory instances to which the current user has access as a board participant."""
+class GoalCategoryListView(ConditionalListMixin, ListAPIView):
+    """Return a list of all the GoalCategory instances to which the current user has access as a board participant,
+    with the number of their goals to do, in progress and done."""
 
     model = GoalCategory
     permission_classes = [permissions.IsAuthenticated]
-    serializer_class = GoalCategorySerializer
-    pagination_class = LimitOffsetPagination
+    serializer_class = GoalCategoryListSerializer
     filter_backends = [
         DjangoFilterBackend,
         filters.OrderingFilter,
@@ -33,28 +37,54 @@ class GoalCategoryListView(ListAPIView):
     ]
     filterset_class = BoardGoalCategoryFilter
     ordering_fields = ["title", "created"]
-    ordering = ["title"]
+    ordering = ["title", "id"]
     search_fields = ["title"]
+    counted_statuses = (Status.to_do, Status.in_progress, Status.done)
 
     def get_queryset(self) -> QuerySet[GoalCategory]:
         """Return a list of all the GoalCategory instances with False is_deleted field to which the current user has
-        access as a board participant."""
-
-        user = self.request.user
-        board = self.request.query_params.get('board')
-        if board:
-            return GoalCategory.objects.filter(
-                board=board,
-                is_deleted=False,
-            )
-        else:
-            return GoalCategory.objects.filter(
-                board__participants__user=user,
-                is_deleted=False,
-            )
-
-
-class GoalCategoryView(RetrieveUpdateDestroyAPIView):
+        access as a board participant.
+
+        The `board` query parameter is applied by the filterset on top of the membership condition, so both end up
+        in the same WHERE clause served by the goalcategory_live_board_idx index."""
+
+        queryset = GoalCategory.objects.filter(
+            board_id__in=get_board_access(self.request).board_ids(),
+            is_deleted=False,
+        )
+        return self.get_serializer_class().setup_eager_loading(queryset)
+
+    def get_related_aggregates(self, queryset: QuerySet[GoalCategory]) -> dict:
+        """Return the number and the latest updated value of the goals counted in the list.
+
+        The goals of the boards of the listed categories are aggregated from the (board, updated) index rather than
+        joined to every category, so a goal change on one of these boards changes the ETag."""
+        return Goal.objects.filter(board_id__in=queryset.order_by().values("board_id")).aggregate(
+            goals_count=Count("id"), goals_updated=Max("updated")
+        )
+
+    def paginate_queryset(self, queryset: QuerySet[GoalCategory]) -> Optional[list]:
+        """Return the page of categories with their goals counted by status.
+
+        The goals of all the categories of the page are counted with one conditional-aggregate GROUP BY query,
+        read from the (category, status) index."""
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            aggregates = {
+                status.name: Count("id", filter=Q(status=status)) for status in self.counted_statuses
+            }
+            counts = {
+                row.pop("category"): row
+                for row in Goal.objects.filter(category__in=[category.id for category in page])
+                .order_by().values("category").annotate(**aggregates)
+            }
+            empty = dict.fromkeys(aggregates, 0)
+            for category in page:
+                category.goal_counts = counts.get(category.id, empty)
+        return page
+
+
+class GoalCategoryView(ConditionalDetailMixin, RetrieveUpdateDestroyAPIView):
     """GoalCategory Retrieve/Update/Destroy APIView
 
     get:
@@ -77,12 +107,16 @@ class GoalCategoryView(RetrieveUpdateDestroyAPIView):
     def get_queryset(self) -> QuerySet[GoalCategory]:
         """Return a list of all the GoalCategory instances with False is_deleted field to which the current user has
         access as a board participant."""
-        return GoalCategory.objects.filter(board__participants__user=self.request.user, is_deleted=False)
+        queryset = GoalCategory.objects.filter(
+            board_id__in=get_board_access(self.request).board_ids(), is_deleted=False
+        )
+        return self.get_serializer_class().setup_eager_loading(queryset)
 
     def perform_destroy(self, category: GoalCategory) -> GoalCategory:
-        """Update the is_deleted fields of the given GoalCategory instance and related Goal instances to True."""
-        with transaction.atomic():
-            category.is_deleted = True
-            category.save()
-            category.goals.update(status=Status.archived)
+        """Update the is_deleted field of the given GoalCategory instance to True, and the status field of the related
+        Goal instances to archived in bounded batches.
+
+        The first batches run in the request, the rest by the cascade_deletions command. The goals are hidden as soon
+        as the category is deleted."""
+        run_cascade(delete_category(category), max_batches=settings.DELETION_CASCADE_INLINE_BATCHES)
         return category
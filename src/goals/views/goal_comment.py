@@ -1,28 +1,58 @@
 from django.db.models import QuerySet
 from rest_framework import permissions, filters
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import ListAPIView, CreateAPIView, RetrieveUpdateDestroyAPIView
+from goals.access import get_board_access
 from goals.models.goal_comment import GoalComment
 from goals.permissions import CommentsPermissions
 from goals.serializers import GoalCommentCreateSerializer
 from goals.serializers import GoalCommentSerializer
+from goals.views.mixins import ConditionalListMixin, ConditionalDetailMixin
 
 
-class GoalCommentListView(ListAPIView):
-    """Return a list of GoalComment instances related to the Goal instance to which the current user has access as a
-    board participant."""
+class GoalCommentListView(ConditionalListMixin, ListAPIView):
+    """Return a list of GoalComment instances related to the Goal instances to which the current user has access as
+    a board participant.
+
+    get:
+    The goals are given with the `goal` query parameter, repeated or as a comma-separated list of ids, so the
+    comments of a whole column of goals can be loaded with one request. The comments are paginated by cursor.
+    """
 
     model = GoalComment
     serializer_class = GoalCommentSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ["created", "updated"]
-    ordering = ["-created"]
+    ordering = ["-created", "id"]
+    goal_query_param = "goal"
+    max_goals = 100
+
+    def get_goal_ids(self) -> list:
+        """Return the goal ids given in the query parameters. Raises ValidationError for invalid ids."""
+        values = [
+            value for param in self.request.query_params.getlist(self.goal_query_param)
+            for value in param.split(",") if value.strip()
+        ]
+        try:
+            goal_ids = sorted({int(value) for value in values})
+        except ValueError:
+            raise ValidationError({self.goal_query_param: ["A valid integer is required."]})
+        if len(goal_ids) > self.max_goals:
+            raise ValidationError({self.goal_query_param: [f"Ensure there are no more than {self.max_goals} goals."]})
+        return goal_ids
 
     def get_queryset(self) -> QuerySet[GoalComment]:
-        """Return a list of GoalComment instances related to the Goal instance to which the current user has access as a
-        board participant."""
-        goal = self.request.query_params.get('goal')
-        return GoalComment.objects.filter(goal=goal)
+        """Return a list of GoalComment instances related to the given Goal instances on the boards to which the
+        current user has access as a board participant.
+
+        The board memberships are applied in the same query through the denormalised board of the comments, and the
+        comments of each goal are read from the (goal, -created, id) index."""
+        queryset = GoalComment.objects.filter(
+            goal_id__in=self.get_goal_ids(),
+            board_id__in=get_board_access(self.request).board_ids(),
+        )
+        return self.get_serializer_class().setup_eager_loading(queryset)
 
 
 class GoalCommentCreateView(CreateAPIView):
@@ -33,7 +63,7 @@ class GoalCommentCreateView(CreateAPIView):
     serializer_class = GoalCommentCreateSerializer
 
 
-class GoalCommentView(RetrieveUpdateDestroyAPIView):
+class GoalCommentView(ConditionalDetailMixin, RetrieveUpdateDestroyAPIView):
     """GoalComment Retrieve/Update/Destroy APIView
 
     get:
@@ -57,4 +87,5 @@ class GoalCommentView(RetrieveUpdateDestroyAPIView):
     def get_queryset(self) -> QuerySet[GoalComment]:
         """Return a list of GoalComment instances related to the Goal instance to which the current user has access as a
         board participant."""
-        return GoalComment.objects.filter(user=self.request.user)
+        queryset = GoalComment.objects.filter(user=self.request.user)
+        return self.get_serializer_class().setup_eager_loading(queryset)
@@ -0,0 +1,120 @@
+import hashlib
+from datetime import datetime
+from typing import Optional, Tuple
+
+from django.db.models import Count, Max, Model, QuerySet, prefetch_related_objects
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+def _make_etag(*parts, weak: bool = False) -> str:
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return ("W/" if weak else "") + quote_etag(digest)
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[int]:
+    return int(value.timestamp()) if value is not None else None
+
+
+class ConditionalResponseMixin:
+    """Base class of the conditional request mixins.
+
+    Attributes:
+        etag_related (tuple): Names of the reverse relations serialized together with the objects, e.g. the
+            board participants. Their row count and latest updated value are included in the validators.
+    """
+
+    etag_related = ()
+
+    @staticmethod
+    def set_validators(response, etag: str, last_modified: Optional[int]):
+        """Set the ETag and Last-Modified headers of the response."""
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+class ConditionalListMixin(ConditionalResponseMixin):
+    """Conditional GET for list views.
+
+    A weak ETag is computed with one aggregate query over the filtered queryset (row count and latest updated value),
+    without loading or serializing the objects, and If-None-Match is then answered with 304 Not Modified. The ETag
+    also depends on the current user and on the full path, so every page, filter and ordering gets its own validator.
+    No Last-Modified is sent: a row may enter or leave a list without changing the latest updated value of the list,
+    e.g. a goal archived or becoming overdue, so If-Modified-Since could be answered with 304 for a changed list.
+    """
+
+    def get_related_aggregates(self, queryset: QuerySet) -> dict:
+        """Return the aggregates of the related rows serialized together with the filtered queryset.
+
+        Views override it to aggregate a related table directly, with its own index, instead of joining it to every
+        listed object through etag_related.
+        """
+        return {}
+
+    def get_list_etag(self, queryset: QuerySet) -> str:
+        """Return the ETag of the filtered queryset."""
+        aggregates = {"count": Count("pk", distinct=bool(self.etag_related)), "updated": Max("updated")}
+        for name in self.etag_related:
+            aggregates[f"{name}_count"] = Count(name, distinct=True)
+            aggregates[f"{name}_updated"] = Max(f"{name}__updated")
+        values = queryset.order_by().aggregate(**aggregates)
+        values.update(self.get_related_aggregates(queryset))
+        return _make_etag(self.request.user.pk, self.request.get_full_path(), sorted(values.items()), weak=True)
+
+    def list(self, request, *args, **kwargs) -> Response:
+        etag = self.get_list_etag(self.filter_queryset(self.get_queryset()))
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return self.set_validators(response, etag, None)
+
+
+class ConditionalDetailMixin(ConditionalResponseMixin):
+    """Conditional GET and conditional updates for detail views.
+
+    The ETag is computed from the primary key and the updated field of the object and of its related objects listed
+    in etag_related, which are prefetched by the view anyway. It is a strong validator, so that clients can send it
+    back in If-Match with PUT and PATCH and get 412 Precondition Failed if the object has been changed meanwhile.
+    The response to an update carries the new ETag, so the client does not have to fetch the object again.
+    """
+
+    def get_object_validators(self, obj: Model) -> Tuple[str, Optional[int]]:
+        """Return the ETag and the Last-Modified timestamp of the object."""
+        parts = [obj.pk, obj.updated]
+        last_modified = obj.updated
+        for name in self.etag_related:
+            related = getattr(obj, name).all()
+            related_updated = max((item.updated for item in related), default=None)
+            parts.extend((len(related), related_updated))
+            if related_updated is not None and related_updated > last_modified:
+                last_modified = related_updated
+        return _make_etag(*parts), _timestamp(last_modified)
+
+    def retrieve(self, request, *args, **kwargs) -> Response:
+        instance = self.get_object()
+        etag, last_modified = self.get_object_validators(instance)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+        return self.set_validators(response, etag, last_modified)
+
+    def update(self, request, *args, **kwargs) -> Response:
+        partial = kwargs.pop("partial", False)
+        instance = self.get_object()
+        response = get_conditional_response(request, *self.get_object_validators(instance))
+        if response is not None:
+            return response
+
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        # The updated field is stamped by the database, read it back for the new validators.
+        instance.refresh_from_db(fields=["updated"])
+        if getattr(instance, "_prefetched_objects_cache", None):
+            instance._prefetched_objects_cache = {}
+            prefetch_related_objects([instance], *getattr(serializer, "prefetch_related_fields", ()))
+        response = Response(serializer.data)
+        return self.set_validators(response, *self.get_object_validators(instance))
@@ -0,0 +1,22 @@
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from goals.access import get_board_access
+from goals.sync import SyncFeed
+
+
+class SyncView(APIView):
+    """Return the boards, categories, goals and comments changed or deleted since the sync the cursor was issued by.
+
+    get:
+    Without a cursor, return all the live rows of the user's boards. The response carries the cursor for the next
+    sync. A cursor older than the retention of the deletion log is rejected with 400, the client then syncs again
+    without it.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    cursor_query_param = "cursor"
+
+    def get(self, request, *args, **kwargs) -> Response:
+        feed = SyncFeed(get_board_access(request), context={"request": request, "view": self})
+        return Response(feed.get_changes(request.query_params.get(self.cursor_query_param)))
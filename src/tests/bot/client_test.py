@@ -0,0 +1,137 @@
+import json
+
+import pytest
+from bot.management.commands.benchmark_tg_decoding import SAMPLE
+from bot.tg.client import TgApiError
+
+
+class TestTgClient:
+    """TgClient transport test suite"""
+
+    def test_send_message_json_body(self, fake_bot_api, api_tg_client):
+        """Test for sending a long message in a JSON POST body"""
+
+        text = "Цель & план? " * 400
+
+        response = api_tg_client.send_message(chat_id=42, text=text)
+
+        request, = fake_bot_api.requests
+        assert request["path"] == "/bottest/sendMessage"
+        assert request["content_type"] == "application/json"
+        assert request["body"] == {"chat_id": 42, "text": text}
+        assert (response.ok, response.result.chat.id, response.result.text) == (True, 42, text)
+
+    def test_connection_reused(self, fake_bot_api, api_tg_client):
+        """Test for sending the requests over one kept-alive connection"""
+
+        for number in range(3):
+            api_tg_client.send_message(chat_id=number, text="Hello")
+        api_tg_client.get_updates(offset=5, timeout=0)
+
+        assert len({request["port"] for request in fake_bot_api.requests}) == 1
+        assert fake_bot_api.requests[-1]["body"] == {"offset": 5, "timeout": 0}
+
+    def test_retry_after(self, fake_bot_api, api_tg_client):
+        """Test for waiting as long as the flood control asks before retrying"""
+
+        fake_bot_api.reply("sendMessage", 429, {
+            "ok": False, "error_code": 429, "description": "Too Many Requests: retry after 7",
+            "parameters": {"retry_after": 7},
+        })
+
+        response = api_tg_client.send_message(chat_id=42, text="Hello")
+
+        assert response.ok
+        assert api_tg_client.delays == [7]
+        assert len(fake_bot_api.requests) == 2
+
+    def test_exponential_backoff(self, fake_bot_api, api_tg_client):
+        """Test for retrying server errors of getUpdates with growing delays and giving up after the last retry"""
+
+        for _ in range(3):
+            fake_bot_api.reply("getUpdates", 502, {"ok": False, "error_code": 502, "description": "Bad Gateway"})
+
+        with pytest.raises(TgApiError) as error:
+            api_tg_client.get_updates(timeout=0)
+
+        assert error.value.error_code == 502
+        assert api_tg_client.delays == [0.5, 1]
+        assert len(fake_bot_api.requests) == 3
+
+    def test_send_message_server_error_not_retried(self, fake_bot_api, api_tg_client):
+        """Test for not sending a message again after a server error, as it may have been sent"""
+
+        fake_bot_api.reply("sendMessage", 502, {"ok": False, "error_code": 502, "description": "Bad Gateway"})
+
+        with pytest.raises(TgApiError):
+            api_tg_client.send_message(chat_id=42, text="Hello")
+
+        assert api_tg_client.delays == []
+        assert len(fake_bot_api.requests) == 1
+
+    def test_read_timeout(self, fake_bot_api, api_tg_client):
+        """Test for retrying a getUpdates call timing out but not a sendMessage one"""
+
+        api_tg_client.read_timeout = 0.2
+        fake_bot_api.reply("sendMessage", 200, {"ok": True, "result": {}}, delay=0.5)
+        fake_bot_api.reply("getUpdates", 200, {"ok": True, "result": []}, delay=0.5)
+
+        with pytest.raises(TgApiError):
+            api_tg_client.send_message(chat_id=42, text="Hello")
+        assert api_tg_client.delays == []
+        response = api_tg_client.get_updates(timeout=0)
+
+        assert response.result == []
+        assert api_tg_client.delays == [0.5]
+        assert [request["method"] for request in fake_bot_api.requests] == ["sendMessage", "getUpdates", "getUpdates"]
+
+    def test_client_error_not_retried(self, fake_bot_api, api_tg_client):
+        """Test for raising a rejected request at once"""
+
+        fake_bot_api.reply("sendMessage", 403, {
+            "ok": False, "error_code": 403, "description": "Forbidden: bot was blocked by the user",
+        })
+
+        with pytest.raises(TgApiError) as error:
+            api_tg_client.send_message(chat_id=42, text="Hello")
+
+        assert (error.value.error_code, error.value.description) == (403, "Forbidden: bot was blocked by the user")
+        assert api_tg_client.delays == []
+
+    @pytest.mark.parametrize("call", [
+        lambda client: client.get_updates(timeout=0),
+        lambda client: client.send_message(chat_id=42, text="Hello"),
+    ])
+    def test_connection_error_retried(self, fake_bot_api, api_tg_client, call):
+        """Test for retrying a request the server could not be reached for, whatever the method"""
+
+        api_tg_client.base_url = "http://127.0.0.1:9"
+
+        with pytest.raises(TgApiError) as error:
+            call(api_tg_client)
+
+        assert error.value.error_code is None
+        assert api_tg_client.delays == [0.5, 1]
+
+    @pytest.mark.parametrize("fast_decoding", [True, False])
+    def test_get_updates_decoded(self, fake_bot_api, api_tg_client, fast_decoding):
+        """Test for decoding the received updates with either decoder"""
+
+        fake_bot_api.reply("getUpdates", 200, json.loads(SAMPLE.read_text()))
+        api_tg_client.fast_decoding = fast_decoding
+
+        response = api_tg_client.get_updates(offset=815320001, timeout=0)
+
+        assert [item.update_id for item in response.result] == list(range(815320001, 815320007))
+        assert response.result[2].message.text == "Работа"
+
+    def test_set_webhook(self, fake_bot_api, api_tg_client):
+        """Test for registering the webhook with its secret token"""
+
+        fake_bot_api.reply("setWebhook", 200, {"ok": True, "result": True, "description": "Webhook was set"})
+
+        api_tg_client.set_webhook("https://todo.example/bot/webhook", "s3cret")
+
+        assert fake_bot_api.requests[0]["body"] == {
+            "url": "https://todo.example/bot/webhook", "secret_token": "s3cret", "allowed_updates": ["message"],
+        }
@@ -0,0 +1,62 @@
+import copy
+import json
+
+import pytest
+from marshmallow import ValidationError
+
+from bot.management.commands.benchmark_tg_decoding import SAMPLE
+from bot.tg.dc import GetUpdatesResponse, SendMessageResponse
+from bot.tg.decoders import decode_updates, get_schema
+
+
+@pytest.fixture()
+def recorded_updates():
+    return json.loads(SAMPLE.read_text())
+
+
+class TestDecoders:
+    """Telegram response decoding test suite"""
+
+    def test_schema_cached(self):
+        """Test for building the schema of a dataclass once"""
+
+        assert get_schema(GetUpdatesResponse) is get_schema(GetUpdatesResponse)
+        assert get_schema(SendMessageResponse) is not get_schema(GetUpdatesResponse)
+
+    def test_fast_decoder_matches_schema(self, recorded_updates):
+        """Test for decoding the recorded updates as the marshmallow schema does"""
+
+        response = decode_updates(recorded_updates)
+
+        assert response == get_schema(GetUpdatesResponse).load(recorded_updates)
+        assert [item.message is None for item in response.result] == [False, False, False, True, False, False]
+        assert response.result[1].message.from_.last_name is None
+
+    @pytest.mark.parametrize("change", [
+        lambda data: data["result"][0]["message"]["chat"].update(id="512300001"),
+        lambda data: data["result"][0]["message"]["from"].update(is_bot="false"),
+        lambda data: data["result"][0]["message"]["from"].update(username=None),
+        lambda data: data.pop("result"),
+    ])
+    def test_irregular_payload_matches_schema(self, recorded_updates, change):
+        """Test for decoding the payloads the fast path does not handle as the marshmallow schema does"""
+
+        change(recorded_updates)
+
+        assert decode_updates(copy.deepcopy(recorded_updates)) == get_schema(GetUpdatesResponse).load(recorded_updates)
+
+    @pytest.mark.parametrize("change", [
+        lambda data: data["result"][0]["message"].pop("text"),
+        lambda data: data["result"][0]["message"]["chat"].update(id=None),
+        lambda data: data.update(result=None),
+    ])
+    def test_invalid_payload_rejected(self, recorded_updates, change):
+        """Test for raising the validation error of the marshmallow schema for an invalid payload"""
+
+        change(recorded_updates)
+
+        with pytest.raises(ValidationError) as error:
+            decode_updates(recorded_updates)
+        with pytest.raises(ValidationError) as expected:
+            get_schema(GetUpdatesResponse).load(recorded_updates)
+        assert error.value.messages == expected.value.messages
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from bot.tg.dc import GetUpdatesResponse
+from bot.tg.dispatcher import AsyncDispatcher
+from tests.factories import tg_update
+
+
+class TrackingHandler:
+    """Handler recording the handled updates and the highest number of updates handled at once"""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.handled = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, item):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay * (item.message.chat.id % 3 + 1))
+        with self.lock:
+            self.active -= 1
+            self.handled.append((item.message.chat.id, item.update_id))
+
+
+def dispatch(handler, updates, **kwargs):
+    dispatcher = AsyncDispatcher(handler, **kwargs)
+    try:
+        asyncio.run(dispatcher.dispatch(updates))
+    finally:
+        dispatcher.close()
+    return dispatcher
+
+
+class TestAsyncDispatcher:
+    """AsyncDispatcher test suite"""
+
+    def test_chat_order_kept(self):
+        """Test for handling the updates of every chat in the order they were received"""
+
+        updates = [tg_update(update_id, update_id % 5, "/goals") for update_id in range(40)]
+        handler = TrackingHandler()
+
+        dispatcher = dispatch(handler, updates, concurrency=4)
+
+        assert len(handler.handled) == 40
+        for chat_id in range(5):
+            handled = [update_id for chat, update_id in handler.handled if chat == chat_id]
+            assert handled == [update_id for update_id in range(40) if update_id % 5 == chat_id]
+        assert dispatcher.pending == 0
+
+    def test_concurrency_limit(self):
+        """Test for handling different chats at once without exceeding the concurrency limit"""
+
+        updates = [tg_update(update_id, update_id, "/goals") for update_id in range(12)]
+        handler = TrackingHandler()
+
+        dispatch(handler, updates, concurrency=3)
+
+        assert handler.max_active == 3
+
+    def test_max_pending(self):
+        """Test for holding back the intake while too many updates are waiting"""
+
+        updates = [tg_update(update_id, 1, "/goals") for update_id in range(6)]
+        handler = TrackingHandler(delay=0)
+        dispatcher = AsyncDispatcher(handler, concurrency=2, max_pending=2)
+        seen = []
+
+        async def run():
+            for item in updates:
+                await dispatcher.wait_for_capacity()
+                seen.append(dispatcher.pending)
+                dispatcher.submit(item)
+            await dispatcher.join()
+
+        try:
+            asyncio.run(run())
+        finally:
+            dispatcher.close()
+
+        assert max(seen) < 2
+        assert [update_id for _, update_id in handler.handled] == list(range(6))
+
+    def test_poll_housekeeping(self):
+        """Test for running the housekeeping in a worker thread before every getUpdates call"""
+
+        class Stop(Exception):
+            pass
+
+        class EmptyClient:
+            def get_updates(self, offset, timeout):
+                return GetUpdatesResponse(ok=True, result=[])
+
+        calls = []
+
+        def on_poll():
+            calls.append(threading.current_thread().name)
+            if len(calls) == 2:
+                raise Stop
+
+        dispatcher = AsyncDispatcher(TrackingHandler())
+        try:
+            with pytest.raises(Stop):
+                asyncio.run(dispatcher.poll(EmptyClient(), on_poll=on_poll))
+        finally:
+            dispatcher.close()
+
+        assert len(calls) == 2
+        assert all(name.startswith('tg-handler') for name in calls)
@@ -0,0 +1,68 @@
+import json
+import threading
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeBotApi:
+    """Local HTTP server answering Bot API calls like api.telegram.org.
+
+    Every request is recorded with its method, JSON body and client port, which tells the connections apart. The
+    responses of a method may be scripted with `reply`, otherwise sendMessage echoes the message and getUpdates
+    returns no updates.
+    """
+
+    def __init__(self, token: str = "test"):
+        self.token = token
+        self.requests = []
+        self.replies = defaultdict(deque)
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])) or b"{}")
+                method = self.path.rsplit("/", 1)[-1]
+                api.requests.append({
+                    "path": self.path, "method": method, "body": body, "port": self.client_address[1],
+                    "content_type": self.headers["Content-Type"],
+                })
+                status, data = api.respond(method, body)
+                content = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+
+    def reply(self, method: str, status: int, data: dict, delay: float = 0):
+        self.replies[method].append((status, data, delay))
+
+    def respond(self, method: str, body: dict) -> tuple:
+        if self.replies[method]:
+            status, data, delay = self.replies[method].popleft()
+            threading.Event().wait(delay)
+            return status, data
+        if method == "sendMessage":
+            chat = {"id": body["chat_id"], "first_name": "Vasily", "type": "private"}
+            sender = {"id": 1, "is_bot": True, "first_name": "Bot", "username": "todo_bot"}
+            return 200, {"ok": True, "result": {
+                "message_id": len(self.requests), "from": sender, "chat": chat, "date": 0, "text": body["text"],
+            }}
+        return 200, {"ok": True, "result": []}
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
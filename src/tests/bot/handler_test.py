@@ -0,0 +1,92 @@
+import pytest
+from bot.models import ChatState, TgUser
+from bot.tg.handlers import UpdateHandler
+from goals.models import Goal, Status
+from tests.factories import GoalFactory, TgUserFactory, tg_update
+
+
+@pytest.mark.django_db
+class TestUpdateHandler:
+    """UpdateHandler test suite"""
+
+    def test_new_user_gets_verification_code(self, tg_client, handle_update):
+        """Test for sending a verification code to a new telegram user"""
+
+        handle_update(tg_update(1, 42, "/goals"))
+
+        tg_user = TgUser.objects.get(tg_user_id=42)
+        assert (tg_user.tg_chat_id, tg_user.is_verified) == (42, False)
+        assert tg_client.sent == [(42, f'Hello! Please verify your account with this code {tg_user.verification_code}')]
+
+    def test_create_goal(self, tg_client, handle_update, verified_tg_user, current_user_category):
+        """Test for creating a goal with the /create dialog"""
+
+        chat_id = verified_tg_user.tg_chat_id
+
+        for update_id, text in enumerate(["/create", "Unknown", current_user_category.title, "New goal"]):
+            handle_update(tg_update(update_id, chat_id, text))
+
+        assert [text for _, text in tg_client.sent] == [
+            f"Choose your category:\n{current_user_category.title}",
+            "Please choose the correct category",
+            "Please enter the title of a new goal",
+            'Goal "New goal" has been created',
+        ]
+        assert Goal.objects.get(title="New goal").category == current_user_category
+        assert not ChatState.objects.exists()
+
+    def test_chats_keep_separate_dialogs(self, tg_client, handle_update, verified_tg_user, current_user_category):
+        """Test for a /cancel in one chat leaving the dialog of another chat untouched, even with another handler"""
+
+        other_handler = UpdateHandler(tg_client)
+        first_chat = verified_tg_user.tg_chat_id
+        second_chat = TgUserFactory(user=verified_tg_user.user).tg_chat_id
+
+        handle_update(tg_update(1, first_chat, "/create"))
+        handle_update(tg_update(2, second_chat, "/create"), other_handler)
+        handle_update(tg_update(3, second_chat, "/cancel"), other_handler)
+        handle_update(tg_update(4, first_chat, current_user_category.title))
+
+        assert tg_client.sent[-1] == (first_chat, "Please enter the title of a new goal")
+        assert list(ChatState.objects.values_list('tg_chat_id', flat=True)) == [first_chat]
+
+    def test_unknown_command(self, tg_client, handle_update, verified_tg_user):
+        """Test for answering a message outside of a dialog"""
+
+        handle_update(tg_update(1, verified_tg_user.tg_chat_id, "hello"))
+
+        assert tg_client.sent == [(verified_tg_user.tg_chat_id, 'Unknown command.Please try again.')]
+
+    def test_goals_of_deleted_category_hidden(self, tg_client, handle_update, verified_tg_user, current_user_category):
+        """Test for leaving out the goals of a deleted category the cascade has not archived yet"""
+
+        GoalFactory(category=current_user_category, user=verified_tg_user.user, status=Status.to_do)
+        current_user_category.is_deleted = True
+        current_user_category.save()
+
+        handle_update(tg_update(1, verified_tg_user.tg_chat_id, "/goals"))
+
+        assert tg_client.sent == [(verified_tg_user.tg_chat_id, "You don't have any planned goals.")]
+
+    def test_messages_sent_after_commit(self, tg_client, verified_tg_user, current_user_category,
+                                        django_capture_on_commit_callbacks, monkeypatch):
+        """Test for sending the answers once the dialog is committed and not at all if it is rolled back"""
+
+        chat_id = verified_tg_user.tg_chat_id
+        handler = UpdateHandler(tg_client)
+        with django_capture_on_commit_callbacks(execute=True):
+            handler(tg_update(1, chat_id, "/create"))
+            assert tg_client.sent == []
+        assert len(tg_client.sent) == 1
+
+        def fail(**kwargs):
+            raise RuntimeError
+
+        monkeypatch.setattr(tg_client, "create_new_goal", fail)
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            handler(tg_update(2, chat_id, current_user_category.title))
+            handler(tg_update(3, chat_id, "New goal"))
+
+        assert len(callbacks) == 1
+        assert tg_client.sent[-1] == (chat_id, "Please enter the title of a new goal")
+        assert ChatState.objects.get(tg_chat_id=chat_id).chosen_goal_category == current_user_category.title
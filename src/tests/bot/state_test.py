@@ -0,0 +1,101 @@
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from bot.models import ChatState
+from bot.tg.state import PeriodicPurge, chat_state, purge_expired_chat_states
+
+
+@pytest.mark.django_db
+class TestChatState:
+    """Chat dialog state store test suite"""
+
+    def test_state_saved_with_ttl(self, settings):
+        """Test for keeping a dialog in progress until its expiry and deleting an idle one"""
+
+        settings.TELEGRAM_CHAT_STATE_TTL = 60
+
+        with chat_state(1) as state:
+            state.create_command_used = True
+        with chat_state(2):
+            pass
+
+        state = ChatState.objects.get()
+        assert (state.tg_chat_id, state.create_command_used) == (1, True)
+        assert timedelta(seconds=55) < state.expires - timezone.now() <= timedelta(seconds=60)
+
+    def test_expired_state_reset(self):
+        """Test for starting over a dialog left unfinished past its expiry"""
+
+        ChatState.objects.create(
+            tg_chat_id=1, create_command_used=True, chosen_goal_category="Work", expires=timezone.now()
+        )
+
+        with chat_state(1) as state:
+            assert state.is_idle
+
+        assert not ChatState.objects.exists()
+
+    def test_purge_expired(self):
+        """Test for deleting the expired dialogs only"""
+
+        now = timezone.now()
+        ChatState.objects.create(tg_chat_id=1, create_command_used=True, expires=now - timedelta(seconds=1))
+        ChatState.objects.create(tg_chat_id=2, create_command_used=True, expires=now + timedelta(minutes=1))
+
+        assert purge_expired_chat_states() == 1
+        assert list(ChatState.objects.values_list("tg_chat_id", flat=True)) == [2]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestChatStateLocking:
+    """Chat dialog state locking test suite"""
+
+    def test_state_locked_across_workers(self):
+        """Test for a worker waiting for the dialog of a chat another worker is updating"""
+
+        entered = threading.Event()
+        seen = []
+
+        def first_worker():
+            with chat_state(1) as state:
+                state.create_command_used = True
+                entered.set()
+                time.sleep(0.3)
+                state.chosen_goal_category = "Work"
+            connection.close()
+
+        def second_worker():
+            entered.wait()
+            with chat_state(1) as state:
+                seen.append((state.create_command_used, state.chosen_goal_category))
+                state.reset()
+            connection.close()
+
+        workers = [threading.Thread(target=first_worker), threading.Thread(target=second_worker)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert seen == [(True, "Work")]
+        assert not ChatState.objects.exists()
+
+    def test_purge_once_per_interval(self):
+        """Test for purging the expired dialogs on the first call and again only after the interval"""
+
+        purge = PeriodicPurge(purge_expired_chat_states, interval=60)
+        expired = timezone.now() - timedelta(seconds=1)
+        ChatState.objects.create(tg_chat_id=1, create_command_used=True, expires=expired)
+
+        assert purge() == 1
+
+        ChatState.objects.create(tg_chat_id=2, create_command_used=True, expires=expired)
+        assert purge() == 0
+
+        purge.interval = 0
+        assert purge() == 1
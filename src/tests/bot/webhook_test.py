@@ -0,0 +1,203 @@
+import json
+import threading
+from datetime import timedelta
+
+import pytest
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from bot.models import PendingUpdate
+from bot.management.commands.benchmark_tg_decoding import SAMPLE
+from bot.tg.handlers import UpdateHandler
+from bot.tg.update_queue import REDELIVERY_PERIOD, process_pending_updates, purge_handled_updates
+from goals.models import Goal
+from tests.factories import TgUserFactory
+
+SECRET = "s3cret-token_1"
+
+
+@pytest.fixture()
+def webhook_secret(settings):
+    settings.TELEGRAM_WEBHOOK_SECRET = SECRET
+    return SECRET
+
+
+@pytest.fixture()
+def recorded_updates():
+    return json.loads(SAMPLE.read_text())["result"]
+
+
+def post_update(client, update, secret=SECRET):
+    headers = {"HTTP_X_TELEGRAM_BOT_API_SECRET_TOKEN": secret} if secret else {}
+    return client.post(path=reverse("bot:webhook"), data=update, content_type="application/json", **headers)
+
+
+@pytest.mark.django_db
+class TestTelegramWebhookView:
+    """TelegramWebhookView test suite"""
+
+    def test_webhook_disabled(self, client, recorded_updates):
+        """Test for posting an update while no secret token is configured"""
+
+        response = post_update(client, recorded_updates[0])
+
+        assert response.status_code == 404
+        assert not PendingUpdate.objects.exists()
+
+    @pytest.mark.parametrize("secret", [None, "wrong", "s3cret-token_"])
+    def test_wrong_secret(self, client, webhook_secret, recorded_updates, secret):
+        """Test for posting an update without the secret token Telegram sends"""
+
+        response = post_update(client, recorded_updates[0], secret=secret)
+
+        assert response.status_code == 403
+        assert not PendingUpdate.objects.exists()
+
+    def test_updates_queued_once(self, client, webhook_secret, recorded_updates):
+        """Test for queueing the updates with a message, each once even if Telegram delivers it again"""
+
+        responses = [post_update(client, update) for update in recorded_updates + recorded_updates[:2]]
+
+        assert {response.status_code for response in responses} == {200}
+        assert responses[3].data["queued"] is False
+        assert list(PendingUpdate.objects.order_by("update_id").values_list("update_id", "tg_chat_id")) == [
+            (815320001, 512300001), (815320002, 512300002), (815320003, 512300002),
+            (815320005, 512300002), (815320006, 512300003),
+        ]
+        assert PendingUpdate.objects.get(update_id=815320003).payload == recorded_updates[2]
+
+    def test_invalid_update(self, client, webhook_secret, recorded_updates):
+        """Test for acknowledging an update the handlers cannot answer and rejecting a body without update id"""
+
+        del recorded_updates[0]["message"]["text"]
+
+        unanswerable = post_update(client, recorded_updates[0])
+        without_id = post_update(client, {"message": {}})
+
+        assert (unanswerable.status_code, unanswerable.data) == (200, {"queued": False})
+        assert without_id.status_code == 400
+        assert not PendingUpdate.objects.exists()
+
+
+@pytest.mark.django_db
+class TestUpdateQueue:
+    """Queued update processing test suite"""
+
+    def test_updates_handled_in_order(self, client, webhook_secret, tg_client, verified_tg_user,
+                                      current_user_category, django_capture_on_commit_callbacks):
+        """Test for answering the queued updates with the polling handlers, the updates of a chat in order"""
+
+        other_tg_user = TgUserFactory(user=verified_tg_user.user)
+        texts = [
+            (verified_tg_user, "/create"), (other_tg_user, "hello"), (verified_tg_user, current_user_category.title),
+            (verified_tg_user, "Queued goal"),
+        ]
+        for update_id, (tg_user, text) in enumerate(texts, start=1):
+            chat = {"id": tg_user.tg_chat_id, "first_name": "Vasily", "type": "private"}
+            sender = {"id": tg_user.tg_user_id, "is_bot": False, "first_name": "Vasily"}
+            post_update(client, {
+                "update_id": update_id, "message": {"message_id": update_id, "from": sender, "chat": chat, "text": text},
+            })
+
+        with django_capture_on_commit_callbacks(execute=True):
+            handled = process_pending_updates(UpdateHandler(tg_client).handle_update)
+
+        assert handled == 4
+        assert not PendingUpdate.objects.filter(handled=None).exists()
+        assert [text for chat_id, text in tg_client.sent if chat_id == verified_tg_user.tg_chat_id][1:] == [
+            "Please enter the title of a new goal", 'Goal "Queued goal" has been created',
+        ]
+        assert (other_tg_user.tg_chat_id, 'Unknown command.Please try again.') in tg_client.sent
+
+    def test_failed_update_dropped(self, tg_client, verified_tg_user):
+        """Test for going on with the next updates of a chat after a handler error"""
+
+        chat_id = verified_tg_user.tg_chat_id
+        for update_id in (1, 2):
+            PendingUpdate.objects.create(update_id=update_id, tg_chat_id=chat_id, payload={
+                "update_id": update_id, "message": {
+                    "message_id": update_id, "text": "hello",
+                    "from": {"id": verified_tg_user.tg_user_id, "is_bot": False, "first_name": "Vasily"},
+                    "chat": {"id": chat_id, "first_name": "Vasily", "type": "private"},
+                },
+            })
+        handled = []
+
+        def handle(update):
+            handled.append(update.update_id)
+            if update.update_id == 1:
+                PendingUpdate.objects.create(update_id=3, tg_chat_id=chat_id, payload={})
+                raise RuntimeError
+
+        assert process_pending_updates(handle) == 2
+        assert handled == [1, 2]
+        assert list(PendingUpdate.objects.order_by("update_id").values_list("update_id", flat=True)) == [1, 2]
+        assert not PendingUpdate.objects.filter(handled=None).exists()
+
+    def test_redelivered_update_handled_once(self, client, webhook_secret, tg_client, verified_tg_user,
+                                             current_user_category, django_capture_on_commit_callbacks):
+        """Test for not handling again the updates Telegram delivers after they have been handled"""
+
+        chat = {"id": verified_tg_user.tg_chat_id, "first_name": "Vasily", "type": "private"}
+        sender = {"id": verified_tg_user.tg_user_id, "is_bot": False, "first_name": "Vasily"}
+        updates = [
+            {"update_id": update_id, "message": {"message_id": update_id, "from": sender, "chat": chat, "text": text}}
+            for update_id, text in enumerate(["/create", current_user_category.title, "Queued goal"], start=1)
+        ]
+        handler = UpdateHandler(tg_client)
+        for update in updates:
+            post_update(client, update)
+        with django_capture_on_commit_callbacks(execute=True):
+            process_pending_updates(handler.handle_update)
+
+        redelivered = [post_update(client, update).status_code for update in updates]
+        with django_capture_on_commit_callbacks(execute=True):
+            handled = process_pending_updates(handler.handle_update)
+
+        assert redelivered == [200, 200, 200]
+        assert handled == 0
+        assert Goal.objects.filter(title="Queued goal").count() == 1
+
+    def test_handled_updates_purged(self):
+        """Test for deleting the handled updates once Telegram can no longer deliver them again"""
+
+        now = timezone.now()
+        for update_id, handled in ((1, None), (2, now), (3, now - REDELIVERY_PERIOD - timedelta(minutes=1))):
+            PendingUpdate.objects.create(update_id=update_id, tg_chat_id=10, payload={}, handled=handled)
+
+        assert purge_handled_updates() == 1
+        assert list(PendingUpdate.objects.order_by("update_id").values_list("update_id", flat=True)) == [1, 2]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestUpdateQueueLocking:
+    """Queued update locking test suite"""
+
+    def test_locked_chat_skipped(self):
+        """Test for leaving the updates of a chat another worker holds to that worker"""
+
+        for update_id, chat_id in ((1, 10), (2, 20)):
+            PendingUpdate.objects.create(update_id=update_id, tg_chat_id=chat_id, payload={"update_id": update_id})
+        locked, release = threading.Event(), threading.Event()
+
+        def other_worker():
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_xact_lock(10)")
+                locked.set()
+                release.wait()
+            connection.close()
+
+        worker = threading.Thread(target=other_worker)
+        worker.start()
+        locked.wait()
+        handled = []
+        try:
+            process_pending_updates(lambda update: handled.append(update.update_id))
+        finally:
+            release.set()
+            worker.join()
+
+        assert handled == [2]
+        assert list(PendingUpdate.objects.filter(handled=None).values_list("update_id", flat=True)) == [1]
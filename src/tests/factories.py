@@ -2,6 +2,8 @@ from datetime import datetime
 from dateutil.tz import UTC
 from django.utils import timezone
 import factory.fuzzy
+from bot.models import TgUser
+from bot.tg.dc import Chat, Message, MessageFrom, UpdateObj
 from core.models import User
 from goals.models import Board, GoalCategory, BoardParticipant, Goal, Status, Priority, GoalComment
 
@@ -82,3 +84,23 @@ class CommentFactory(factory.django.DjangoModelFactory):
     goal = factory.SubFactory(GoalFactory)
     created = factory.fuzzy.FuzzyDateTime(datetime(2008, 1, 1, tzinfo=UTC), datetime(2023, 1, 1, tzinfo=UTC))
     updated = factory.fuzzy.FuzzyDateTime(datetime(2008, 1, 1, tzinfo=UTC), datetime(2023, 1, 1, tzinfo=UTC))
+
+
+class TgUserFactory(factory.django.DjangoModelFactory):
+    """Test class for TgUser class"""
+
+    class Meta:
+        model = TgUser
+
+    tg_user_id = factory.Sequence(lambda n: 1000 + n)
+    tg_chat_id = factory.LazyAttribute(lambda tg_user: tg_user.tg_user_id)
+    user = factory.SubFactory(UserFactory)
+    verification_code = factory.fuzzy.FuzzyText(length=6)
+    is_verified = True
+
+
+def tg_update(update_id: int, chat_id: int, text: str) -> UpdateObj:
+    """Builds a telegram update with a private chat message"""
+    sender = MessageFrom(id=chat_id, is_bot=False, first_name="Vasily", last_name=None, username=None)
+    chat = Chat(id=chat_id, first_name="Vasily", last_name=None, type="private", title=None)
+    return UpdateObj(update_id=update_id, message=Message(message_id=update_id, from_=sender, chat=chat, text=text))
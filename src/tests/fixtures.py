@@ -1,8 +1,35 @@
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from bot.models import TgUser
+from bot.tg.client import TgClient
+from bot.tg.handlers import UpdateHandler
 from goals.models import Goal, BoardParticipant, Board, GoalCategory
+from goals.access import reset_board_roles_cache_stats
 
+from tests.bot.fake_api import FakeBotApi
 from tests.factories import UserFactory, CategoryFactory, BoardParticipantFactory, GoalFactory, \
-    CommentFactory, BoardFactory
+    CommentFactory, BoardFactory, TgUserFactory
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Clears the cache shared by the tests, e.g. cached board roles"""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture()
+def shared_cache(settings, tmp_path):
+    """Switches to a cache shared by all processes, with which the board roles are cached across requests"""
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path)},
+    }
+    reset_board_roles_cache_stats()
+    yield
+    reset_board_roles_cache_stats()
 
 
 @pytest.fixture()
@@ -141,3 +168,76 @@ def other_user_categories():
     CategoryFactory.create_batch(size=4, user=other_user, board=other_board)
     return GoalCategory.objects.all()
 
+
+@pytest.fixture()
+def assert_constant_queries(client):
+    """Returns a check requesting the path before and after adding rows with the given callable, which fails if the
+    number of queries grows with the number of rows on the page. Each measured request is preceded by a warm-up
+    request, so both are counted with the cache filled"""
+
+    def check(path, add_rows):
+        client.get(path=path)
+        with CaptureQueriesContext(connection) as before:
+            first_response = client.get(path=path)
+        add_rows()
+        client.get(path=path)
+        with CaptureQueriesContext(connection) as after:
+            second_response = client.get(path=path)
+
+        assert first_response.status_code == second_response.status_code == 200
+        assert len(str(second_response.data)) > len(str(first_response.data)), "The page has not grown"
+        assert len(after) == len(before), "\n".join(query["sql"] for query in after.captured_queries)
+
+    return check
+
+
+class RecordingTgClient(TgClient):
+    """TgClient keeping the delivered messages instead of calling the Bot API"""
+
+    def __init__(self):
+        super().__init__(token="test", tg_user=TgUser)
+        self.sent = []
+
+    def deliver_message(self, chat_id: int, text: str):
+        self.sent.append((chat_id, text))
+
+
+@pytest.fixture()
+def tg_client():
+    return RecordingTgClient()
+
+
+@pytest.fixture()
+def handle_update(tg_client, django_capture_on_commit_callbacks):
+    """Returns a function answering an update like the bot does outside of the test transaction, i.e. delivering the
+    messages queued until the commit once the update is handled"""
+    default_handler = UpdateHandler(tg_client)
+
+    def handle(update, handler=default_handler):
+        with django_capture_on_commit_callbacks(execute=True):
+            handler(update)
+
+    return handle
+
+
+@pytest.fixture()
+def verified_tg_user(current_board_participant):
+    """Creates a verified telegram user linked to the current user"""
+    return TgUserFactory(user=current_board_participant.user)
+
+
+@pytest.fixture()
+def fake_bot_api():
+    """Runs a local fake Bot API server"""
+    with FakeBotApi() as api:
+        yield api
+
+
+@pytest.fixture()
+def api_tg_client(fake_bot_api, monkeypatch):
+    """Returns a TgClient calling the fake Bot API server, its retry delays recorded instead of slept"""
+    client = TgClient(token=fake_bot_api.token, tg_user=TgUser, base_url=fake_bot_api.base_url, max_retries=2)
+    client.delays = []
+    monkeypatch.setattr("bot.tg.client.time.sleep", client.delays.append)
+    yield client
+    client.session.close()
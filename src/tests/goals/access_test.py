@@ -0,0 +1,191 @@
+import io
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from goals.access import STATS_CACHE_KEY, board_roles_cache_stats
+from goals.models import Board, BoardParticipant
+from tests.factories import CategoryFactory, BoardFactory, BoardParticipantFactory, tg_update
+
+
+def participant_queries(captured) -> list:
+    """Returns the captured queries selecting from the BoardParticipant table"""
+    return [
+        query["sql"] for query in captured
+        if query["sql"].partition(" FROM ")[2].startswith('"goals_boardparticipant"')
+    ]
+
+
+@pytest.mark.django_db
+class TestBoardAccess:
+    """Request-scoped board access resolver test suite"""
+
+    def test_goal_update_single_lookup(self, client, current_board_participant, current_user_goal):
+        """Test for a goal update checking object permission and the new category with one participant query"""
+
+        user = current_board_participant.user
+        category = CategoryFactory(board=current_board_participant.board, user=user)
+        client.force_login(user=user)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.patch(
+                path=f"/goals/goal/{current_user_goal.id}",
+                data={'category': category.id, 'title': 'Moved'},
+                content_type='application/json',
+            )
+
+        assert response.status_code == 200
+        assert len(participant_queries(captured)) == 1
+
+    def test_comment_create_single_lookup(self, client, current_board_participant, current_user_goal):
+        """Test for a comment creation checking the board role with one participant query"""
+
+        client.force_login(user=current_board_participant.user)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.post(
+                path='/goals/goal_comment/create',
+                data={'goal': current_user_goal.id, 'text': 'Comment'},
+                content_type='application/json',
+            )
+
+        assert response.status_code == 201
+        assert len(participant_queries(captured)) == 1
+
+    def test_goal_move_to_foreign_board(self, client, current_board_participant, current_user_goal):
+        """Test for moving a goal to a category of a board the user does not participate in"""
+
+        foreign_category = CategoryFactory(board=BoardFactory())
+        client.force_login(user=current_board_participant.user)
+
+        response = client.patch(
+            path=f"/goals/goal/{current_user_goal.id}",
+            data={'category': foreign_category.id},
+            content_type='application/json',
+        )
+
+        assert response.status_code == 403
+
+    def test_goal_move_as_reader(self, client, current_board_participant, current_user_goal):
+        """Test for moving a goal by a board participant with reader role"""
+
+        current_board_participant.role = BoardParticipant.Role.reader
+        current_board_participant.save()
+        category = CategoryFactory(board=current_board_participant.board)
+        client.force_login(user=current_board_participant.user)
+
+        response = client.patch(
+            path=f"/goals/goal/{current_user_goal.id}",
+            data={'category': category.id},
+            content_type='application/json',
+        )
+
+        assert response.status_code == 403
+
+    def test_per_process_cache_not_used(self, client, current_board_participant, current_user_goal):
+        """Test for reading the board roles from the database on every request with the local memory cache"""
+
+        client.force_login(user=current_board_participant.user)
+        client.get(path=f"/goals/goal/{current_user_goal.id}")
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(path=f"/goals/goal/{current_user_goal.id}")
+
+        output = io.StringIO()
+        call_command("board_access_stats", stdout=output)
+        assert response.status_code == 200
+        assert len(participant_queries(captured)) == 1
+        assert board_roles_cache_stats() == {'hits': 0, 'misses': 0}
+        assert "not cached" in output.getvalue()
+
+    def test_cached_roles(self, client, shared_cache, current_board_participant, current_user_goal):
+        """Test for reading the board roles from the cache on the following requests"""
+
+        client.force_login(user=current_board_participant.user)
+        client.get(path=f"/goals/goal/{current_user_goal.id}")
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(path=f"/goals/goal/{current_user_goal.id}")
+
+        assert response.status_code == 200
+        assert participant_queries(captured) == []
+        assert board_roles_cache_stats() == {'hits': 1, 'misses': 1}
+
+    def test_role_change_invalidates_cache(self, client, shared_cache, current_board_participant, current_user_goal):
+        """Test for dropping the cached roles when the board participant role changes"""
+
+        client.force_login(user=current_board_participant.user)
+        client.get(path=f"/goals/goal/{current_user_goal.id}")
+
+        current_board_participant.role = BoardParticipant.Role.reader
+        current_board_participant.save()
+
+        response = client.patch(
+            path=f"/goals/goal/{current_user_goal.id}",
+            data={'title': 'Call home'},
+            content_type='application/json',
+        )
+
+        assert response.status_code == 403
+
+    def test_removed_participant_invalidates_cache(self, client, shared_cache, current_board_participant,
+                                                   current_user_goal):
+        """Test for dropping the cached roles of a participant removed from the board by the owner"""
+
+        board = current_board_participant.board
+        writer = BoardParticipantFactory(board=board, role=BoardParticipant.Role.writer).user
+
+        client.force_login(user=writer)
+        assert client.get(path=f"/goals/goal/{current_user_goal.id}").status_code == 200
+
+        client.force_login(user=current_board_participant.user)
+        response = client.put(
+            path=f"/goals/board/{board.id}",
+            data={'title': board.title, 'participants': []},
+            content_type='application/json',
+        )
+        assert response.status_code == 200
+
+        client.force_login(user=writer)
+        assert client.get(path=f"/goals/goal/{current_user_goal.id}").status_code == 404
+
+    def test_bot_reads_roles_uncached(self, client, shared_cache, tg_client, handle_update, verified_tg_user,
+                                      current_user_goal):
+        """Test for the bot ignoring the cached roles, which another process may not have invalidated"""
+
+        client.force_login(user=verified_tg_user.user)
+        client.get(path=f"/goals/goal/{current_user_goal.id}")
+        Board.objects.filter(id=current_user_goal.board_id).update(is_deleted=True)
+
+        handle_update(tg_update(1, verified_tg_user.tg_chat_id, "/goals"))
+
+        assert tg_client.sent == [(verified_tg_user.tg_chat_id, "You don't have any planned goals.")]
+
+    def test_database_cache_not_used(self, client, settings, current_board_participant, current_user_goal):
+        """Test for reading the board roles with one query instead of the database cache queries"""
+
+        settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "roles"}}
+        client.force_login(user=current_board_participant.user)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(path=f"/goals/goal/{current_user_goal.id}")
+
+        assert response.status_code == 200
+        assert len(participant_queries(captured)) == 1
+        assert not any('"roles"' in query['sql'] for query in captured)
+
+    def test_stats_flushed_in_batches(self, client, shared_cache, monkeypatch, current_board_participant,
+                                      current_user_goal):
+        """Test for counting the lookups in the process and adding them to the cache once per batch"""
+
+        monkeypatch.setattr("goals.access.STATS_FLUSH_EVERY", 3)
+        client.force_login(user=current_board_participant.user)
+        for _ in range(4):
+            client.get(path=f"/goals/goal/{current_user_goal.id}")
+
+        assert cache.get_many([STATS_CACHE_KEY.format(name=name) for name in ("hits", "misses")]) == {
+            STATS_CACHE_KEY.format(name="hits"): 2, STATS_CACHE_KEY.format(name="misses"): 1,
+        }
+        assert board_roles_cache_stats() == {'hits': 3, 'misses': 1}
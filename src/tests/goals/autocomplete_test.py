@@ -0,0 +1,63 @@
+import pytest
+from django.urls import reverse
+from goals.models import Status
+from tests.factories import GoalFactory, CategoryFactory, BoardFactory
+
+
+@pytest.mark.django_db
+class TestAutocompleteView:
+    """AutocompleteView test suite"""
+
+    def test_autocomplete_unauthorised(self, client):
+        """Test for autocomplete by unauthorised user"""
+
+        response = client.get(path=reverse('goals:autocomplete'), data={"q": "go"})
+
+        assert response.status_code == 401
+
+    def test_autocomplete_prefix(self, client, current_board_participant, current_user_category):
+        """Test for matching the titles of the user's boards, categories and goals by prefix"""
+
+        user = current_board_participant.user
+        board = current_board_participant.board
+        board.title = "Project board"
+        board.save()
+        current_user_category.title = "Projects"
+        current_user_category.save()
+        goal = GoalFactory(user=user, category=current_user_category, title="Big project plan")
+        first = GoalFactory(user=user, category=current_user_category, title="Project plan")
+        GoalFactory(user=user, category=current_user_category, title="Project archive", status=Status.archived)
+        GoalFactory(category=CategoryFactory(board=BoardFactory(title="Project")), title="Project of others")
+        client.force_login(user=user)
+
+        response = client.get(path=reverse('goals:autocomplete'), data={"q": "proj"})
+
+        assert response.status_code == 200
+        assert [item['id'] for item in response.data['boards']] == [board.id]
+        assert [item['id'] for item in response.data['categories']] == [current_user_category.id]
+        assert [item['id'] for item in response.data['goals']] == [first.id, goal.id]
+        assert response.data['goals'][0] == {
+            "id": first.id, "title": "Project plan", "category": current_user_category.id, "board": board.id,
+        }
+
+    def test_autocomplete_limit(self, client, current_board_participant, current_user_category):
+        """Test for limiting the number of matches"""
+
+        user = current_board_participant.user
+        GoalFactory.create_batch(size=5, user=user, category=current_user_category, title="Report")
+        client.force_login(user=user)
+
+        response = client.get(path=reverse('goals:autocomplete'), data={"q": "rep", "limit": 3})
+
+        assert len(response.data['goals']) == 3
+
+    def test_autocomplete_fuzzy(self, client, current_board_participant, current_user_category):
+        """Test for matching titles with a typo in the typed prefix"""
+
+        user = current_board_participant.user
+        goal = GoalFactory(user=user, category=current_user_category, title="Quarterly report")
+        client.force_login(user=user)
+
+        response = client.get(path=reverse('goals:autocomplete'), data={"q": "quartrly"})
+
+        assert goal.id in [item['id'] for item in response.data['goals']]
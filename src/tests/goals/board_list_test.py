@@ -1,7 +1,23 @@
 import pytest
 from django.urls import reverse
 from goals.models import BoardParticipant
-from goals.serializers import BoardSerializer
+from tests.factories import BoardParticipantFactory
+
+
+def board_data(board, user) -> dict:
+    """Return the expected board list item of the board for the user"""
+
+    return {
+        "id": board.id,
+        "title": board.title,
+        "is_deleted": board.is_deleted,
+        "participants_count": board.participants.count(),
+        "role": board.participants.get(user=user).role,
+    }
+
+
+def list_items(results) -> list:
+    return [{key: item[key] for key in ("id", "title", "is_deleted", "participants_count", "role")} for item in results]
 
 
 @pytest.mark.django_db
@@ -15,7 +31,10 @@ class TestBoardListView:
         response = client.get(path=reverse('goals:list_boards'))
 
         assert response.status_code == 200
-        assert response.data == BoardSerializer(current_user_boards, many=True).data
+        assert list_items(response.data["results"]) == [
+            board_data(board, current_board_participant.user) for board in current_user_boards.order_by("id")
+        ]
+        assert "participants" not in response.data["results"][0]
 
     def test_board_list_writer(self, client, current_board_participant):
         """Board list retrieving test for current board participant with writer role"""
@@ -31,7 +50,7 @@ class TestBoardListView:
         response = client.get(path=reverse('goals:list_boards'))
 
         assert response.status_code == 200
-        assert response.data == [BoardSerializer(board).data]
+        assert list_items(response.data["results"]) == [board_data(board, user)]
 
     def test_board_list_reader(self, client, current_board_participant):
         """Board list retrieving for current board_participant with writer role"""
@@ -47,7 +66,7 @@ class TestBoardListView:
         response = client.get(path=reverse('goals:list_boards'))
 
         assert response.status_code == 200
-        assert response.data == [BoardSerializer(board).data]
+        assert list_items(response.data["results"]) == [board_data(board, user)]
 
     def test_board_list_deleted(self, client, board_participant):
         """Test for retrieving list of deleted boards"""
@@ -61,7 +80,7 @@ class TestBoardListView:
         response = client.get(path=reverse('goals:list_boards'))
 
         assert response.status_code == 200
-        assert response.data == []
+        assert response.data["results"] == []
 
     def test_board_list_filter_by_limit_offset(self, client, current_board_participant, current_user_boards):
         """Boards list pagination test"""
@@ -69,13 +88,46 @@ class TestBoardListView:
         client.force_login(user=current_board_participant.user)
         limit = 3
         offset = 3
-        boards = BoardSerializer(current_user_boards, many=True).data
+        boards = [board_data(board, current_board_participant.user) for board in current_user_boards.order_by("id")]
 
         response = client.get(path=f"/goals/board/list?limit={limit}")
         assert response.status_code == 200
-        assert response.data == {
-            "count": len(boards),
-            "next": f'http://testserver/goals/board/list?limit={limit}&offset={offset}',
-            "previous": None,
-            "results": boards[:limit],
-        }
+        assert response.data["count"] == len(boards)
+        assert response.data["next"] == f'http://testserver/goals/board/list?limit={limit}&offset={offset}'
+        assert response.data["previous"] is None
+        assert list_items(response.data["results"]) == boards[:limit]
+
+
+@pytest.mark.django_db
+class TestBoardParticipantListView:
+    """BoardParticipantListView test suite"""
+
+    def test_participant_list(self, client, current_board_participant):
+        """Test for listing and searching the participants of a board page by page"""
+
+        board = current_board_participant.board
+        BoardParticipantFactory.create_batch(size=3, board=board, role=BoardParticipant.Role.reader)
+        member = BoardParticipantFactory(board=board, role=BoardParticipant.Role.writer)
+        client.force_login(user=current_board_participant.user)
+        path = reverse('goals:list_board_participants', kwargs={"pk": board.id})
+
+        page = client.get(path=path, data={"limit": 2, "offset": 0})
+        found = client.get(path=path, data={"search": member.user.username})
+
+        assert page.status_code == 200
+        assert page.data["count"] == 5
+        assert [item["id"] for item in page.data["results"]] == list(
+            board.participants.order_by("id").values_list("id", flat=True)[:2]
+        )
+        assert [(item["user"], item["role"]) for item in found.data["results"]] == [
+            (member.user.username, BoardParticipant.Role.writer)
+        ]
+
+    def test_participant_list_forbidden(self, client, current_board_participant, another_user_board):
+        """Test for listing the participants of a board the user is not a participant of"""
+
+        client.force_login(user=current_board_participant.user)
+
+        response = client.get(path=reverse('goals:list_board_participants', kwargs={"pk": another_user_board.id}))
+
+        assert response.status_code == 404
@@ -0,0 +1,89 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ErrorDetail
+from goals.access import BoardAccess
+from goals.models import Board, BoardParticipant, DeletionLog
+from tests.factories import UserFactory, BoardParticipantFactory
+
+
+@pytest.mark.django_db
+class TestBoardUpdate:
+    """BoardView update test suite"""
+
+    def update_participants(self, client, board, participants):
+        return client.put(
+            path=f"/goals/board/{board.id}",
+            data={"title": "Renamed", "participants": participants},
+            content_type='application/json',
+        )
+
+    def test_board_update_participants(self, client, current_board_participant):
+        """Test for replacing the board participants by the owner"""
+
+        owner = current_board_participant.user
+        board = current_board_participant.board
+        kept, changed, removed = (
+            BoardParticipantFactory(board=board, role=BoardParticipant.Role.reader) for _ in range(3)
+        )
+        added = UserFactory()
+        assert BoardAccess(removed.user).can_read(board)
+        client.force_login(user=owner)
+
+        response = self.update_participants(client, board, [
+            {"user": kept.user.username, "role": BoardParticipant.Role.reader},
+            {"user": changed.user.username, "role": BoardParticipant.Role.writer},
+            {"user": added.username, "role": BoardParticipant.Role.writer},
+        ])
+
+        assert response.status_code == 200
+        roles = dict(BoardParticipant.objects.filter(board=board).values_list("user", "role"))
+        assert roles == {
+            owner.id: BoardParticipant.Role.owner,
+            kept.user_id: BoardParticipant.Role.reader,
+            changed.user_id: BoardParticipant.Role.writer,
+            added.id: BoardParticipant.Role.writer,
+        }
+        assert Board.objects.get(id=board.id).title == "Renamed"
+        assert list(DeletionLog.objects.values_list("kind", "object_id")) == [
+            (DeletionLog.Kind.participant, removed.id)
+        ]
+        assert not BoardAccess(removed.user).can_read(board)
+        assert BoardAccess(changed.user).can_write(board)
+        assert BoardAccess(added).can_write(board)
+
+    def test_board_update_participants_queries(self, client, current_board_participant):
+        """Test for syncing the participants with a number of queries independent of the number of members"""
+
+        board = current_board_participant.board
+        client.force_login(user=current_board_participant.user)
+
+        def sync(count):
+            members = BoardParticipantFactory.create_batch(size=count, board=board, role=BoardParticipant.Role.reader)
+            newcomers = UserFactory.create_batch(count)
+            participants = [
+                {"user": member.user.username, "role": BoardParticipant.Role.writer} for member in members[::2]
+            ] + [{"user": user.username, "role": BoardParticipant.Role.reader} for user in newcomers]
+            client.get(path=f"/goals/board/{board.id}")
+            with CaptureQueriesContext(connection) as captured:
+                response = self.update_participants(client, board, participants)
+            assert response.status_code == 200
+            assert BoardParticipant.objects.filter(board=board).count() == 1 + count // 2 + count
+            BoardParticipant.objects.filter(board=board).exclude(user=current_board_participant.user).delete()
+            return len(captured)
+
+        assert sync(4) == sync(40)
+
+    def test_board_update_unknown_user(self, client, current_board_participant):
+        """Test for updating the board participants with a username which does not exist"""
+
+        client.force_login(user=current_board_participant.user)
+
+        response = self.update_participants(client, current_board_participant.board, [
+            {"user": "nobody", "role": BoardParticipant.Role.reader},
+        ])
+
+        assert response.status_code == 400
+        assert response.data == {"participants": [{"user": [
+            ErrorDetail(string="Object with username=nobody does not exist.", code="does_not_exist")
+        ]}]}
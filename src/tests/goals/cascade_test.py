@@ -0,0 +1,79 @@
+import io
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from goals.models import Goal, GoalCategory, PendingCascade, Status
+from tests.factories import CategoryFactory, GoalFactory
+
+
+@pytest.mark.django_db
+class TestDeletionCascade:
+    """Batched cascade of board and category deletion test suite"""
+
+    @pytest.fixture(autouse=True)
+    def small_batches(self, settings):
+        settings.DELETION_CASCADE_BATCH_SIZE = 2
+        settings.DELETION_CASCADE_INLINE_BATCHES = 1
+
+    def test_board_deletion_hides_children(self, client, current_board_participant, current_user_category):
+        """Test for hiding the categories and goals of a deleted board before the cascade has reached them"""
+
+        user = current_board_participant.user
+        board = current_board_participant.board
+        CategoryFactory.create_batch(size=3, board=board, user=user)
+        GoalFactory.create_batch(size=4, category=current_user_category, user=user, status=Status.to_do)
+        live_goals = Goal.objects.exclude(status=Status.archived).count()
+        client.force_login(user=user)
+
+        response = client.delete(path=f"/goals/board/{board.id}")
+
+        assert response.status_code == 204
+        assert PendingCascade.objects.filter(board=board, category=None).exists()
+        assert GoalCategory.objects.filter(board=board, is_deleted=False).count() == 2
+        assert Goal.objects.filter(board=board).exclude(status=Status.archived).count() == live_goals - 2
+        assert client.get(path=reverse('goals:list_goals')).data['results'] == []
+        assert client.get(path=reverse('goals:list_categories')).data['results'] == []
+        assert client.post(
+            path=reverse('goals:create_goal'),
+            data={"title": "New", "category": current_user_category.id},
+            content_type='application/json',
+        ).status_code in (400, 403)
+
+    def test_category_deletion_hides_goals(self, client, current_board_participant, current_user_category):
+        """Test for hiding the goals of a deleted category before the cascade has reached them"""
+
+        user = current_board_participant.user
+        goals = GoalFactory.create_batch(size=4, category=current_user_category, user=user, status=Status.to_do)
+        live_goals = Goal.objects.exclude(status=Status.archived).count()
+        client.force_login(user=user)
+
+        response = client.delete(path=f"/goals/goal_category/{current_user_category.id}")
+
+        assert response.status_code == 204
+        assert Goal.objects.exclude(status=Status.archived).count() == live_goals - 2
+        assert client.get(path=reverse('goals:list_goals')).data['results'] == []
+        assert client.get(path=f"/goals/goal/{goals[-1].id}").status_code == 404
+        assert client.get(path=reverse('goals:overdue_goals')).data['results'] == []
+
+    def test_cascade_command_resumes(self, current_board_participant, current_user_category):
+        """Test for finishing the pending cascades with the management command"""
+
+        user = current_board_participant.user
+        board = current_board_participant.board
+        CategoryFactory.create_batch(size=3, board=board, user=user)
+        GoalFactory.create_batch(size=5, category=current_user_category, user=user)
+        board.is_deleted = True
+        board.save()
+        PendingCascade.objects.create(board=board)
+        category = CategoryFactory(user=user)
+        GoalFactory.create_batch(size=3, category=category, user=user, status=Status.in_progress)
+        category.is_deleted = True
+        category.save()
+        PendingCascade.objects.create(board=category.board, category=category)
+
+        call_command("cascade_deletions", stdout=io.StringIO())
+
+        assert not PendingCascade.objects.exists()
+        assert not GoalCategory.objects.filter(board=board, is_deleted=False).exists()
+        assert not Goal.objects.filter(board=board).exclude(status=Status.archived).exists()
+        assert not Goal.objects.filter(category=category).exclude(status=Status.archived).exists()
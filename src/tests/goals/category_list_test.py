@@ -1,8 +1,21 @@
 import pytest
 from django.urls import reverse
 from rest_framework.exceptions import ErrorDetail
-from goals.models import BoardParticipant
+from goals.models import BoardParticipant, Goal, Status
 from goals.serializers import GoalCategorySerializer
+from tests.factories import BoardFactory, CategoryFactory, GoalFactory
+
+
+def category_list_data(categories) -> list:
+    """Return the expected category list items with the goal counts of the categories"""
+
+    return [
+        dict(item, goal_counts={
+            name: Goal.objects.filter(category=item["id"], status=Status[name]).count()
+            for name in ("to_do", "in_progress", "done")
+        })
+        for item in GoalCategorySerializer(categories, many=True).data
+    ]
 
 
 @pytest.mark.django_db
@@ -18,7 +31,7 @@ class TestGoalCategoryListView:
         categories = current_user_categories.order_by('title')
 
         assert response.status_code == 200
-        assert response.data == GoalCategorySerializer(categories, many=True).data
+        assert response.data["results"] == category_list_data(categories)
 
     def test_category_list_unauthorised(self, client):
         """Test for goal category list retrieving for unauthorised user"""
@@ -39,7 +52,7 @@ class TestGoalCategoryListView:
         response = client.get(path=reverse('goals:list_categories'))
 
         assert response.status_code == 200
-        assert response.data == []
+        assert response.data["results"] == []
 
     def test_category_list_reader(self, client, current_board_participant, current_user_categories):
         """Goal category list test for board_participant with reader role"""
@@ -53,7 +66,7 @@ class TestGoalCategoryListView:
         goals = current_user_categories.order_by('title')
 
         assert response.status_code == 200
-        assert response.data == GoalCategorySerializer(goals, many=True).data
+        assert response.data["results"] == category_list_data(goals)
 
     def test_category_list_writer(self, client, current_board_participant, current_user_categories):
         """Goal category list test for board_participant with writer role"""
@@ -67,7 +80,7 @@ class TestGoalCategoryListView:
         goals = current_user_categories.order_by('title')
 
         assert response.status_code == 200
-        assert response.data == GoalCategorySerializer(goals, many=True).data
+        assert response.data["results"] == category_list_data(goals)
 
     def test_category_list_filter_by_board(self, client, current_board_participant, current_user_categories):
         """Test for filtering goal category by board"""
@@ -80,7 +93,7 @@ class TestGoalCategoryListView:
         goals = current_user_categories.order_by('title')
 
         assert response.status_code == 200
-        assert response.data == GoalCategorySerializer(goals, many=True).data
+        assert response.data["results"] == category_list_data(goals)
 
     def test_category_list_search_by_title(self, client, current_board_participant, current_user_categories):
         """Test for searching goal categories by title"""
@@ -96,4 +109,30 @@ class TestGoalCategoryListView:
             response = client.get(path=f"/goals/goal_category/list?search={query}")
             categories = current_user_categories.filter(title__icontains=query).order_by('title')
             assert response.status_code == 200
-            assert response.data == GoalCategorySerializer(categories, many=True).data
+            assert response.data["results"] == category_list_data(categories)
+
+    def test_category_list_goal_counts(self, client, current_board_participant, current_user_category):
+        """Test for counting the goals of the listed categories by status with one query"""
+
+        user = current_board_participant.user
+        Goal.objects.all().delete()
+        for status, size in ((Status.to_do, 3), (Status.in_progress, 2), (Status.done, 1), (Status.archived, 4)):
+            GoalFactory.create_batch(size=size, category=current_user_category, user=user, status=status)
+        client.force_login(user=user)
+
+        response = client.get(path=reverse('goals:list_categories'))
+
+        assert response.status_code == 200
+        assert response.data["results"][0]["goal_counts"] == {"to_do": 3, "in_progress": 2, "done": 1}
+
+    def test_category_list_foreign_board(self, client, current_board_participant, current_user_categories):
+        """Test for filtering goal categories by a board the user is not a participant of"""
+
+        foreign_board = BoardFactory()
+        CategoryFactory.create_batch(size=2, board=foreign_board)
+        client.force_login(user=current_board_participant.user)
+
+        response = client.get(path=reverse('goals:list_categories'), data={"board": foreign_board.id})
+
+        assert response.status_code == 200
+        assert response.data["results"] == []
@@ -1,8 +1,9 @@
 import pytest
 from django.urls import reverse
 from rest_framework.exceptions import ErrorDetail
-from goals.models import BoardParticipant
+from goals.models import BoardParticipant, GoalComment
 from goals.serializers import GoalCommentSerializer
+from tests.factories import CommentFactory, GoalFactory
 
 
 @pytest.mark.django_db
@@ -18,7 +19,7 @@ class TestGoalCommentListView:
         response = client.get(path=f'/goals/goal_comment/list?goal={goal_with_comments.id}')
 
         assert response.status_code == 200
-        assert response.data == comments
+        assert response.data["results"] == comments
 
     def test_goal_list_unauthorised(self, client):
         """Test for retrieving goal list for unauthorised user"""
@@ -43,7 +44,7 @@ class TestGoalCommentListView:
         response = client.get(path=f'/goals/goal_comment/list?goal={goal_with_comments.id}')
 
         assert response.status_code == 200
-        assert response.data == comments
+        assert response.data["results"] == comments
 
     def test_goal_list_writer(self, client, current_board_participant, goal_with_comments):
         """Test for retrieving goal comments for board_participant with writer role"""
@@ -58,7 +59,7 @@ class TestGoalCommentListView:
         response = client.get(path=f'/goals/goal_comment/list?goal={goal_with_comments.id}')
 
         assert response.status_code == 200
-        assert response.data == comments
+        assert response.data["results"] == comments
 
     def test_goal_list_sort_by_updated_created(self, client, current_board_participant, goal_with_comments):
         """Test for sorting goal comments list by created and updated fields """
@@ -75,6 +76,50 @@ class TestGoalCommentListView:
         comments_by_updated = GoalCommentSerializer(goal_with_comments.comments.order_by('updated'), many=True).data
 
         assert response_created.status_code == 200
-        assert response_created.data == comments_by_created
+        assert response_created.data["results"] == comments_by_created
         assert response_updated.status_code == 200
-        assert response_updated.data == comments_by_updated
+        assert response_updated.data["results"] == comments_by_updated
+
+    def test_comment_list_several_goals(self, client, current_board_participant, current_user_category):
+        """Test for listing the comments of several goals given as repeated and comma-separated ids"""
+
+        user = current_board_participant.user
+        goals = GoalFactory.create_batch(size=3, category=current_user_category, user=user)
+        for goal in goals:
+            CommentFactory.create_batch(size=2, goal=goal, user=user)
+        client.force_login(user=user)
+
+        response = client.get(
+            path=f"/goals/goal_comment/list?goal={goals[0].id},{goals[1].id}&goal={goals[2].id}&page_size=4"
+        )
+        next_page = client.get(path=response.data["next"])
+
+        expected = GoalComment.objects.filter(goal__in=goals).order_by('-created', 'id')
+        assert response.status_code == 200
+        assert [comment['id'] for comment in response.data["results"] + next_page.data["results"]] == [
+            comment.id for comment in expected
+        ]
+        assert next_page.data["next"] is None
+
+    def test_comment_list_other_board(self, client, current_board_participant, goal_with_comments,
+                                      another_user_goal):
+        """Test for leaving out the comments of the goals of boards the user is not a participant of"""
+
+        CommentFactory.create_batch(size=2, goal=another_user_goal)
+        client.force_login(user=current_board_participant.user)
+
+        response = client.get(
+            path=reverse('goals:list_comments'), data={"goal": f"{goal_with_comments.id},{another_user_goal.id}"}
+        )
+
+        assert response.status_code == 200
+        assert {comment['goal'] for comment in response.data["results"]} == {goal_with_comments.id}
+
+    def test_comment_list_invalid_goal(self, client, current_board_participant):
+        """Test for listing the comments of an invalid goal id"""
+
+        client.force_login(user=current_board_participant.user)
+
+        response = client.get(path=reverse('goals:list_comments'), data={"goal": "1,x"})
+
+        assert response.status_code == 400
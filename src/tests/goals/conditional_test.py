@@ -0,0 +1,160 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from goals.models import Goal, Status
+from tests.factories import GoalFactory, UserFactory, BoardParticipantFactory
+
+
+@pytest.mark.django_db
+class TestConditionalRequests:
+    """ETag and Last-Modified test suite"""
+
+    def test_list_not_modified(self, client, current_board_participant, current_user_goals):
+        """Test for answering a repeated goal list request with 304 without serializing the goals"""
+
+        client.force_login(user=current_board_participant.user)
+        url = reverse('goals:list_goals')
+
+        response = client.get(path=url)
+        etag = response.headers['ETag']
+        assert response.status_code == 200
+        assert etag.startswith('W/"')
+        assert 'Last-Modified' not in response.headers
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(path=url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+        assert not any('"goals_goal"."title"' in query['sql'] for query in captured)
+
+    def test_list_modified(self, client, current_board_participant, current_user_goals, current_user_category):
+        """Test for a new ETag of the goal list after a goal is changed, created or archived"""
+
+        client.force_login(user=current_board_participant.user)
+        url = reverse('goals:list_goals')
+        etags = {client.get(path=url).headers['ETag']}
+
+        goal = Goal.objects.first()
+        goal.title = "Changed"
+        goal.save()
+        etags.add(client.get(path=url).headers['ETag'])
+
+        GoalFactory(user=current_board_participant.user, category=current_user_category)
+        etags.add(client.get(path=url).headers['ETag'])
+
+        client.delete(path=f"/goals/goal/{goal.id}")
+        response = client.get(path=url, HTTP_IF_NONE_MATCH=", ".join(etags))
+
+        assert len(etags) == 3
+        assert response.status_code == 200
+        assert response.headers['ETag'] not in etags
+
+    def test_list_etag_depends_on_query(self, client, current_board_participant, current_user_goals):
+        """Test for different ETags of different pages and filters of the same list"""
+
+        client.force_login(user=current_board_participant.user)
+        url = reverse('goals:list_goals')
+
+        first = client.get(path=url).headers['ETag']
+        filtered = client.get(path=f"{url}?status={Status.done}").headers['ETag']
+
+        assert first != filtered
+
+    def test_board_not_modified(self, client, current_board_participant):
+        """Test for a 304 board response and a new ETag after the participants change"""
+
+        client.force_login(user=current_board_participant.user)
+        url = f"/goals/board/{current_board_participant.board_id}"
+
+        etag = client.get(path=url).headers['ETag']
+        assert client.get(path=url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        BoardParticipantFactory(board=current_board_participant.board, user=UserFactory())
+        response = client.get(path=url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+    def test_update_if_match(self, client, current_board_participant, current_user_goal):
+        """Test for updating a goal with If-Match and getting the new ETag back"""
+
+        client.force_login(user=current_board_participant.user)
+        url = f"/goals/goal/{current_user_goal.id}"
+        etag = client.get(path=url).headers['ETag']
+
+        response = client.patch(path=url, data={"title": "First"}, content_type='application/json',
+                                HTTP_IF_MATCH=etag)
+        new_etag = response.headers['ETag']
+
+        assert response.status_code == 200
+        assert new_etag != etag
+        assert client.get(path=url, HTTP_IF_NONE_MATCH=new_etag).status_code == 304
+
+        response = client.patch(path=url, data={"title": "Second"}, content_type='application/json',
+                                HTTP_IF_MATCH=etag)
+        current_user_goal.refresh_from_db()
+
+        assert response.status_code == 412
+        assert current_user_goal.title == "First"
+
+    def test_list_ignores_if_modified_since(self, client, current_board_participant, current_user_category):
+        """Test for answering If-Modified-Since with the overdue list once a goal has become overdue"""
+
+        user = current_board_participant.user
+        goal = GoalFactory(user=user, category=current_user_category, status=Status.to_do,
+                           due_date=timezone.now() + timedelta(days=1))
+        client.force_login(user=user)
+        url = reverse('goals:overdue_goals')
+        since = http_date(time.time() + 60)
+        before = [item['id'] for item in client.get(path=url).data['results']]
+
+        Goal.objects.filter(id=goal.id).update(due_date=timezone.now() - timedelta(days=1))
+        response = client.get(path=url, HTTP_IF_MODIFIED_SINCE=since)
+
+        assert response.status_code == 200
+        assert goal.id not in before
+        assert goal.id in [item['id'] for item in response.data['results']]
+
+    def test_category_list_modified(self, client, current_board_participant, current_user_category):
+        """Test for a new ETag of the category list after a goal of a listed category is changed, without joining the
+        goals to the categories"""
+
+        goal = GoalFactory(user=current_board_participant.user, category=current_user_category, status=Status.to_do)
+        client.force_login(user=current_board_participant.user)
+        url = reverse('goals:list_categories')
+
+        with CaptureQueriesContext(connection) as captured:
+            etag = client.get(path=url).headers['ETag']
+        assert client.get(path=url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        client.patch(path=f"/goals/goal/{goal.id}", data={"status": Status.done}, content_type='application/json')
+        response = client.get(path=url, HTTP_IF_NONE_MATCH=etag)
+
+        assert not any('JOIN "goals_goal"' in query['sql'] for query in captured)
+        assert response.status_code == 200
+        assert response.data['results'][0]['goal_counts']['done'] >= 1
+
+    def test_board_list_modified(self, client, current_board_participant):
+        """Test for a new ETag of the board list after a participant is added, without joining the participants to the
+        boards"""
+
+        client.force_login(user=current_board_participant.user)
+        url = reverse('goals:list_boards')
+
+        with CaptureQueriesContext(connection) as captured:
+            etag = client.get(path=url).headers['ETag']
+        assert client.get(path=url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        BoardParticipantFactory(board=current_board_participant.board, user=UserFactory())
+        response = client.get(path=url, HTTP_IF_NONE_MATCH=etag)
+
+        assert not any('JOIN "goals_boardparticipant"' in query['sql'] for query in captured)
+        assert response.status_code == 200
+        assert response.data['results'][0]['participants_count'] == 2
@@ -0,0 +1,103 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.exceptions import ErrorDetail
+from goals.models import Goal, BoardParticipant
+from tests.factories import CategoryFactory, BoardFactory, BoardParticipantFactory
+
+
+@pytest.mark.django_db
+class TestGoalBulkCreate:
+    """GoalBulkCreateView test suite"""
+
+    def test_bulk_create_success(self, client, current_board_participant, current_user_category):
+        """Test for creating goals in several categories of several boards"""
+
+        user = current_board_participant.user
+        other_board = BoardFactory()
+        BoardParticipantFactory(user=user, board=other_board, role=BoardParticipant.Role.writer)
+        other_category = CategoryFactory(board=other_board, user=user)
+        client.force_login(user=user)
+
+        goals = [
+            {"title": f"Goal {i}", "category": category.id, "priority": 3}
+            for i in range(100)
+            for category in (current_user_category, other_category)
+        ]
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.post(
+                path=reverse('goals:bulk_create_goals'),
+                data={"goals": goals},
+                content_type='application/json',
+            )
+
+        assert response.status_code == 201
+        assert response.data['errors'] == {}
+        assert len(response.data['created']) == 200
+        assert Goal.objects.filter(category=other_category, board=other_board, user=user).count() == 100
+        assert len(captured) < 10
+
+    def test_bulk_create_partial(self, client, current_board_participant, current_user_category):
+        """Test for creating the valid goals and reporting errors for the others"""
+
+        deleted_category = CategoryFactory(board=current_board_participant.board, is_deleted=True)
+        foreign_category = CategoryFactory(board=BoardFactory())
+        client.force_login(user=current_board_participant.user)
+
+        goals = [
+            {"title": "Valid", "category": current_user_category.id},
+            {"category": current_user_category.id},
+            {"title": "Deleted category", "category": deleted_category.id},
+            {"title": "Foreign category", "category": foreign_category.id},
+        ]
+
+        response = client.post(
+            path=reverse('goals:bulk_create_goals'),
+            data={"goals": goals},
+            content_type='application/json',
+        )
+
+        assert response.status_code == 201
+        assert [goal['title'] for goal in response.data['created']] == ["Valid"]
+        assert response.data['errors'] == {
+            "1": {"title": [ErrorDetail(string='This field is required.', code='required')]},
+            "2": {"category": ["Not allowed in deleted category"]},
+            "3": {"category": ["У Вас нет права создавать цели для данной категории."]},
+        }
+
+    def test_bulk_create_atomic(self, client, current_board_participant, current_user_category):
+        """Test for rejecting the whole batch if any goal is invalid and atomic is requested"""
+
+        client.force_login(user=current_board_participant.user)
+        goals_count = Goal.objects.count()
+
+        response = client.post(
+            path=reverse('goals:bulk_create_goals'),
+            data={"atomic": True, "goals": [
+                {"title": "Valid", "category": current_user_category.id},
+                {"title": "Invalid", "category": 0},
+            ]},
+            content_type='application/json',
+        )
+
+        assert response.status_code == 400
+        assert list(response.data['errors']) == ['1']
+        assert Goal.objects.count() == goals_count
+
+    def test_bulk_create_reader(self, client, current_board_participant, current_user_category):
+        """Test for creating goals by board participant with reader role"""
+
+        current_board_participant.role = BoardParticipant.Role.reader
+        current_board_participant.save()
+        client.force_login(user=current_board_participant.user)
+
+        response = client.post(
+            path=reverse('goals:bulk_create_goals'),
+            data={"goals": [{"title": "Goal", "category": current_user_category.id}]},
+            content_type='application/json',
+        )
+
+        assert response.status_code == 400
+        assert list(response.data['errors']) == ['0']
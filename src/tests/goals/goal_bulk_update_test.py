@@ -0,0 +1,129 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from goals.models import Goal, BoardParticipant, Status, Priority
+from tests.factories import GoalFactory, CategoryFactory, BoardFactory, BoardParticipantFactory
+
+
+@pytest.mark.django_db
+class TestGoalBulkUpdate:
+    """GoalBulkUpdateView test suite"""
+
+    def test_bulk_update_unauthorised(self, client):
+        """Test for updating goals by unauthorised user"""
+
+        response = client.patch(
+            path=reverse('goals:bulk_update_goals'),
+            data={"ids": [1], "changes": {"status": Status.done}},
+            content_type='application/json',
+        )
+
+        assert response.status_code == 401
+
+    def test_bulk_update_by_ids(self, client, current_board_participant, current_user_category):
+        """Test for changing the status of the goals given by ids with a constant number of queries"""
+
+        user = current_board_participant.user
+        goals = GoalFactory.create_batch(size=50, user=user, category=current_user_category, status=Status.to_do)
+        untouched = GoalFactory(user=user, category=current_user_category, status=Status.to_do)
+        updated_before = {goal.id: goal.updated for goal in goals}
+        client.force_login(user=user)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.patch(
+                path=reverse('goals:bulk_update_goals'),
+                data={"ids": [goal.id for goal in goals], "changes": {"status": Status.done}},
+                content_type='application/json',
+            )
+
+        assert response.status_code == 200
+        assert response.data == {"updated": sorted(updated_before)}
+        assert len(captured) < 10
+        for goal in Goal.objects.filter(id__in=updated_before):
+            assert goal.status == Status.done
+            assert goal.updated > updated_before[goal.id]
+        untouched.refresh_from_db()
+        assert untouched.status == Status.to_do
+
+    def test_bulk_update_by_filter(self, client, current_board_participant, current_user_category):
+        """Test for raising the priority of the goals selected with a GoalDateFilter expression"""
+
+        user = current_board_participant.user
+        Goal.objects.update(priority=Priority.medium)
+        low = GoalFactory.create_batch(size=3, user=user, category=current_user_category, priority=Priority.low)
+        client.force_login(user=user)
+
+        response = client.patch(
+            path=reverse('goals:bulk_update_goals'),
+            data={"filter": {"priority": Priority.low}, "changes": {"priority": Priority.high}},
+            content_type='application/json',
+        )
+
+        assert response.status_code == 200
+        assert response.data == {"updated": sorted(goal.id for goal in low)}
+        assert Goal.objects.filter(priority=Priority.high).count() == 3
+
+    def test_bulk_update_skips_foreign_goals(self, client, current_board_participant, current_user_goal):
+        """Test for ignoring the goals of boards the user is not a participant of"""
+
+        foreign_goal = GoalFactory(category=CategoryFactory(board=BoardFactory()), status=Status.to_do)
+        client.force_login(user=current_board_participant.user)
+
+        response = client.patch(
+            path=reverse('goals:bulk_update_goals'),
+            data={"ids": [current_user_goal.id, foreign_goal.id], "changes": {"status": Status.in_progress}},
+            content_type='application/json',
+        )
+
+        foreign_goal.refresh_from_db()
+        assert response.status_code == 200
+        assert response.data == {"updated": [current_user_goal.id]}
+        assert foreign_goal.status == Status.to_do
+
+    def test_bulk_update_reader(self, client, current_board_participant, current_user_goal):
+        """Test for rejecting the whole update if the user is a reader of any board of the selected goals"""
+
+        user = current_board_participant.user
+        board = BoardFactory()
+        BoardParticipantFactory(user=user, board=board, role=BoardParticipant.Role.reader)
+        read_only_goal = GoalFactory(category=CategoryFactory(board=board))
+        status = current_user_goal.status
+        client.force_login(user=user)
+
+        response = client.patch(
+            path=reverse('goals:bulk_update_goals'),
+            data={"ids": [current_user_goal.id, read_only_goal.id], "changes": {"status": Status.done}},
+            content_type='application/json',
+        )
+
+        current_user_goal.refresh_from_db()
+        assert response.status_code == 403
+        assert current_user_goal.status == status
+
+    @pytest.mark.parametrize("data", [
+        {"changes": {"status": Status.done}},
+        {"ids": [1], "filter": {"status": "1"}, "changes": {"status": Status.done}},
+        {"ids": [1], "changes": {}},
+        {"ids": [1], "changes": {"title": "Not a bulk field"}},
+        {"ids": [1], "changes": {"status": Status.done, "title": "Not a bulk field"}},
+        {"filter": {"status": "not a status"}, "changes": {"status": Status.done}},
+        {"filter": {"bogus": "1"}, "changes": {"status": Status.done}},
+        {"filter": {"status": "1", "bogus": "1"}, "changes": {"status": Status.done}},
+        {"filter": {}, "changes": {"status": Status.done}},
+    ])
+    def test_bulk_update_invalid(self, client, current_board_participant, current_user_goal, data):
+        """Test for invalid goals selections and changes leaving the goals untouched"""
+
+        client.force_login(user=current_board_participant.user)
+        updated = current_user_goal.updated
+
+        response = client.patch(
+            path=reverse('goals:bulk_update_goals'),
+            data=data,
+            content_type='application/json',
+        )
+
+        assert response.status_code == 400
+        current_user_goal.refresh_from_db()
+        assert current_user_goal.updated == updated
@@ -0,0 +1,94 @@
+import pytest
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from goals.models import Goal, Status, BoardParticipant
+from tests.factories import GoalFactory, CategoryFactory, BoardFactory, BoardParticipantFactory
+
+
+@pytest.fixture()
+def deadline_goals(current_board_participant, current_user_category):
+    """Creates goals overdue, due soon and due later on two boards of the current user"""
+    Goal.objects.all().delete()
+    user = current_board_participant.user
+    now = timezone.now()
+    other_category = CategoryFactory(board=BoardFactory())
+    BoardParticipantFactory(user=user, board=other_category.board, role=BoardParticipant.Role.reader)
+
+    goals = {
+        "overdue": [
+            GoalFactory(user=user, category=current_user_category, status=Status.to_do,
+                        due_date=now - timedelta(days=2)),
+            GoalFactory(user=user, category=current_user_category, status=Status.in_progress,
+                        due_date=now - timedelta(days=1)),
+            GoalFactory(category=other_category, status=Status.to_do, due_date=now - timedelta(hours=1)),
+        ],
+        "due_soon": [
+            GoalFactory(user=user, category=current_user_category, status=Status.to_do,
+                        due_date=now + timedelta(days=1)),
+        ],
+    }
+    GoalFactory(user=user, category=current_user_category, status=Status.done, due_date=now - timedelta(days=3))
+    GoalFactory(user=user, category=current_user_category, status=Status.archived, due_date=now - timedelta(days=3))
+    GoalFactory(user=user, category=current_user_category, status=Status.to_do, due_date=now + timedelta(days=10))
+    GoalFactory(user=user, category=current_user_category, status=Status.to_do, due_date=None)
+    GoalFactory(category=CategoryFactory(board=BoardFactory()), status=Status.to_do, due_date=now - timedelta(days=1))
+    return goals
+
+
+@pytest.mark.django_db
+class TestGoalDeadlineViews:
+    """GoalOverdueView and GoalDueSoonView test suite"""
+
+    def test_overdue_unauthorised(self, client):
+        """Test for retrieving overdue goals by unauthorised user"""
+
+        response = client.get(path=reverse('goals:overdue_goals'))
+
+        assert response.status_code == 401
+
+    def test_overdue(self, client, current_board_participant, deadline_goals):
+        """Test for retrieving open overdue goals ordered by due date with the counts per board"""
+
+        client.force_login(user=current_board_participant.user)
+        overdue = deadline_goals["overdue"]
+
+        response = client.get(path=reverse('goals:overdue_goals'))
+
+        assert response.status_code == 200
+        assert [goal['id'] for goal in response.data['results']] == [goal.id for goal in overdue]
+        assert response.data['counts'] == [
+            {"board": board_id, "count": count}
+            for board_id, count in sorted({overdue[0].board_id: 2, overdue[2].board_id: 1}.items())
+        ]
+
+    def test_overdue_counts_all_pages(self, client, current_board_participant, deadline_goals):
+        """Test for counting the goals of all pages"""
+
+        client.force_login(user=current_board_participant.user)
+
+        response = client.get(path=reverse('goals:overdue_goals'), data={"page_size": 1})
+
+        assert len(response.data['results']) == 1
+        assert sum(item['count'] for item in response.data['counts']) == 3
+
+    def test_due_soon(self, client, current_board_participant, deadline_goals):
+        """Test for retrieving open goals due within the given number of days"""
+
+        client.force_login(user=current_board_participant.user)
+
+        week = client.get(path=reverse('goals:due_soon_goals'))
+        month = client.get(path=reverse('goals:due_soon_goals'), data={"days": 30})
+
+        assert [goal['id'] for goal in week.data['results']] == [goal.id for goal in deadline_goals["due_soon"]]
+        assert len(month.data['results']) == 2
+
+    @pytest.mark.parametrize("days", ["0", "-1", "week", "1000"])
+    def test_due_soon_invalid_days(self, client, current_board_participant, days):
+        """Test for an invalid number of days"""
+
+        client.force_login(user=current_board_participant.user)
+
+        response = client.get(path=reverse('goals:due_soon_goals'), data={"days": days})
+
+        assert response.status_code == 400
@@ -2,9 +2,9 @@ import pytest
 from django.utils import timezone
 from rest_framework.exceptions import ErrorDetail
 from core.serializers import UserProfileSerializer
-from goals.models import Status, Goal, BoardParticipant
+from goals.models import Status, Goal, BoardParticipant, GoalComment
 from goals.serializers import GoalSerializer
-from tests.factories import UserFactory
+from tests.factories import UserFactory, BoardFactory, BoardParticipantFactory, CategoryFactory, CommentFactory
 
 
 @pytest.mark.django_db
@@ -125,3 +125,27 @@ class TestGoalView:
 
         assert response.status_code == 204
         assert goal.status == Status.archived
+
+    def test_goal_move_to_another_board(self, client, current_board_participant, current_user_goal):
+        """Test for keeping the goal and comments board in line with the category board after moving the goal"""
+
+        user = current_board_participant.user
+        other_board = BoardFactory()
+        BoardParticipantFactory(user=user, board=other_board)
+        other_category = CategoryFactory(board=other_board, user=user)
+        comment = CommentFactory(goal=current_user_goal, user=user)
+
+        client.force_login(user=user)
+
+        response = client.patch(
+            path=f"/goals/goal/{current_user_goal.id}",
+            data={'category': other_category.id},
+            content_type='application/json',
+        )
+
+        goal = Goal.objects.get(id=current_user_goal.id)
+        comment = GoalComment.objects.get(id=comment.id)
+
+        assert response.status_code == 200
+        assert goal.board_id == other_board.id
+        assert comment.board_id == other_board.id
@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+import pytest
+from django.urls import reverse
+from goals.models import Goal, Status
+from tests.factories import GoalFactory, CategoryFactory, BoardFactory
+
+
+@pytest.mark.django_db
+class TestGoalExportView:
+    """GoalExportView test suite"""
+
+    def export(self, client, **params):
+        response = client.get(path=reverse('goals:export_goals'), data=params)
+        assert response.status_code == 200
+        assert response.streaming
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_export_unauthorised(self, client):
+        """Test for exporting goals by unauthorised user"""
+
+        response = client.get(path=reverse('goals:export_goals'))
+
+        assert response.status_code == 401
+
+    def test_export_csv(self, client, current_board_participant, current_user_goals):
+        """Test for exporting the goals of the user's boards as CSV"""
+
+        user = current_board_participant.user
+        GoalFactory(category=CategoryFactory(board=BoardFactory()))
+        GoalFactory(user=user, category=Goal.objects.first().category, status=Status.archived)
+        client.force_login(user=user)
+
+        response, content = self.export(client)
+        rows = list(csv.DictReader(io.StringIO(content)))
+        expected = Goal.objects.filter(board=current_board_participant.board).exclude(status=Status.archived)
+
+        assert response['Content-Type'] == "text/csv; charset=utf-8"
+        assert response['Content-Disposition'] == 'attachment; filename="goals.csv"'
+        assert [int(row['id']) for row in rows] == sorted(expected.values_list('id', flat=True))
+        assert rows[0]['user'] == user.username
+        assert rows[0]['board'] == str(current_board_participant.board_id)
+
+    def test_export_ndjson_filters(self, client, current_board_participant, current_user_goals):
+        """Test for exporting the goals matching the goal list filters as NDJSON"""
+
+        client.force_login(user=current_board_participant.user)
+        goal = Goal.objects.first()
+        goal.status = Status.in_progress
+        goal.title = "Отчёт"
+        goal.save()
+        Goal.objects.exclude(id=goal.id).update(status=Status.to_do)
+
+        response, content = self.export(client, output="ndjson", status=Status.in_progress)
+        rows = [json.loads(line) for line in content.splitlines()]
+
+        assert response['Content-Type'] == "application/x-ndjson; charset=utf-8"
+        assert len(rows) == 1
+        assert rows[0]['id'] == goal.id
+        assert rows[0]['title'] == "Отчёт"
+        assert rows[0]['status'] == Status.in_progress
+
+    @pytest.mark.parametrize("params", [{"output": "xml"}, {"status": "not a status"}])
+    def test_export_invalid(self, client, current_board_participant, params):
+        """Test for an unknown output format and invalid filters"""
+
+        client.force_login(user=current_board_participant.user)
+
+        response = client.get(path=reverse('goals:export_goals'), data=params)
+
+        assert response.status_code == 400
@@ -0,0 +1,159 @@
+import io
+import json
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from goals.imports import JsonStream
+from goals.models import Goal, GoalCategory, GoalComment, BoardParticipant, Status
+from tests.factories import CategoryFactory, BoardFactory, BoardParticipantFactory
+
+
+def upload(client, content: str, name: str, **data):
+    data["file"] = SimpleUploadedFile(name, content.encode())
+    return client.post(path=reverse('goals:import_goals'), data=data)
+
+
+@pytest.mark.django_db
+class TestGoalImportView:
+    """GoalImportView test suite"""
+
+    def test_import_unauthorised(self, client):
+        """Test for importing goals by unauthorised user"""
+
+        response = upload(client, "title,category\n", "goals.csv")
+
+        assert response.status_code == 401
+
+    def test_import_csv(self, client, current_board_participant, current_user_category):
+        """Test for importing goals from CSV in the goal export format"""
+
+        user = current_board_participant.user
+        client.force_login(user=user)
+        content = (
+            "id,title,description,status,priority,due_date,board,category,user\n"
+            f"7,Отчёт,Квартальный отчёт,2,3,2030-01-02T10:00:00+03:00,1,{current_user_category.id},x\n"
+            f",Report,,,,2030-01-03,,{current_user_category.id},\n"
+        )
+
+        response = upload(client, content, "goals.csv")
+
+        assert response.status_code == 201
+        assert response.data['goals'] == 2
+        assert response.data['errors'] == []
+        goal = Goal.objects.get(title="Отчёт")
+        assert (goal.status, goal.priority, goal.user, goal.board_id) == (
+            Status.in_progress, 3, user, current_board_participant.board_id
+        )
+        assert goal.due_date.isoformat() == "2030-01-02T07:00:00+00:00"
+        assert Goal.objects.filter(search_vector="отчет").count() == 1
+        assert Goal.objects.get(title="Report").description == ""
+
+    def test_import_ndjson_errors(self, client, current_board_participant, current_user_category):
+        """Test for importing goals and comments from NDJSON and reporting the rejected rows"""
+
+        user = current_board_participant.user
+        deleted_category = CategoryFactory(board=current_board_participant.board, is_deleted=True)
+        reader_board = BoardFactory()
+        BoardParticipantFactory(user=user, board=reader_board, role=BoardParticipant.Role.reader)
+        reader_category = CategoryFactory(board=reader_board)
+        client.force_login(user=user)
+        rows = [
+            {"key": "a", "title": "Valid", "category": current_user_category.id},
+            {"type": "comment", "goal": "a", "text": "First"},
+            {"key": "b", "title": "Bad status", "category": current_user_category.id, "status": 9},
+            {"key": "c", "title": "Deleted", "category": deleted_category.id},
+            {"key": "d", "title": "Reader", "category": reader_category.id},
+            {"key": "e", "title": "Missing", "category": 0},
+            {"key": "a", "title": "Duplicate", "category": current_user_category.id},
+            {"type": "comment", "goal": "b", "text": "Orphan"},
+        ]
+        content = "\n".join(json.dumps(row) for row in rows) + "\n\n"
+        goals_count = Goal.objects.count()
+
+        response = upload(client, content, "goals.ndjson", input="ndjson")
+
+        assert response.status_code == 201
+        assert (response.data['goals'], response.data['comments'], response.data['error_count']) == (1, 1, 6)
+        errors = {error['line']: error['errors'] for error in response.data['errors']}
+        assert set(errors) == {3, 4, 5, 6, 7, 8}
+        assert 'status' in errors[3]
+        assert errors[4] == {"category": ["Not allowed in deleted category"]}
+        assert errors[5] == {"category": ["У Вас нет права создавать цели для данной категории."]}
+        assert errors[8] == {"goal": ["Unknown goal."]}
+        assert Goal.objects.count() == goals_count + 1
+        comment = GoalComment.objects.get()
+        assert (comment.goal.title, comment.user, comment.board_id) == ("Valid", user, current_board_participant.board_id)
+
+    def test_import_trello(self, client, current_board_participant, current_user_category):
+        """Test for importing a Trello board export into a board"""
+
+        user = current_board_participant.user
+        board = current_board_participant.board
+        client.force_login(user=user)
+        export = {
+            "id": "board",
+            "name": "Trello",
+            "actions": [
+                {"type": "createCard", "data": {"card": {"id": "c1"}}},
+                {"type": "commentCard", "data": {"text": "Nice", "card": {"id": "c1"}}},
+            ],
+            "cards": [
+                {"id": "c1", "name": "Card", "desc": "Text", "idList": "l1", "due": "2030-01-01T12:00:00.000Z",
+                 "closed": False, "dueComplete": True},
+                {"id": "c2", "name": "Closed", "desc": "", "idList": "l2", "due": None, "closed": True},
+            ],
+            "labels": [],
+            "lists": [
+                {"id": "l1", "name": current_user_category.title},
+                {"id": "l2", "name": "Новый список"},
+            ],
+        }
+        categories_count = GoalCategory.objects.count()
+
+        response = upload(client, json.dumps(export), "board.json", input="trello", board=board.id)
+
+        assert response.status_code == 201
+        assert (response.data['categories'], response.data['goals'], response.data['comments']) == (1, 2, 1)
+        assert GoalCategory.objects.count() == categories_count + 1
+        card = Goal.objects.get(title="Card")
+        assert (card.category, card.status, card.board) == (current_user_category, Status.done, board)
+        closed = Goal.objects.get(title="Closed")
+        assert (closed.category.title, closed.category.board, closed.status) == ("Новый список", board, Status.archived)
+        assert GoalComment.objects.get().goal == card
+
+    def test_import_trello_requires_writable_board(self, client, current_board_participant):
+        """Test for importing a Trello export without a board or into a board the user cannot write to"""
+
+        user = current_board_participant.user
+        reader_board = BoardFactory()
+        BoardParticipantFactory(user=user, board=reader_board, role=BoardParticipant.Role.reader)
+        client.force_login(user=user)
+
+        without_board = upload(client, "{}", "board.json", input="trello")
+        read_only = upload(client, "{}", "board.json", input="trello", board=reader_board.id)
+
+        assert without_board.status_code == 400
+        assert read_only.status_code == 403
+
+    def test_import_invalid_json(self, client, current_board_participant):
+        """Test for importing a malformed Trello export"""
+
+        client.force_login(user=current_board_participant.user)
+
+        response = upload(
+            client, '{"cards": [{"id": 1}', "board.json", input="trello", board=current_board_participant.board_id
+        )
+
+        assert response.status_code == 400
+        assert 'file' in response.data
+
+    def test_json_stream(self):
+        """Test for reading the members of a JSON document in small chunks"""
+
+        document = {"a": [1, {"b": "x" * 20}, []], "n": 12345, "s": "строка", "e": [], "o": {"k": [1]}}
+
+        members = list(JsonStream(io.StringIO(json.dumps(document, indent=1)), chunk_size=3).iter_members())
+
+        assert members == [
+            ("a", 1), ("a", {"b": "x" * 20}), ("a", []), ("n", 12345), ("s", "строка"), ("o", {"k": [1]}),
+        ]
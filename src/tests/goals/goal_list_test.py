@@ -20,7 +20,7 @@ class TestGoalListView:
         response = client.get(path=reverse('goals:list_goals'))
 
         assert response.status_code == 200
-        assert response.data == goals
+        assert response.data["results"] == goals
 
     def test_goal_list_unauthorised(self, client):
         """Test for retrieving goal list for unauthorised user"""
@@ -45,8 +45,8 @@ class TestGoalListView:
 
         assert response_priority.status_code == 200
         assert response_due_date.status_code == 200
-        assert response_priority.data == goals_sorted_by_priority
-        assert response_due_date.data == goals_sorted_by_due_date
+        assert response_priority.data["results"] == goals_sorted_by_priority
+        assert response_due_date.data["results"] == goals_sorted_by_due_date
 
     def test_goal_list_reader(self, client, current_board_participant, current_user_goals):
         """Test for retrieving goal list for board_participant with reader role"""
@@ -63,7 +63,7 @@ class TestGoalListView:
         goals = GoalSerializer(goals, many=True).data
 
         assert response.status_code == 200
-        assert response.data == goals
+        assert response.data["results"] == goals
 
     def test_goal_list_writer(self, client, current_board_participant, current_user_goals):
         """Test for retrieving goal list for board_participant with writer role"""
@@ -79,7 +79,7 @@ class TestGoalListView:
         goals = GoalSerializer(goals, many=True).data
 
         assert response.status_code == 200
-        assert response.data == goals
+        assert response.data["results"] == goals
 
     def test_goal_list_search_by_title(self, client, current_board_participant, current_user_goals):
         """Test for searching goals by title"""
@@ -96,7 +96,7 @@ class TestGoalListView:
             all_goals = current_user_goals.filter(title__icontains=query).order_by('-priority', 'due_date')
             all_goals = GoalSerializer(all_goals, many=True).data
             assert response.status_code == 200
-            assert response.data == all_goals
+            assert response.data["results"] == all_goals
 
     def test_goal_list_archived_status(self, client, current_board_participant, current_user_goals):
         """Test for retrieving goal list with archived status"""
@@ -108,7 +108,7 @@ class TestGoalListView:
         response = client.get(path=reverse('goals:list_goals'))
 
         assert response.status_code == 200
-        assert response.data == []
+        assert response.data["results"] == []
 
     def test_goal_list_filter_by_status(self, client, current_board_participant, current_user_goals):
         """Test for retrieving goal list filtered by status"""
@@ -122,7 +122,7 @@ class TestGoalListView:
             all_goals = current_user_goals.filter(status__in=query.split(',')).order_by('-priority', 'due_date')
             all_goals = GoalSerializer(all_goals, many=True).data
             assert response.status_code == 200
-            assert response.data == all_goals
+            assert response.data["results"] == all_goals
 
     def test_goal_list_filter_by_priority(self, client, current_board_participant, current_user_goals):
         """Test for retrieving goal list filtered by priority"""
@@ -136,7 +136,7 @@ class TestGoalListView:
             all_goals = GoalSerializer(all_goals, many=True).data
 
             assert response.status_code == 200
-            assert response.data == all_goals
+            assert response.data["results"] == all_goals
 
     def test_goal_list_several_filters(self, client, current_board_participant, current_user_goals):
         """Test for retrieving goal list filtered by mixed filters"""
@@ -157,4 +157,4 @@ class TestGoalListView:
         expected_result = GoalSerializer(goals, many=True).data
 
         assert response.status_code == 200
-        assert response.data == expected_result
+        assert response.data["results"] == expected_result
@@ -0,0 +1,87 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from goals.models import Priority, Status
+from tests.factories import GoalFactory, CommentFactory, CategoryFactory, BoardFactory
+
+
+@pytest.mark.django_db
+class TestGoalSearchView:
+    """GoalSearchView test suite"""
+
+    def search(self, client, **params):
+        response = client.get(path=reverse('goals:search_goals'), data=params)
+        assert response.status_code == 200
+        return [goal['id'] for goal in response.data['results']]
+
+    def test_search_unauthorised(self, client):
+        """Test for searching goals by unauthorised user"""
+
+        response = client.get(path=reverse('goals:search_goals'), data={"q": "goal"})
+
+        assert response.status_code == 401
+
+    def test_search_stemming(self, client, current_board_participant, current_user_category):
+        """Test for finding goals by word forms in Russian and English, ranking title matches first"""
+
+        user = current_board_participant.user
+        in_title = GoalFactory(user=user, category=current_user_category, title="Купить книги", description="")
+        in_description = GoalFactory(
+            user=user, category=current_user_category, title="Магазин", description="Купил новую книгу"
+        )
+        english = GoalFactory(user=user, category=current_user_category, title="Reading books", description="")
+        GoalFactory(user=user, category=current_user_category, title="Позвонить домой", description="")
+        client.force_login(user=user)
+
+        assert self.search(client, q="книга") == [in_title.id, in_description.id]
+        assert self.search(client, q="book") == [english.id]
+
+    def test_search_comments(self, client, current_board_participant, current_user_category):
+        """Test for finding a goal by the text of its comment"""
+
+        user = current_board_participant.user
+        goal = GoalFactory(user=user, category=current_user_category, title="Отпуск", description="")
+        CommentFactory(goal=goal, user=user, text="Забронировать гостиницу")
+        client.force_login(user=user)
+
+        assert self.search(client, q="гостиница") == [goal.id]
+
+    def test_search_access_and_filters(self, client, current_board_participant, current_user_category):
+        """Test for excluding goals of foreign boards, archived goals and goals not matching the list filters"""
+
+        user = current_board_participant.user
+        high = GoalFactory(user=user, category=current_user_category, title="Report", priority=Priority.high)
+        GoalFactory(user=user, category=current_user_category, title="Report", priority=Priority.low)
+        GoalFactory(user=user, category=current_user_category, title="Report", status=Status.archived)
+        GoalFactory(category=CategoryFactory(board=BoardFactory()), title="Report")
+        client.force_login(user=user)
+
+        assert len(self.search(client, q="report")) == 2
+        assert self.search(client, q="report", priority=Priority.high) == [high.id]
+
+    def test_search_without_query(self, client, current_board_participant):
+        """Test for a missing search query"""
+
+        client.force_login(user=current_board_participant.user)
+
+        response = client.get(path=reverse('goals:search_goals'))
+
+        assert response.status_code == 400
+
+    def test_search_vector_not_loaded(self, client, current_board_participant, current_user_goal):
+        """Test for leaving the search vectors out of the columns read by the goal and comment views"""
+
+        CommentFactory(user=current_board_participant.user, goal=current_user_goal, text="Прочитать книгу")
+        client.force_login(user=current_board_participant.user)
+
+        with CaptureQueriesContext(connection) as captured:
+            assert self.search(client, q="книга") == [current_user_goal.id]
+            client.get(path=reverse('goals:list_goals'))
+            client.get(path=f"/goals/goal/{current_user_goal.id}")
+            client.get(path=reverse('goals:list_comments'), data={"goal": current_user_goal.id})
+
+        columns = [query['sql'].split(' FROM ')[0] for query in captured]
+        assert not any(re.search(r', "goals_goal(comment)?"\."search_vector"', column) for column in columns)
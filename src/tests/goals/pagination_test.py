@@ -0,0 +1,112 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from goals.models import Goal, GoalCategory
+from goals.pagination import KeysetPagination
+from rest_framework.request import Request
+from tests.factories import CategoryFactory, GoalFactory
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Keyset and limit/offset pagination test suite"""
+
+    def test_pages_follow_ordering(self, client, current_board_participant, current_user_category):
+        """Test for walking the goal list page by page, including goals with equal priority and empty due dates"""
+
+        user = current_board_participant.user
+        GoalFactory.create_batch(size=6, user=user, category=current_user_category, priority=2)
+        GoalFactory.create_batch(size=3, user=user, category=current_user_category, priority=2, due_date=None)
+        client.force_login(user=user)
+
+        expected = list(Goal.objects.order_by('-priority', 'due_date', 'id').values_list('id', flat=True))
+
+        ids = []
+        url = f"{reverse('goals:list_goals')}?page_size=4"
+        while url:
+            response = client.get(path=url)
+            assert response.status_code == 200
+            assert len(response.data['results']) <= 4
+            ids.extend(goal['id'] for goal in response.data['results'])
+            url = response.data['next']
+
+        assert ids == expected
+
+    def test_previous_page(self, client, current_board_participant, current_user_goals):
+        """Test for returning to the previous page with the previous link"""
+
+        client.force_login(user=current_board_participant.user)
+
+        first_page = client.get(path=f"{reverse('goals:list_goals')}?page_size=2")
+        second_page = client.get(path=first_page.data['next'])
+        previous_page = client.get(path=second_page.data['previous'])
+
+        assert first_page.data['previous'] is None
+        assert previous_page.data['results'] == first_page.data['results']
+
+    def test_max_page_size(self, client, monkeypatch, current_board_participant, current_user_category):
+        """Test for capping the requested page size"""
+
+        GoalFactory.create_batch(size=5, user=current_board_participant.user, category=current_user_category)
+        client.force_login(user=current_board_participant.user)
+
+        monkeypatch.setattr(KeysetPagination, 'max_page_size', 3)
+        response = client.get(path=f"{reverse('goals:list_goals')}?page_size=1000")
+
+        assert response.status_code == 200
+        assert len(response.data['results']) == 3
+        assert response.data['next'] is not None
+
+    def test_invalid_cursor(self, client, current_board_participant, current_user_goals):
+        """Test for a malformed cursor"""
+
+        client.force_login(user=current_board_participant.user)
+
+        response = client.get(path=f"{reverse('goals:list_goals')}?cursor=bm90LWEtY3Vyc29y")
+
+        assert response.status_code == 404
+
+    def test_offset_mode_flag(self, client, current_board_participant, current_user_categories):
+        """Test for the limit/offset mode selected with the pagination query flag"""
+
+        client.force_login(user=current_board_participant.user)
+
+        response = client.get(path=f"{reverse('goals:list_categories')}?pagination=offset")
+
+        assert response.status_code == 200
+        assert response.data['count'] == current_user_categories.count()
+
+    def test_row_comparison(self, client, current_board_participant):
+        """Test for walking the category list, ordered by non-nullable ascending keys, with a row comparison"""
+
+        user = current_board_participant.user
+        CategoryFactory.create_batch(size=3, user=user, board=current_board_participant.board, title='same')
+        CategoryFactory.create_batch(size=4, user=user, board=current_board_participant.board)
+        client.force_login(user=user)
+
+        expected = list(GoalCategory.objects.order_by('title', 'id').values_list('id', flat=True))
+
+        ids = []
+        url = f"{reverse('goals:list_categories')}?page_size=2"
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(path=url)
+            assert response.status_code == 200
+            if ids:
+                assert any('("goals_goalcategory"."title", "goals_goalcategory"."id") >' in query['sql']
+                           for query in queries.captured_queries)
+            ids.extend(category['id'] for category in response.data['results'])
+            url = response.data['next']
+
+        assert ids == expected
+
+    def test_unknown_ordering_field(self, rf):
+        """Test for an ordering that is not a model field"""
+
+        view = type('View', (), {'ordering': ['title', 'missing']})
+        request = Request(rf.get('/'))
+
+        with pytest.raises(ImproperlyConfigured):
+            KeysetPagination().get_keys(GoalCategory.objects.all(), request, view)
@@ -0,0 +1,65 @@
+import pytest
+from django.urls import reverse
+from tests.factories import GoalFactory, CategoryFactory, CommentFactory, BoardFactory, BoardParticipantFactory, \
+    UserFactory
+
+
+@pytest.mark.django_db
+class TestQueryCount:
+    """Test suite checking that the number of queries does not grow with the page size"""
+
+    def test_goal_list(self, client, assert_constant_queries, current_board_participant, current_user_category):
+        """Test for the goal list query count"""
+
+        user = current_board_participant.user
+        client.force_login(user=user)
+
+        assert_constant_queries(
+            reverse('goals:list_goals'),
+            lambda: GoalFactory.create_batch(size=10, user=UserFactory(), category=current_user_category),
+        )
+
+    def test_category_list(self, client, assert_constant_queries, current_board_participant, current_user_category):
+        """Test for the goal category list query count"""
+
+        board = current_board_participant.board
+        client.force_login(user=current_board_participant.user)
+
+        assert_constant_queries(
+            f"{reverse('goals:list_categories')}?board={board.id}",
+            lambda: CategoryFactory.create_batch(size=10, board=board),
+        )
+
+    def test_comment_list(self, client, assert_constant_queries, current_board_participant, current_user_goal):
+        """Test for the goal comment list query count"""
+
+        client.force_login(user=current_board_participant.user)
+
+        assert_constant_queries(
+            f"{reverse('goals:list_comments')}?goal={current_user_goal.id}",
+            lambda: CommentFactory.create_batch(size=10, goal=current_user_goal),
+        )
+
+    def test_board_list(self, client, assert_constant_queries, current_board_participant):
+        """Test for the board list query count"""
+
+        user = current_board_participant.user
+        client.force_login(user=user)
+
+        def add_boards():
+            for board in BoardFactory.create_batch(size=5):
+                BoardParticipantFactory(user=user, board=board)
+                BoardParticipantFactory.create_batch(size=3, board=board)
+
+        assert_constant_queries(reverse('goals:list_boards'), add_boards)
+
+    def test_board_detail(self, client, assert_constant_queries, current_board_participant):
+        """Test for the board detail query count"""
+
+        board = current_board_participant.board
+        client.force_login(user=current_board_participant.user)
+
+        assert_constant_queries(
+            f"/goals/board/{board.id}",
+            lambda: BoardParticipantFactory.create_batch(size=10, board=board),
+        )
@@ -0,0 +1,159 @@
+import io
+
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from goals.models import Goal, GoalComment, Status, BoardParticipant, DeletionLog
+from goals.sync import SyncFeed
+from tests.factories import GoalFactory, CommentFactory, CategoryFactory, BoardFactory, BoardParticipantFactory
+
+
+@pytest.mark.django_db
+class TestSyncView:
+    """SyncView test suite"""
+
+    def sync(self, client, cursor=None):
+        response = client.get(path=reverse('goals:sync'), data={"cursor": cursor} if cursor else {})
+        assert response.status_code == 200
+        return response.data
+
+    def test_sync_unauthorised(self, client):
+        """Test for syncing by unauthorised user"""
+
+        response = client.get(path=reverse('goals:sync'))
+
+        assert response.status_code == 401
+
+    def test_initial_sync(self, client, current_board_participant, current_user_goals):
+        """Test for returning all the live rows of the user's boards without a cursor"""
+
+        archived = GoalFactory(category=Goal.objects.first().category, status=Status.archived)
+        CommentFactory(goal=Goal.objects.first())
+        GoalFactory(category=CategoryFactory(board=BoardFactory()))
+        client.force_login(user=current_board_participant.user)
+
+        data = self.sync(client)
+
+        assert [board['id'] for board in data['boards']['changed']] == [current_board_participant.board_id]
+        assert {goal['id'] for goal in data['goals']['changed']} == \
+            set(Goal.objects.filter(board=current_board_participant.board).exclude(id=archived.id)
+                .values_list('id', flat=True))
+        assert len(data['categories']['changed']) == 1
+        assert len(data['comments']['changed']) == 1
+        assert data['goals']['deleted'] == []
+        assert data['cursor']
+
+    def test_no_changes_single_query(self, client, current_board_participant, current_user_goals):
+        """Test for answering a poll without changes with empty lists and one query"""
+
+        client.force_login(user=current_board_participant.user)
+        cursor = self.sync(client)['cursor']
+        self.sync(client, cursor)
+
+        with CaptureQueriesContext(connection) as captured:
+            data = self.sync(client, cursor)
+
+        assert all(not data[name]['changed'] and not data[name]['deleted']
+                   for name in ('boards', 'categories', 'goals', 'comments'))
+        assert len([query for query in captured if 'UNION' in query['sql']]) == 1
+        assert not any('"goals_goal"."title"' in query['sql'] for query in captured)
+
+    def test_changes_and_tombstones(self, client, current_board_participant, current_user_goals):
+        """Test for returning the changed rows and the tombstones of archived goals, deleted categories and deleted
+        comments"""
+
+        client.force_login(user=current_board_participant.user)
+        changed, archived = Goal.objects.all()[:2]
+        comment = CommentFactory(goal=changed, user=current_board_participant.user)
+        category = CategoryFactory(board=current_board_participant.board)
+        cursor = self.sync(client)['cursor']
+
+        changed.title = "Changed"
+        changed.save()
+        client.delete(path=f"/goals/goal/{archived.id}")
+        client.delete(path=f"/goals/goal_comment/{comment.id}")
+        client.delete(path=f"/goals/goal_category/{category.id}")
+        data = self.sync(client, cursor)
+
+        assert [goal['id'] for goal in data['goals']['changed']] == [changed.id]
+        assert data['goals']['deleted'] == [archived.id]
+        assert data['comments']['deleted'] == [comment.id]
+        assert GoalComment.objects.filter(id=comment.id).count() == 0
+        assert data['categories']['deleted'] == [category.id]
+        assert data['boards']['changed'] == []
+
+    def test_board_access_changes(self, client, current_board_participant, current_user_goals):
+        """Test for sending a joined board in full and a left board as deleted"""
+
+        user = current_board_participant.user
+        client.force_login(user=user)
+        cursor = self.sync(client)['cursor']
+
+        other_board = BoardFactory()
+        goal = GoalFactory(category=CategoryFactory(board=other_board))
+        BoardParticipantFactory(user=user, board=other_board, role=BoardParticipant.Role.reader)
+        data = self.sync(client, cursor)
+
+        assert [board['id'] for board in data['boards']['changed']] == [other_board.id]
+        assert [item['id'] for item in data['goals']['changed']] == [goal.id]
+
+        BoardParticipant.objects.filter(user=user, board=other_board).delete()
+        data = self.sync(client, data['cursor'])
+
+        assert data['boards']['deleted'] == [other_board.id]
+
+    def test_invalid_cursor(self, client, current_board_participant):
+        """Test for a malformed cursor"""
+
+        client.force_login(user=current_board_participant.user)
+
+        response = client.get(path=reverse('goals:sync'), data={"cursor": "bm90LWEtY3Vyc29y"})
+
+        assert response.status_code == 400
+
+    def test_expired_cursor(self, client, settings, current_board_participant):
+        """Test for rejecting a cursor older than the retention of the deletion log"""
+
+        client.force_login(user=current_board_participant.user)
+        cursor = SyncFeed.encode_cursor(DeletionLog.retained_since() - timedelta(minutes=1), set())
+
+        response = client.get(path=reverse('goals:sync'), data={"cursor": cursor})
+
+        assert response.status_code == 400
+        assert response.data['cursor'] == [SyncFeed.expired_cursor_message]
+
+    def test_deletion_log_pruned(self, current_board_participant):
+        """Test for pruning the deletion log records older than the retention by the cascade command"""
+
+        board_id = current_board_participant.board_id
+        DeletionLog.record(DeletionLog.Kind.goal, board_id, [1, 2])
+        DeletionLog.objects.filter(object_id=1).update(deleted=DeletionLog.retained_since() - timedelta(minutes=1))
+
+        call_command("cascade_deletions", stdout=io.StringIO())
+
+        assert list(DeletionLog.objects.values_list("object_id", flat=True)) == [2]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSyncWatermark:
+    """Sync cursor watermark test suite"""
+
+    def test_open_transaction_rows_sent(self, client, current_board_participant, current_user_goal):
+        """Test for sending a row of a transaction which is still open at the time of the sync once it commits"""
+
+        client.force_login(user=current_board_participant.user)
+        other = connection.get_new_connection(connection.get_connection_params())
+        try:
+            with other.cursor() as cursor:
+                cursor.execute("UPDATE goals_goal SET title = 'Slow' WHERE id = %s", [current_user_goal.id])
+            cursor = client.get(path=reverse('goals:sync')).data['cursor']
+            other.commit()
+        finally:
+            other.close()
+
+        data = client.get(path=reverse('goals:sync'), data={"cursor": cursor}).data
+
+        assert [goal['title'] for goal in data['goals']['changed']] == ['Slow']
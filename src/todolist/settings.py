@@ -27,6 +27,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'django_filters',
     'social_django',
@@ -79,6 +80,19 @@ DATABASES = {
 }
 
 
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+}
+
+BOARD_ACCESS_CACHE_TIMEOUT = env.int("BOARD_ACCESS_CACHE_TIMEOUT", default=300)
+
+# Rows archived per transaction when a board or category is deleted, and batches run in the deleting request.
+# The rest is archived by the cascade_deletions command.
+DELETION_CASCADE_BATCH_SIZE = env.int("DELETION_CASCADE_BATCH_SIZE", default=1000)
+DELETION_CASCADE_INLINE_BATCHES = env.int("DELETION_CASCADE_INLINE_BATCHES", default=1)
+SYNC_DELETION_LOG_RETENTION_DAYS = env.int("SYNC_DELETION_LOG_RETENTION_DAYS", default=30)
+
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -99,7 +113,8 @@ REST_FRAMEWORK = {
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'goals.pagination.KeysetOrOffsetPagination',
+    'PAGE_SIZE': 50,
 }
 
 
@@ -141,3 +156,18 @@ SOCIAL_AUTH_NEW_USER_REDIRECT_URL = '/logged-in/'
 SOCIAL_AUTH_USER_MODEL = 'core.User'
 
 TELEGRAM_BOT_TOKEN = env.str('TELEGRAM_BOT_TOKEN')
+# Updates of different chats the bot answers at once.
+TELEGRAM_BOT_CONCURRENCY = env.int('TELEGRAM_BOT_CONCURRENCY', default=8)
+# Bot API server, seconds to wait for a connection and for a response, and retries of the failed requests.
+TELEGRAM_API_URL = env.str('TELEGRAM_API_URL', default='https://api.telegram.org')
+TELEGRAM_CONNECT_TIMEOUT = env.float('TELEGRAM_CONNECT_TIMEOUT', default=5)
+TELEGRAM_READ_TIMEOUT = env.float('TELEGRAM_READ_TIMEOUT', default=10)
+TELEGRAM_MAX_RETRIES = env.int('TELEGRAM_MAX_RETRIES', default=3)
+# Decode getUpdates without marshmallow when the payload has the expected shape.
+TELEGRAM_FAST_DECODING = env.bool('TELEGRAM_FAST_DECODING', default=True)
+# Seconds an unfinished /create dialog of a chat is kept.
+TELEGRAM_CHAT_STATE_TTL = env.int('TELEGRAM_CHAT_STATE_TTL', default=600)
+# Secret token Telegram sends to the webhook, which is disabled without it, and updates handled per transaction by
+# the process_updates workers.
+TELEGRAM_WEBHOOK_SECRET = env.str('TELEGRAM_WEBHOOK_SECRET', default='')
+TELEGRAM_QUEUE_BATCH_SIZE = env.int('TELEGRAM_QUEUE_BATCH_SIZE', default=100)